@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark do pool de conexões HTTP do AzureDevOpsClient
+Compara chamadas avulsas (requests.get, nova conexão a cada chamada) com a
+sessão keep-alive compartilhada, contra o Azure DevOps falso (fake_azure_devops.py).
+
+Uso:
+    python benchmarks/bench_connection_pool.py --requests 500
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from azure_devops_integration.client import AzureDevOpsClient  # noqa: E402
+from azure_devops_integration.rate_limit import RequestScheduler  # noqa: E402
+from fake_azure_devops import FakeAzureDevOps  # noqa: E402
+
+
+def bench_unpooled(server_url, client, total):
+    """Uma conexão nova por chamada (comportamento anterior)"""
+    url = f"{server_url}/{client.organization}/_apis/projects?api-version=7.1"
+    start = time.perf_counter()
+    for _ in range(total):
+        requests.get(url, headers=client.headers, timeout=30).json()
+    return total / (time.perf_counter() - start)
+
+
+def bench_pooled(client, total):
+    """Sessão keep-alive compartilhada do cliente"""
+    start = time.perf_counter()
+    for _ in range(total):
+        client.test_connection()
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500,
+                        help='Quantidade de chamadas por cenário')
+    args = parser.parse_args()
+
+    fake = FakeAzureDevOps()
+    server_url = fake.start()
+
+    try:
+        client = AzureDevOpsClient(
+            'bench-org', 'bench-project', 'fake-token', server_url=server_url,
+            # Agendador sem limite prático: mede só o custo da conexão
+            scheduler=RequestScheduler(rate_per_second=1e6, burst=args.requests))
+
+        unpooled = bench_unpooled(server_url, client, args.requests)
+        pooled = bench_pooled(client, args.requests)
+
+        print(f"Chamadas por cenário: {args.requests}")
+        print(f"Sem pool (requests.get):  {unpooled:8.1f} req/s")
+        print(f"Com pool (keep-alive):    {pooled:8.1f} req/s")
+        print(f"Ganho:                    {pooled / unpooled:8.2f}x")
+        print("Obs.: servidor local sem TLS; em produção o handshake TLS "
+              "amplia a diferença.")
+    finally:
+        fake.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark do tempo de import do pacote e do parse da DAG
+Cada cenário roda em um interpretador novo (import a frio) e vale a mediana.
+Com --max-package-ms/--max-dag-ms, sai com código 1 ao estourar o limite (uso em CI).
+
+Uso:
+    python benchmarks/bench_import_time.py --repeat 10 --max-package-ms 50
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC = os.path.join(ROOT, 'src')
+DAG_PATH = os.path.join(ROOT, 'dags', 'azure_devops_production_dag.py')
+
+# Cenário -> código medido (executado depois do sys.path apontar para src)
+SCENARIOS = {
+    'pacote': "import azure_devops_integration",
+    'pacote + cliente': "from azure_devops_integration import AzureDevOpsClient",
+    'airflow': "import airflow.models, airflow.operators.python",
+    'DAG': (
+        "import importlib.util\n"
+        f"spec = importlib.util.spec_from_file_location('dag_bench', {DAG_PATH!r})\n"
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+    )
+}
+
+_RUNNER = """
+import sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+exec(compile({code!r}, '<bench>', 'exec'))
+print(time.perf_counter() - start)
+"""
+
+
+def measure(code, repeat):
+    """
+    Mede o código em interpretadores novos
+
+    Returns:
+        Optional[float]: Mediana em milissegundos ou None se o import falhou
+    """
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-c', _RUNNER.format(src=SRC, code=code)],
+            capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        samples.append(float(result.stdout.strip().splitlines()[-1]) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=7,
+                        help='Execuções por cenário (vale a mediana)')
+    parser.add_argument('--max-package-ms', type=float, default=None,
+                        help='Limite para o import do pacote')
+    parser.add_argument('--max-dag-ms', type=float, default=None,
+                        help='Limite para o parse da DAG')
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in SCENARIOS.items():
+        results[name] = measure(code, args.repeat)
+        value = f"{results[name]:8.1f} ms" if results[name] is not None else "  indisponível"
+        print(f"{name:<18} {value}")
+
+    if results['DAG'] is not None and results['airflow'] is not None:
+        print(f"{'DAG sem airflow':<18} {results['DAG'] - results['airflow']:8.1f} ms")
+
+    failed = False
+    limits = (('pacote', args.max_package_ms), ('DAG', args.max_dag_ms))
+    for name, limit in limits:
+        if limit is not None and results[name] is not None and results[name] > limit:
+            print(f"❌ {name}: {results[name]:.1f} ms acima do limite de {limit:.1f} ms")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark de vazão do create_work_items_batch contra o Azure DevOps falso
+Para cada tamanho de lote, mede tickets/s, latência por requisição HTTP
+(p50/p95/p99, incluindo espera do agendador e retries) e pico de memória.
+
+O pico de memória vem de uma segunda execução com tracemalloc, para que o
+rastreamento não distorça os tempos.
+
+Uso:
+    python benchmarks/bench_throughput.py --sizes 100 1000 10000 --latency-ms 20
+    python benchmarks/bench_throughput.py --batch-api --throttle-rate 0.01 --retry-after 0.2
+    python benchmarks/bench_throughput.py --sizes 1000 --timing-breakdown --profile-transform 10
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from azure_devops_integration.client import AzureDevOpsClient  # noqa: E402
+from azure_devops_integration.lifecycle import TimingBreakdownHook, TransformProfiler  # noqa: E402
+from azure_devops_integration.config import CATEGORY_TO_WORKITEM_MAPPING, PRIORITY_MAPPING  # noqa: E402
+from azure_devops_integration.rate_limit import RequestScheduler  # noqa: E402
+from azure_devops_integration.schema_cache import WorkItemTypeSchemaCache  # noqa: E402
+from fake_azure_devops import FakeAzureDevOps  # noqa: E402
+
+CATEGORIES = list(CATEGORY_TO_WORKITEM_MAPPING)
+PRIORITIES = list(PRIORITY_MAPPING)
+
+
+def make_tickets(count):
+    """Tickets sintéticos no formato do Fusion"""
+    return [
+        {
+            'id': f"FUS-{index:06d}",
+            'titulo': f"Chamado de benchmark {index}",
+            'descricao': "Descrição do chamado " * 10,
+            'categoria': CATEGORIES[index % len(CATEGORIES)],
+            'prioridade': PRIORITIES[index % len(PRIORITIES)],
+            'solicitante': 'bench@example.com',
+            'data_criacao': '2024-01-01 08:00:00'
+        }
+        for index in range(count)
+    ]
+
+
+def build_client(fake, args):
+    """Cliente isolado (cache de schemas e agendador próprios) apontando para o servidor falso"""
+    client = AzureDevOpsClient(
+        'bench-org', 'bench-project', 'fake-token', server_url=fake.url,
+        schema_cache=WorkItemTypeSchemaCache(persist_path=''),
+        scheduler=RequestScheduler(rate_per_second=args.rate, burst=args.burst))
+
+    # Cronometra cada chamada HTTP do cliente
+    samples = []
+    request = client._request
+
+    def timed_request(*request_args, **request_kwargs):
+        start = time.perf_counter()
+        try:
+            return request(*request_args, **request_kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+
+    client._request = timed_request
+
+    handlers = []
+    if args.timing_breakdown:
+        handlers.append(client.register_hooks(TimingBreakdownHook()))
+    if args.profile_transform:
+        handlers.append(client.register_hooks(TransformProfiler(every=args.profile_transform)))
+    return client, samples, handlers
+
+
+def run_once(size, args, trace_memory=False):
+    """Executa um lote contra um servidor falso novo"""
+    tickets = make_tickets(size)
+    fake = FakeAzureDevOps(
+        latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after, seed=args.seed)
+
+    with fake:
+        client, samples, handlers = build_client(fake, args)
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        created_ids, failed = client.create_work_items_batch(
+            tickets, max_workers=args.workers, use_batch_api=args.batch_api)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+
+    return {
+        'size': size,
+        'created': len(created_ids),
+        'failed': len(failed),
+        'elapsed': elapsed,
+        'samples': samples,
+        'peak': peak,
+        'status': dict(fake.responses),
+        'handlers': handlers
+    }
+
+
+def percentiles(samples):
+    """p50/p95/p99 em milissegundos"""
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return value, value, value
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help='Tamanhos de lote')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Threads do lote (padrão: BATCH_CONFIG)')
+    parser.add_argument('--batch-api', action='store_true', help='Usa o endpoint wit/$batch')
+    parser.add_argument('--rate', type=float, default=1000,
+                        help='Requisições/s do agendador (produção: RATE_LIMIT_CONFIG)')
+    parser.add_argument('--burst', type=int, default=100, help='Capacidade do token bucket')
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='Latência do servidor falso')
+    parser.add_argument('--latency-jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fração de respostas 5xx')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fração de respostas 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After dos 429 (s)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-memory', action='store_true', help='Não mede o pico de memória')
+    parser.add_argument('--timing-breakdown', action='store_true',
+                        help='Registra o TimingBreakdownHook e imprime a quebra por fase')
+    parser.add_argument('--profile-transform', type=int, default=0, metavar='N',
+                        help='Perfila com cProfile 1 a cada N transformações')
+    args = parser.parse_args()
+
+    # Os logs por ticket dominariam a saída (e o tempo) nos lotes grandes
+    logging.basicConfig(level=logging.ERROR)
+
+    print(f"Servidor falso: latência {args.latency_ms:.0f} ms, erros {args.error_rate:.1%}, "
+          f"429 {args.throttle_rate:.1%} | agendador {args.rate:.0f} req/s"
+          f"{' | $batch' if args.batch_api else ''}")
+    print(f"{'tickets':>8} {'criados':>8} {'falhas':>7} {'tickets/s':>10} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'reqs':>6} {'pico MiB':>9}")
+
+    for size in args.sizes:
+        result = run_once(size, args)
+        if not args.skip_memory:
+            result['peak'] = run_once(size, args, trace_memory=True)['peak']
+
+        p50, p95, p99 = percentiles(result['samples'])
+        peak = f"{result['peak'] / 1024 / 1024:9.1f}" if result['peak'] is not None else f"{'-':>9}"
+        print(f"{size:>8} {result['created']:>8} {result['failed']:>7} "
+              f"{size / result['elapsed']:>10.1f} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f} "
+              f"{len(result['samples']):>6} {peak}")
+
+        for handler in result['handlers']:
+            print(handler.summary() if isinstance(handler, TimingBreakdownHook) else handler.report(limit=10))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark da transformação ticket -> patch document
+Compara a montagem ticket a ticket (_build_patch_document, que recalcula
+mapeamentos e descrição a cada chamada) com o PatchDocumentBuilder
+reaproveitado no lote. Não faz chamadas HTTP.
+
+Uso:
+    python benchmarks/bench_transformer.py --tickets 1000 10000 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from azure_devops_integration.client import AzureDevOpsClient  # noqa: E402
+from azure_devops_integration.config import (  # noqa: E402
+    CATEGORY_TO_WORKITEM_MAPPING,
+    PRIORITY_MAPPING
+)
+
+
+def make_tickets(total, seed=42):
+    """Gera tickets sintéticos com categorias e prioridades mapeadas"""
+    rng = random.Random(seed)
+    categories = list(CATEGORY_TO_WORKITEM_MAPPING)
+    priorities = list(PRIORITY_MAPPING)
+    return [
+        {
+            'id': f'GITI.{100000 + index}/2025',
+            'titulo': f'Chamado sintético {index} com <tags> & símbolos',
+            'descricao': 'Descrição do chamado ' * rng.randint(1, 20),
+            'categoria': rng.choice(categories),
+            'prioridade': rng.choice(priorities),
+            'solicitante': f'Usuário {rng.randint(1, 500)}',
+            'status': rng.choice(['Aberto', 'Em análise', 'Pendente'])
+        }
+        for index in range(total)
+    ]
+
+
+def bench_per_ticket(client, tickets):
+    """Montagem ticket a ticket, como no caminho de criação individual"""
+    start = time.perf_counter()
+    for ticket in tickets:
+        work_item_type = client._resolve_work_item_type(ticket)
+        client._build_patch_document(ticket, work_item_type, True)
+    return len(tickets) / (time.perf_counter() - start)
+
+
+def bench_builder(client, tickets):
+    """Builder único por execução (build_many)"""
+    start = time.perf_counter()
+    client.create_patch_builder(lambda _: True).build_many(tickets)
+    return len(tickets) / (time.perf_counter() - start)
+
+
+def bench_prepare(client, tickets):
+    """Validação + builder, como em create_work_items_with_results"""
+    builder = client.create_patch_builder(lambda _: True)
+    start = time.perf_counter()
+    client.prepare_patch_documents(tickets, builder)
+    return len(tickets) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tickets', type=int, nargs='+', default=[1000, 10000, 50000],
+                        help='Tamanhos de lote a medir')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Repetições por cenário (vale a melhor)')
+    args = parser.parse_args()
+
+    client = AzureDevOpsClient('bench-org', 'bench-project', 'fake-token')
+
+    print(f"{'tickets':>8} {'por ticket':>14} {'builder':>14} {'validação+builder':>20} {'ganho':>7}")
+    for total in args.tickets:
+        tickets = make_tickets(total)
+        per_ticket = max(bench_per_ticket(client, tickets) for _ in range(args.repeat))
+        builder = max(bench_builder(client, tickets) for _ in range(args.repeat))
+        prepare = max(bench_prepare(client, tickets) for _ in range(args.repeat))
+        print(f"{total:>8} {per_ticket:>10.0f} t/s {builder:>10.0f} t/s "
+              f"{prepare:>16.0f} t/s {builder / per_ticket:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
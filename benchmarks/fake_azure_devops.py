@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita a API REST do Azure DevOps para benchmarks
+Guarda os work items em memória e permite injetar latência, erros 5xx e throttling 429.
+
+Endpoints:
+    GET  /{org}/_apis/projects
+    GET  /{org}/_apis/projects/{project}
+    GET  /{org}/{project}/_apis/wit/workitemtypes/{type}
+    POST /{org}/{project}/_apis/wit/workitems/${type}
+    PATCH /{org}/{project}/_apis/wit/workitems/{id}
+    POST /{org}/_apis/wit/$batch
+    POST /{org}/{project}/_apis/wit/wiql
+    POST /{org}/{project}/_apis/wit/workitemsbatch
+
+Uso standalone:
+    python benchmarks/fake_azure_devops.py --port 8089 --latency-ms 50 --throttle-rate 0.01
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+FUSION_ID_FIELD = 'Custom.IDChamadoFusion'
+
+_WIQL_IN = re.compile(r"\[([\w.]+)\]\s+IN\s+\(([^)]*)\)", re.IGNORECASE)
+_WIQL_CONTAINS = re.compile(r"\[System\.Title\]\s+CONTAINS\s+'((?:[^']|'')*)'", re.IGNORECASE)
+_WIQL_CHANGED_SINCE = re.compile(r"\[System\.ChangedDate\]\s+>=\s+'([^']*)'", re.IGNORECASE)
+_WIQL_LITERAL = re.compile(r"'((?:[^']|'')*)'")
+
+
+class FakeAzureDevOps:
+    """Estado e comportamento do servidor falso"""
+
+    def __init__(self, latency_ms: float = 0.0, latency_jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, error_status_codes=(500, 502),
+                 throttle_rate: float = 0.0, retry_after: float = 1.0,
+                 fusion_field: bool = True, seed: int = None):
+        """
+        Configura o servidor
+
+        Args:
+            latency_ms: Latência fixa por requisição
+            latency_jitter_ms: Variação aleatória somada à latência
+            error_rate: Fração das requisições respondidas com erro 5xx
+            error_status_codes: Status sorteados para os erros
+            throttle_rate: Fração das requisições respondidas com 429
+            retry_after: Valor do header Retry-After nos 429 (segundos)
+            fusion_field: Se os tipos de work item têm o campo Custom.IDChamadoFusion
+            seed: Semente do sorteio de falhas (opcional)
+        """
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.error_status_codes = tuple(error_status_codes)
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.fusion_field = fusion_field
+
+        self.work_items = {}
+        self.requests = Counter()
+        self.responses = Counter()
+        self._ids = itertools.count(1)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    # Ciclo de vida
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Sobe o servidor em uma thread e retorna a URL base"""
+        fake = self
+
+        class Handler(_Handler):
+            pass
+        Handler.fake = fake
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.url
+
+    @property
+    def url(self) -> str:
+        """URL base do servidor"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        """Derruba o servidor"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakeAzureDevOps':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # Falhas injetadas
+
+    def _injected_failure(self):
+        """Sorteia throttling/erro para a requisição atual"""
+        with self._lock:
+            roll = self._random.random()
+            if roll < self.throttle_rate:
+                return 429
+            if roll < self.throttle_rate + self.error_rate:
+                return self._random.choice(self.error_status_codes)
+            jitter = self._random.uniform(0, self.latency_jitter_ms) if self.latency_jitter_ms else 0.0
+        delay = (self.latency_ms + jitter) / 1000
+        if delay:
+            time.sleep(delay)
+        return None
+
+    # Work items
+
+    def _create(self, work_item_type: str, patch_document) -> dict:
+        now = datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+        fields = {'System.WorkItemType': work_item_type, 'System.ChangedDate': now, 'System.CreatedDate': now}
+        for operation in patch_document:
+            fields[operation['path'].rsplit('/', 1)[-1]] = operation.get('value')
+        with self._lock:
+            work_item_id = next(self._ids)
+            item = {'id': work_item_id, 'rev': 1, 'fields': fields}
+            self.work_items[work_item_id] = item
+        return self._public(item)
+
+    def _update(self, work_item_id: int, patch_document):
+        with self._lock:
+            item = self.work_items.get(work_item_id)
+            if item is None:
+                return None
+            for operation in patch_document:
+                if operation.get('op') == 'test':
+                    continue
+                name = operation['path'].rsplit('/', 1)[-1]
+                if operation.get('op') == 'remove':
+                    item['fields'].pop(name, None)
+                else:
+                    item['fields'][name] = operation.get('value')
+            item['rev'] += 1
+            item['fields']['System.ChangedDate'] = datetime.now(timezone.utc).isoformat(
+                timespec='milliseconds').replace('+00:00', 'Z')
+            return self._public(item)
+
+    def _public(self, item: dict, fields=None) -> dict:
+        selected = item['fields'] if fields is None else {
+            name: item['fields'][name] for name in fields if name in item['fields']}
+        return {
+            'id': item['id'],
+            'rev': item['rev'],
+            'fields': dict(selected),
+            '_links': {'html': {'href': f"{self.url}/_workitems/edit/{item['id']}"}}
+        }
+
+    def _wiql(self, query: str, top: int = None):
+        with self._lock:
+            items = list(self.work_items.values())
+
+        match = _WIQL_IN.search(query)
+        if match:
+            values = {value.replace("''", "'") for value in _WIQL_LITERAL.findall(match.group(2))}
+            items = [item for item in items if str(item['fields'].get(match.group(1))) in values]
+
+        titles = [value.replace("''", "'") for value in _WIQL_CONTAINS.findall(query)]
+        if titles:
+            items = [item for item in items
+                     if any(title in item['fields'].get('System.Title', '') for title in titles)]
+
+        since = _WIQL_CHANGED_SINCE.search(query)
+        if since:
+            items = [item for item in items if item['fields']['System.ChangedDate'] >= since.group(1)]
+
+        if 'ORDER BY [System.ChangedDate]' in query:
+            items.sort(key=lambda item: (item['fields']['System.ChangedDate'], item['id']))
+
+        if top:
+            items = items[:top]
+        return [{'id': item['id']} for item in items]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Roteamento HTTP para o FakeAzureDevOps"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    fake: FakeAzureDevOps = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload=None, headers=None):
+        body = json.dumps(payload if payload is not None else {}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.fake.responses[status] += 1
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def _handle(self, method: str):
+        parts = urlsplit(self.path)
+        path = unquote(parts.path)
+        query = parse_qs(parts.query)
+        body = self._body() if method in ('POST', 'PATCH') else None
+
+        endpoint = _endpoint_name(method, path)
+        self.fake.requests[endpoint] += 1
+
+        failure = self.fake._injected_failure()
+        if failure == 429:
+            return self._send(429, {'message': 'TF400733: throttled'},
+                              {'Retry-After': str(self.fake.retry_after)})
+        if failure:
+            return self._send(failure, {'message': 'injected failure'})
+
+        segments = [segment for segment in path.split('/') if segment]
+
+        if method == 'GET' and path.endswith('/_apis/projects'):
+            return self._send(200, {'count': 1, 'value': [{'name': 'fake-project'}]})
+
+        if method == 'GET' and len(segments) == 4 and segments[1:3] == ['_apis', 'projects']:
+            return self._send(200, {'id': 'fake', 'name': segments[3]})
+
+        if method == 'GET' and '/_apis/wit/workitemtypes/' in path:
+            fields = [{'referenceName': 'System.Title'}, {'referenceName': 'System.Description'}]
+            if self.fake.fusion_field:
+                fields.append({'referenceName': FUSION_ID_FIELD})
+            return self._send(200, {'name': segments[-1], 'fields': fields})
+
+        if method == 'POST' and path.endswith('/_apis/wit/$batch'):
+            results = []
+            for operation in body or []:
+                target = unquote(urlsplit(operation['uri']).path).rsplit('/', 1)[-1]
+                if target.startswith('$'):
+                    created = self.fake._create(target[1:], operation.get('body') or [])
+                    results.append({'code': 200, 'headers': {}, 'body': json.dumps(created)})
+                    continue
+                updated = self.fake._update(int(target), operation.get('body') or [])
+                if updated is None:
+                    results.append({'code': 404, 'headers': {},
+                                    'body': json.dumps({'message': 'work item not found'})})
+                else:
+                    results.append({'code': 200, 'headers': {}, 'body': json.dumps(updated)})
+            return self._send(200, {'count': len(results), 'value': results})
+
+        if method == 'POST' and '/_apis/wit/workitems/$' in path:
+            return self._send(200, self.fake._create(path.rsplit('$', 1)[-1], body or []))
+
+        if method == 'PATCH' and '/_apis/wit/workitems/' in path:
+            updated = self.fake._update(int(segments[-1]), body or [])
+            if updated is None:
+                return self._send(404, {'message': 'work item not found'})
+            return self._send(200, updated)
+
+        if method == 'POST' and path.endswith('/_apis/wit/wiql'):
+            top = int(query['$top'][0]) if '$top' in query else None
+            return self._send(200, {'workItems': self.fake._wiql(body.get('query', ''), top)})
+
+        if method == 'POST' and path.endswith('/_apis/wit/workitemsbatch'):
+            fields = body.get('fields')
+            with self.fake._lock:
+                items = [self.fake.work_items[work_item_id] for work_item_id in body.get('ids', [])
+                         if work_item_id in self.fake.work_items]
+                value = [self.fake._public(item, fields) for item in items]
+            return self._send(200, {'count': len(value), 'value': value})
+
+        return self._send(404, {'message': f'rota não suportada: {method} {path}'})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+
+def _endpoint_name(method: str, path: str) -> str:
+    """Nome estável do endpoint para contagem"""
+    if '/_apis/wit/' in path:
+        resource = path.split('/_apis/wit/', 1)[1].split('/', 1)[0]
+        if resource.startswith('workitems') and method == 'POST' and '$' in path:
+            resource = 'workitems/create'
+        return f"{method} wit/{resource}"
+    return f"{method} projects"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--latency-jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--no-fusion-field', action='store_true')
+    args = parser.parse_args()
+
+    fake = FakeAzureDevOps(
+        latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after, fusion_field=not args.no_fusion_field)
+    print(f"Azure DevOps falso em {fake.start(args.host, args.port)} (Ctrl+C para sair)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,5 @@
 """
-Configuração do Python path para DAGs do Airflow.
-Adiciona o diretório src ao sys.path para importar módulos de produção.
+DAGs do Airflow da integração Fusion -> Azure DevOps.
+O pacote azure_devops_integration é importado de /opt/airflow/src via PYTHONPATH
+(definido no docker-compose.yml).
 """
-
-import sys
-import os
-
-# Adiciona o diretório src ao Python path
-src_path = '/opt/airflow/src'
-if src_path not in sys.path:
-    sys.path.insert(0, src_path)
@@ -4,6 +4,7 @@ Versão de produção - integração com sistema Fusion
 """
 
 import logging
+import os
 from airflow.models import Variable
 from airflow.operators.python_operator import PythonOperator
 from airflow import DAG
@@ -35,31 +36,44 @@ dag = DAG(
 )
 
 
-def get_azure_devops_credentials():
+def get_fusion_credentials():
     """
-    Recupera credenciais do Azure DevOps das variáveis do Airflow
+    Recupera credenciais do SQL Server do Fusion das variáveis do Airflow
 
     Returns:
-        Tuple[str, str, str]: (organization, project, pat_token)
+        Tuple[str, str, str, str]: (server, database, username, password)
 
     Raises:
         Exception: Se alguma credencial não for encontrada
     """
     try:
-        organization = Variable.get("azure_devops_organization")
-        project = Variable.get("azure_devops_project")
-        pat_token = Variable.get("azure_devops_pat")
+        server = Variable.get("fusion_sql_server")
+        database = Variable.get("fusion_sql_database")
+        username = Variable.get("fusion_sql_username")
+        password = Variable.get("fusion_sql_password")
 
         # Validação básica
-        if not all([organization, project, pat_token]):
+        if not all([server, database, username, password]):
             raise ValueError("Uma ou mais credenciais estão vazias")
 
-        return organization, project, pat_token
+        return server, database, username, password
     except Exception as e:
-        logger.error(f"Erro ao recuperar credenciais: {str(e)}")
+        logger.error(f"Erro ao recuperar credenciais do Fusion: {str(e)}")
         raise
 
 
+def get_run_dir(context):
+    """
+    Diretório de staging da execução atual da DAG
+
+    Returns:
+        str: Caminho do diretório da execução
+    """
+    from azure_devops_integration.staging import build_run_dir
+
+    return build_run_dir(context['dag'].dag_id, context['run_id'])
+
+
 def get_pending_tickets(**context):
     """
     Busca tickets pendentes do sistema Fusion via SQL Server
@@ -67,39 +81,38 @@ def get_pending_tickets(**context):
     Returns:
         str: Mensagem com quantidade de tickets encontrados
     """
-    # TODO: Implementar consulta real ao SQL Server
-    # from azure_devops_integration.fusion_connector import get_unprocessed_tickets
-    # tickets = get_unprocessed_tickets()
-
-    # TEMPORÁRIO: Dados de teste para demonstrar criação de cards
-    # TODO: Substituir pela consulta real ao SQL Server
-    tickets = [
-        {
-            'id': 'GITI.123456/2025',
-            'titulo': 'Configurar ambiente de desenvolvimento',
-            'description': 'Configurar o ambiente local para desenvolvimento da aplicação',
-            'category': 'Desenvolvimento',
-            'priority': 'Alta',
-            'requester': 'João Silva',
-            'department': 'TI'
-        },
-        {
-            'id': 'GITI.123457/2025',
-            'titulo': 'Corrigir bug na validação de formulário',
-            'description': 'O formulário não está validando campos obrigatórios corretamente',
-            'category': 'Bug',
-            'priority': 'Crítica',
-            'requester': 'Maria Santos',
-            'department': 'Qualidade'
-        }
-    ]
+    # Import tardio: mantém o parse da DAG leve
+    from azure_devops_integration.config import SYNC_CONFIG
+    from azure_devops_integration.fusion_connector import WatermarkStore, create_fusion_connector
+    from azure_devops_integration.staging import StageWriter
+
+    server, database, username, password = get_fusion_credentials()
+    connector = create_fusion_connector(server, database, username, password)
 
-    logger.info(f"Encontrados {len(tickets)} tickets para processar")
+    # Só o que mudou desde a última execução concluída
+    watermark = WatermarkStore(connector.engine).get()
 
-    # Armazena na XCom para próxima task
-    context['task_instance'].xcom_push(key='pending_tickets', value=tickets)
+    # Com a sincronização ligada, a mesma varredura traz os tickets já
+    # processados que mudaram (ja_processado=True) junto com os novos
+    if SYNC_CONFIG['enabled']:
+        chunks = connector.iter_changed_tickets(watermark=watermark)
+    else:
+        chunks = connector.iter_unprocessed_tickets(watermark=watermark)
 
-    return f"Encontrados {len(tickets)} tickets pendentes"
+    # Lê em blocos de FUSION_CONFIG['batch_size'] direto do cursor do SQL Server
+    # e grava cada bloco no staging assim que chega
+    with StageWriter(get_run_dir(context), 'pending') as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+            logger.info(f"Bloco recebido do Fusion: {len(chunk)} tickets ({writer.rows} no total)")
+    manifest = writer.close()
+
+    logger.info(f"Encontrados {manifest['rows']} tickets para processar")
+
+    # Só o manifesto vai para a XCom
+    context['task_instance'].xcom_push(key='pending_manifest', value=manifest)
+
+    return f"Encontrados {manifest['rows']} tickets pendentes"
 
 
 def check_existing_cards(**context):
@@ -110,122 +123,316 @@ def check_existing_cards(**context):
         str: Mensagem com resultado da verificação
     """
     try:
-        # Adiciona o path da biblioteca
-        import sys
-        import os
-        sys.path.insert(0, os.path.join(
-            os.path.dirname(__file__), '..', 'src'))
+        # Import tardio: mantém o parse da DAG leve
+        from azure_devops_integration.config import SYNC_CONFIG
+        from azure_devops_integration.hooks import AzureDevOpsHook
+        from azure_devops_integration.staging import StageWriter, iter_stage, write_stage
+        from azure_devops_integration.validation import validate_tickets
 
-        # Import aqui para garantir que o path está configurado
-        from azure_devops_integration import create_azure_devops_client
+        # Recupera o manifesto da task anterior
+        pending_manifest = context['task_instance'].xcom_pull(key='pending_manifest')
 
-        # Recupera tickets da task anterior
-        tickets = context['task_instance'].xcom_pull(key='pending_tickets')
-
-        if not tickets:
+        if not pending_manifest or not pending_manifest['rows']:
             logger.info("Nenhum ticket pendente encontrado")
-            context['task_instance'].xcom_push(key='new_tickets', value=[])
+            context['task_instance'].xcom_push(
+                key='new_manifest', value=write_stage(get_run_dir(context), 'new', []))
+            context['task_instance'].xcom_push(
+                key='changed_manifest', value=write_stage(get_run_dir(context), 'changed', []))
             return "Nenhum ticket para verificar"
 
-        logger.info(f"Verificando {len(tickets)} tickets no Azure DevOps")
-
-        # Recupera credenciais
-        organization, project, pat_token = get_azure_devops_credentials()
+        logger.info(f"Verificando {pending_manifest['rows']} tickets no Azure DevOps")
 
-        # Cria cliente
-        area_path = Variable.get("azure_devops_area_path", default_var=None)
-        client = create_azure_devops_client(
-            organization, project, pat_token, area_path)
+        # Cliente do processo (credenciais resolvidas uma vez por worker)
+        hook = AzureDevOpsHook()
+        client = hook.get_conn()
 
-        # Testa conexão
-        if not client.test_connection():
+        # Sonda leve, reaproveitada pelas demais tasks desta execução no mesmo worker
+        if not hook.check_health(context['run_id']):
             raise Exception("❌ Falha na conexão com Azure DevOps")
 
-        # TODO: Implementar verificação de cards existentes
-        # new_tickets = client.filter_unprocessed_tickets(tickets)
-        new_tickets = tickets  # Placeholder
+        # Traz para o índice local os work items alterados desde a última execução
+        client.reconcile_ticket_index()
+
+        # Bloco a bloco: descarta inválidos (relatório no staging) e verifica
+        # duplicatas pelo índice local; só os ausentes vão à WIQL. Tickets que
+        # já têm card voltaram por terem mudado no Fusion: vão para a sincronização
+        sync_enabled = SYNC_CONFIG['enabled']
+        run_dir = get_run_dir(context)
+        with StageWriter(run_dir, 'new') as writer, \
+                StageWriter(run_dir, 'changed') as changed_writer, \
+                StageWriter(run_dir, 'validation_errors') as errors_writer:
+            for chunk in iter_stage(pending_manifest):
+                report = validate_tickets(chunk)
+                errors_writer.write(report.to_records())
+                valid = report.filter_valid(chunk)
+
+                processed = [ticket for ticket in valid if ticket.get('ja_processado')]
+                new_tickets, existing = client.partition_existing_tickets(
+                    [ticket for ticket in valid if not ticket.get('ja_processado')])
+                writer.write(new_tickets)
+                if sync_enabled:
+                    changed_writer.write(processed + existing)
+        new_manifest = writer.close()
+        changed_manifest = changed_writer.close()
+        validation_manifest = errors_writer.close()
 
-        logger.info(f"{len(new_tickets)} tickets novos encontrados")
+        logger.info(
+            f"{new_manifest['rows']} tickets novos e {changed_manifest['rows']} alterados encontrados "
+            f"({validation_manifest['rows']} erros de validação)")
 
-        # Armazena na XCom para próxima task
-        context['task_instance'].xcom_push(
-            key='new_tickets', value=new_tickets)
+        # Só os manifestos vão para a XCom
+        context['task_instance'].xcom_push(key='new_manifest', value=new_manifest)
+        context['task_instance'].xcom_push(key='changed_manifest', value=changed_manifest)
+        context['task_instance'].xcom_push(key='validation_manifest', value=validation_manifest)
 
-        return f"Verificados {len(tickets)} tickets, {len(new_tickets)} são novos"
+        return (f"Verificados {pending_manifest['rows']} tickets, {new_manifest['rows']} são novos, "
+                f"{changed_manifest['rows']} alterados")
 
     except Exception as e:
         logger.error(f"Erro em check_existing_cards: {str(e)}")
         raise
 
 
-def create_azure_devops_cards(**context):
+def plan_card_shards(**context):
     """
-    Cria os cards no Azure DevOps para os tickets novos
+    Distribui os tickets novos em shards para criação em paralelo
 
     Returns:
-        str: Mensagem com resultado da criação
+        List[Dict]: op_kwargs de cada task mapeada (shard_index, shard_manifest)
     """
-    try:
-        # Adiciona o path da biblioteca
-        import sys
-        import os
-        sys.path.insert(0, os.path.join(
-            os.path.dirname(__file__), '..', 'src'))
+    from azure_devops_integration.sharding import write_shards
 
-        # Import aqui para garantir que o path está configurado
-        from azure_devops_integration import create_azure_devops_client
+    new_manifest = context['task_instance'].xcom_pull(key='new_manifest')
+    shards = write_shards(new_manifest, get_run_dir(context))
 
-        # Recupera tickets novos da task anterior
-        new_tickets = context['task_instance'].xcom_pull(key='new_tickets')
+    logger.info(f"{len(shards)} shards planejados para criação")
 
-        if not new_tickets:
-            logger.info("Nenhum ticket novo para processar")
-            context['task_instance'].xcom_push(key='created_ids', value=[])
-            context['task_instance'].xcom_push(key='failed_tickets', value=[])
-            return "Nenhum card criado - todos já existem"
+    return [
+        {'shard_index': index, 'shard_manifest': shard}
+        for index, shard in enumerate(shards)
+    ]
 
-        # Recupera credenciais
-        organization, project, pat_token = get_azure_devops_credentials()
 
-        # Cria cliente
-        area_path = Variable.get("azure_devops_area_path", default_var=None)
-        client = create_azure_devops_client(
-            organization, project, pat_token, area_path)
+def create_azure_devops_cards(shard_index, shard_manifest, **context):
+    """
+    Cria os cards no Azure DevOps para os tickets de um shard
 
-        # Cria work items em lote
-        created_ids, failed_tickets = client.create_work_items_batch(
-            new_tickets)
+    Args:
+        shard_index: Índice do shard
+        shard_manifest: Manifesto do staging do shard
 
-        # Log de resultados
-        success_count = len(created_ids)
-        failed_count = len(failed_tickets)
+    Returns:
+        Dict: shard_index, created_ids, failed_manifest e processed_manifest do shard
+    """
+    try:
+        # Import tardio: mantém o parse da DAG leve
+        from azure_devops_integration.fusion_connector import OUTCOME_CREATED, OUTCOME_FAILED
+        from azure_devops_integration.hooks import AzureDevOpsHook
+        from azure_devops_integration.journal import CreationJournal
+        from azure_devops_integration.staging import StageWriter, iter_stage
+
+        logger.info(f"Shard {shard_index}: {shard_manifest['rows']} tickets")
+
+        # Cliente do processo do shard (o índice local é compartilhado via SQLite)
+        client = AzureDevOpsHook().get_conn()
+        # As métricas do cliente são do processo; o resumo mostra só a diferença deste shard
+        metrics_before = client.get_request_metrics()
+
+        # Journal do shard: um retry desta task retoma só os tickets não concluídos
+        run_dir = get_run_dir(context)
+        journal_path = os.path.join(run_dir, f"journal_shard_{shard_index:03d}.jsonl")
+
+        # Cria work items bloco a bloco (cada criação é registrada no índice local);
+        # o resultado de cada ticket vai para a tabela de processados no merge
+        created_ids = []
+        with CreationJournal(journal_path) as journal, \
+                StageWriter(run_dir, f"failed_shard_{shard_index:03d}") as failed_writer, \
+                StageWriter(run_dir, f"processed_shard_{shard_index:03d}") as processed_writer:
+            for chunk in iter_stage(shard_manifest):
+                results = client.create_work_items_with_results(chunk, journal=journal)
+                chunk_created = [work_item_id for _, work_item_id in results if work_item_id]
+                chunk_failed = [ticket for ticket, work_item_id in results if not work_item_id]
+                created_ids.extend(chunk_created)
+                failed_writer.write(chunk_failed)
+                processed_writer.write(
+                    {'ticket_id': ticket.get('id'), 'work_item_id': work_item_id,
+                     'outcome': OUTCOME_CREATED if work_item_id else OUTCOME_FAILED}
+                    for ticket, work_item_id in results)
+
+                # Se houver falhas, loga detalhes
+                for ticket in chunk_failed:
+                    logger.warning(
+                        f"Ticket que falhou: {ticket.get('id')}: {ticket.get('titulo')}")
+        failed_manifest = failed_writer.close()
+        processed_manifest = processed_writer.close()
 
         logger.info(
-            f"Criação concluída: {success_count} sucessos, {failed_count} falhas")
+            f"Shard {shard_index} concluído: {len(created_ids)} sucessos, "
+            f"{failed_manifest['rows']} falhas")
+
+        # Tempo gasto por endpoint (sondas de schema, criações, throttling)
+        for endpoint, stats in client.get_request_metrics(since=metrics_before).items():
+            logger.info(
+                f"  {endpoint}: {stats['requests']} chamadas, média {stats['latency_ms_avg']:.0f} ms, "
+                f"{stats['retries']} retries, status {stats['status_codes']}")
+
+        return {
+            'shard_index': shard_index,
+            'created_ids': created_ids,
+            'failed_manifest': failed_manifest,
+            'processed_manifest': processed_manifest
+        }
+
+    except Exception as e:
+        logger.error(f"Erro em create_azure_devops_cards (shard {shard_index}): {str(e)}")
+        raise
+
+
+def sync_changed_cards(**context):
+    """
+    Atualiza os cards dos tickets já integrados que mudaram no Fusion
 
-        # Armazena resultados na XCom
-        context['task_instance'].xcom_push(
-            key='created_ids', value=created_ids)
-        context['task_instance'].xcom_push(
-            key='failed_tickets', value=failed_tickets)
+    Returns:
+        str: Mensagem com resultado da sincronização
+    """
+    try:
+        # Import tardio: mantém o parse da DAG leve
+        from azure_devops_integration.fusion_connector import OUTCOME_SYNC_FAILED, OUTCOME_UPDATED
+        from azure_devops_integration.hooks import AzureDevOpsHook
+        from azure_devops_integration.staging import StageWriter, iter_stage
+
+        changed_manifest = context['task_instance'].xcom_pull(key='changed_manifest') or {}
+        run_dir = get_run_dir(context)
+
+        client = AzureDevOpsHook().get_conn() if changed_manifest.get('rows') else None
+
+        # Bloco a bloco: uma busca dos work items e PATCHs agrupados no $batch
+        updated_ids = []
+        with StageWriter(run_dir, 'sync_failed') as failed_writer, \
+                StageWriter(run_dir, 'sync_missing') as missing_writer, \
+                StageWriter(run_dir, 'sync_processed') as processed_writer:
+            if client is not None:
+                for chunk in iter_stage(changed_manifest):
+                    chunk_updated, chunk_failed, chunk_missing = client.sync_work_items(chunk)
+                    updated_ids.extend(chunk_updated)
+                    failed_writer.write(chunk_failed)
+                    missing_writer.write(chunk_missing)
+
+                    # Atualizados e já iguais ficam registrados; sem work item, não
+                    failed = {str(ticket.get('id')) for ticket in chunk_failed}
+                    missing = {str(ticket.get('id')) for ticket in chunk_missing}
+                    processed_writer.write(
+                        {'ticket_id': ticket.get('id'), 'work_item_id': None,
+                         'outcome': OUTCOME_SYNC_FAILED if str(ticket.get('id')) in failed else OUTCOME_UPDATED}
+                        for ticket in chunk if str(ticket.get('id')) not in missing)
+
+                    # Card removido no Azure DevOps: não é recriado automaticamente
+                    for ticket in chunk_missing:
+                        logger.warning(f"Ticket {ticket.get('id')} processado, mas sem work item")
+        sync_failed_manifest = failed_writer.close()
+        sync_missing_manifest = missing_writer.close()
+        sync_processed_manifest = processed_writer.close()
 
-        # Se houver falhas, loga detalhes
-        if failed_tickets:
-            logger.warning("Tickets que falharam:")
-            for ticket in failed_tickets:
-                logger.warning(
-                    f"  - {ticket.get('id')}: {ticket.get('titulo')}")
+        logger.info(
+            f"Sincronização concluída: {len(updated_ids)} atualizados, "
+            f"{sync_failed_manifest['rows']} falhas, {sync_missing_manifest['rows']} sem work item")
 
-        # TODO: Marcar tickets como processados no Fusion
-        # mark_tickets_as_processed(created_ids)
+        context['task_instance'].xcom_push(key='updated_ids', value=updated_ids)
+        context['task_instance'].xcom_push(key='sync_failed_manifest', value=sync_failed_manifest)
+        context['task_instance'].xcom_push(key='sync_missing_manifest', value=sync_missing_manifest)
+        context['task_instance'].xcom_push(key='sync_processed_manifest', value=sync_processed_manifest)
 
-        return f"Cards criados: {success_count}, Falhas: {failed_count}"
+        return f"Cards atualizados: {len(updated_ids)}, Falhas: {sync_failed_manifest['rows']}"
 
     except Exception as e:
-        logger.error(f"Erro em create_azure_devops_cards: {str(e)}")
+        logger.error(f"Erro em sync_changed_cards: {str(e)}")
         raise
 
 
+def merge_card_shards(**context):
+    """
+    Junta os resultados dos shards e da sincronização, registra os tickets
+    processados e avança a marca d'água do Fusion
+
+    Returns:
+        str: Mensagem com resultado da criação
+    """
+    from azure_devops_integration.sharding import merge_shard_results
+
+    # Retorno de todas as instâncias mapeadas (vazio quando não houve shards)
+    results = context['task_instance'].xcom_pull(
+        task_ids='create_azure_devops_cards', key='return_value') or []
+    if isinstance(results, dict):
+        results = [results]
+
+    merged = merge_shard_results(list(results), get_run_dir(context))
+
+    success_count = len(merged['created_ids'])
+    failed_count = merged['failed_manifest']['rows']
+
+    logger.info(
+        f"Criação concluída: {success_count} sucessos, {failed_count} falhas")
+
+    # Armazena resultados na XCom
+    context['task_instance'].xcom_push(
+        key='created_ids', value=merged['created_ids'])
+    context['task_instance'].xcom_push(
+        key='failed_manifest', value=merged['failed_manifest'])
+
+    sync_processed_manifest = context['task_instance'].xcom_pull(
+        task_ids='sync_changed_cards', key='sync_processed_manifest')
+
+    # Marca os tickets como processados no Fusion (falhas incluídas, para nova
+    # tentativa) e, na mesma transação do último bloco, avança a marca d'água
+    advance_fusion_watermark(
+        context['task_instance'].xcom_pull(key='pending_manifest'),
+        merged['processed_manifests'] + ([sync_processed_manifest] if sync_processed_manifest else []))
+
+    return f"Cards criados: {success_count}, Falhas: {failed_count}"
+
+
+def advance_fusion_watermark(pending_manifest, processed_manifests=()):
+    """
+    Registra os tickets processados e avança a marca d'água do Fusion
+
+    A marca d'água vai até o último ticket da janela lida, mesmo com falhas:
+    elas ficam registradas como failed/sync_failed e voltam nas próximas
+    leituras até FUSION_CONFIG['max_failed_attempts'].
+
+    Args:
+        pending_manifest: Manifesto dos tickets lidos do Fusion, na ordem da extração
+        processed_manifests: Manifestos com (ticket_id, work_item_id, outcome) de cada ticket
+    """
+    from azure_devops_integration.fusion_connector import (
+        ProcessedTicketStore,
+        WatermarkStore,
+        create_fusion_connector,
+        stream_watermark
+    )
+    from azure_devops_integration.staging import iter_stage
+
+    watermark = None
+    if pending_manifest:
+        pending_tickets = (ticket for chunk in iter_stage(pending_manifest) for ticket in chunk)
+        watermark = stream_watermark(pending_tickets)
+    if watermark is None:
+        logger.info("Marca d'água do Fusion mantida (nenhum ticket novo na janela)")
+
+    outcomes = [
+        (record['ticket_id'], record.get('work_item_id'), record['outcome'])
+        for manifest in processed_manifests
+        for chunk in iter_stage(manifest)
+        for record in chunk
+    ]
+    if not outcomes and watermark is None:
+        return
+
+    server, database, username, password = get_fusion_credentials()
+    connector = create_fusion_connector(server, database, username, password)
+    ProcessedTicketStore(connector.engine).record(
+        outcomes, watermark=watermark, watermark_store=WatermarkStore(connector.engine))
+
+
 def send_notification(**context):
     """
     Envia notificação com resultado do processamento
@@ -236,11 +443,41 @@ def send_notification(**context):
     try:
         created_ids = context['task_instance'].xcom_pull(
             key='created_ids') or []
-        failed_tickets = context['task_instance'].xcom_pull(
-            key='failed_tickets') or []
+        failed_manifest = context['task_instance'].xcom_pull(
+            key='failed_manifest') or {}
+
+        validation_manifest = context['task_instance'].xcom_pull(
+            key='validation_manifest') or {}
+
+        updated_ids = context['task_instance'].xcom_pull(
+            key='updated_ids') or []
+        sync_failed_manifest = context['task_instance'].xcom_pull(
+            key='sync_failed_manifest') or {}
+        sync_missing_manifest = context['task_instance'].xcom_pull(
+            key='sync_missing_manifest') or {}
 
         success_count = len(created_ids)
-        failed_count = len(failed_tickets)
+        failed_count = failed_manifest.get('rows', 0)
+        validation_errors = validation_manifest.get('rows', 0)
+        sync_failed = sync_failed_manifest.get('rows', 0)
+        sync_missing = sync_missing_manifest.get('rows', 0)
+
+        # Títulos dos primeiros cards criados (uma chamada workitemsbatch)
+        created_lines = ''
+        if created_ids:
+            try:
+                from azure_devops_integration.hooks import AzureDevOpsHook
+
+                client = AzureDevOpsHook().get_conn()
+                titles = {
+                    item['id']: item.get('fields', {}).get('System.Title', '')
+                    for item in client.get_work_items(created_ids[:10], fields=['System.Title'])
+                }
+                created_lines = ''.join(
+                    f"  #{work_item_id} {titles.get(work_item_id, '(não encontrado)')}\n"
+                    for work_item_id in created_ids[:10])
+            except Exception as e:
+                logger.warning(f"Não foi possível ler os títulos dos cards criados: {str(e)}")
 
         # Monta mensagem de notificação
         message = f"""
@@ -249,12 +486,21 @@ Processamento Azure DevOps concluído!
 Resumo:
 Cards criados: {success_count}
 Falhas: {failed_count}
+Erros de validação: {validation_errors}
+Cards atualizados: {len(updated_ids)}
+Falhas na atualização: {sync_failed}
+Tickets sem work item: {sync_missing}
 
 IDs criados: {created_ids[:10]}{'...' if len(created_ids) > 10 else ''}
-"""
+{created_lines}"""
 
         logger.info(message)
 
+        # Staging só é mantido quando há falhas ou erros de validação para inspecionar
+        if not failed_count and not validation_errors and not sync_failed and not sync_missing:
+            from azure_devops_integration.staging import remove_run_dir
+            remove_run_dir(get_run_dir(context))
+
         # TODO: Implementar envio real de notificação
         # notification_webhook = Variable.get("notification_webhook", default_var=None)
         # if notification_webhook:
@@ -293,7 +539,20 @@ task_check_existing = PythonOperator(
     """
 )
 
-task_create_cards = PythonOperator(
+task_plan_shards = PythonOperator(
+    task_id='plan_card_shards',
+    python_callable=plan_card_shards,
+    dag=dag,
+    doc_md="""
+    ### Planejar Shards
+
+    Distribui os tickets novos em shards (hash do ID do ticket)
+    conforme SHARDING_CONFIG.
+    """
+)
+
+# Uma task mapeada por shard: cada uma tem seu cliente e seu retry
+task_create_cards = PythonOperator.partial(
     task_id='create_azure_devops_cards',
     python_callable=create_azure_devops_cards,
     dag=dag,
@@ -301,7 +560,33 @@ task_create_cards = PythonOperator(
     ### Criar Cards Azure DevOps
     
     Cria os work items no Azure DevOps para os tickets
-    que ainda não possuem cards.
+    de um shard que ainda não possuem cards.
+    """
+).expand(op_kwargs=task_plan_shards.output)
+
+task_sync_cards = PythonOperator(
+    task_id='sync_changed_cards',
+    python_callable=sync_changed_cards,
+    dag=dag,
+    doc_md="""
+    ### Sincronizar Cards Alterados
+
+    Atualiza título, descrição, prioridade e estado dos cards
+    de tickets já integrados que mudaram no Fusion (SYNC_CONFIG).
+    """
+)
+
+task_merge_shards = PythonOperator(
+    task_id='merge_card_shards',
+    python_callable=merge_card_shards,
+    dag=dag,
+    # Roda também quando não há shards (task mapeada sem instâncias fica 'skipped')
+    trigger_rule='none_failed',
+    doc_md="""
+    ### Consolidar Shards
+
+    Junta os resultados dos shards e da sincronização, registra os
+    tickets processados no Fusion e avança a marca d'água.
     """
 )
 
@@ -317,4 +602,5 @@ task_notify = PythonOperator(
 )
 
 # Definição das dependências
-task_get_tickets >> task_check_existing >> task_create_cards >> task_notify
+task_get_tickets >> task_check_existing >> task_plan_shards >> task_create_cards >> task_merge_shards >> task_notify
+task_check_existing >> task_sync_cards >> task_merge_shards
@@ -1,26 +1,66 @@
 """
 Azure DevOps Integration Package
 Integração para criação automática de work items no Azure DevOps via Airflow
+
+A API pública é carregada sob demanda (PEP 562): importar o pacote não
+importa requests nem os módulos do cliente, o que mantém leve o parse das DAGs.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 __version__ = "1.0.0"
 __author__ = "Data Team"
 
-from .client import AzureDevOpsClient, create_azure_devops_client
-from .config import (
-    AZURE_DEVOPS_CONFIG,
-    CATEGORY_TO_WORKITEM_MAPPING,
-    PRIORITY_MAPPING,
-    INITIAL_STATES,
-    AIRFLOW_CONFIG
-)
-
-__all__ = [
-    'AzureDevOpsClient',
-    'create_azure_devops_client',
-    'AZURE_DEVOPS_CONFIG',
-    'CATEGORY_TO_WORKITEM_MAPPING',
-    'PRIORITY_MAPPING',
-    'INITIAL_STATES',
-    'AIRFLOW_CONFIG'
-]
+# Nome público -> módulo que o define
+_LAZY_ATTRIBUTES = {
+    'AzureDevOpsClient': '.client',
+    'create_azure_devops_client': '.client',
+    'AZURE_DEVOPS_CONFIG': '.config',
+    'CATEGORY_TO_WORKITEM_MAPPING': '.config',
+    'PRIORITY_MAPPING': '.config',
+    'INITIAL_STATES': '.config',
+    'AIRFLOW_CONFIG': '.config',
+    'HTTP_CONFIG': '.config',
+    'WorkItemTypeSchemaCache': '.schema_cache',
+    'WorkItemCache': '.work_item_cache',
+    'RequestMetrics': '.metrics',
+    'get_shared_metrics': '.metrics',
+    'TimingBreakdownHook': '.lifecycle',
+    'TransformProfiler': '.lifecycle',
+    'get_shared_session': '.session',
+    'close_shared_sessions': '.session'
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+if TYPE_CHECKING:
+    from .client import AzureDevOpsClient, create_azure_devops_client
+    from .config import (
+        AZURE_DEVOPS_CONFIG,
+        CATEGORY_TO_WORKITEM_MAPPING,
+        PRIORITY_MAPPING,
+        INITIAL_STATES,
+        AIRFLOW_CONFIG,
+        HTTP_CONFIG
+    )
+    from .schema_cache import WorkItemTypeSchemaCache
+    from .work_item_cache import WorkItemCache
+    from .metrics import RequestMetrics, get_shared_metrics
+    from .lifecycle import TimingBreakdownHook, TransformProfiler
+    from .session import get_shared_session, close_shared_sessions
+
+
+def __getattr__(name: str):
+    """Importa o módulo do atributo no primeiro acesso e guarda o valor no pacote"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,475 @@
+"""
+Cliente Azure DevOps assíncrono (asyncio + aiohttp)
+Permite milhares de operações em voo a partir de um único slot do Airflow
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+import logging
+
+import aiohttp
+
+from .client import BaseAzureDevOpsClient
+from .config import BATCH_CONFIG, RATE_LIMIT_CONFIG
+from .lifecycle import HookResponse
+from .metrics import (
+    SPAN_HTTP,
+    SPAN_POST,
+    SPAN_TICKET,
+    SPAN_TRANSFORM,
+    SPAN_VALIDATE,
+    RequestMetrics,
+    end_span,
+    set_span_attribute,
+    span,
+    use_span
+)
+from .rate_limit import RequestScheduler
+from .retry import (
+    ERROR_CONNECT,
+    ERROR_CONNECTION,
+    ERROR_TIMEOUT,
+    IDEMPOTENT_METHODS,
+    DeadlineExceeded,
+    RetryPolicy
+)
+from .schema_cache import WorkItemTypeSchemaCache
+from .session import resolve_http_config
+from .transformer import FUSION_ID_FIELD
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Exceção de timeout na conexão (aiohttp >= 3.10; None em versões anteriores)
+_CONNECTION_TIMEOUT_ERROR = getattr(aiohttp, 'ConnectionTimeoutError', None)
+
+
+class AsyncAzureDevOpsClient(BaseAzureDevOpsClient):
+    """Cliente assíncrono para integração com Azure DevOps API"""
+
+    def __init__(self, organization: str, project: str, pat_token: str, area_path: str = None,
+                 session: Optional[aiohttp.ClientSession] = None, http_config: Optional[Dict] = None,
+                 max_concurrency: int = None, server_url: str = None,
+                 schema_cache: Optional[WorkItemTypeSchemaCache] = None,
+                 scheduler: Optional[RequestScheduler] = None, retry_policy: Optional[RetryPolicy] = None,
+                 metrics: Optional[RequestMetrics] = None):
+        """
+        Inicializa o cliente assíncrono
+
+        Args:
+            organization: Nome da organização no Azure DevOps
+            project: Nome do projeto
+            pat_token: Personal Access Token
+            area_path: Caminho da área (opcional)
+            session: Sessão aiohttp a reutilizar (opcional, criada sob demanda)
+            http_config: Sobrescreve valores de HTTP_CONFIG (opcional)
+            max_concurrency: Máximo de requisições em voo (opcional, padrão: BATCH_CONFIG)
+            server_url: URL do servidor Azure DevOps (opcional)
+            schema_cache: Cache de schemas de tipos (opcional, padrão: cache compartilhado do processo)
+            scheduler: Agendador de requisições (opcional, padrão: compartilhado por organização)
+            retry_policy: Política de reenvio (opcional, padrão: RETRY_CONFIG)
+            metrics: Agregador de métricas (opcional, padrão: compartilhado do processo)
+        """
+        super().__init__(organization, project, pat_token, area_path,
+                         server_url=server_url, schema_cache=schema_cache, scheduler=scheduler,
+                         retry_policy=retry_policy, metrics=metrics)
+
+        self.http_config = resolve_http_config(http_config)
+        self.timeout = aiohttp.ClientTimeout(
+            sock_connect=self.http_config['connect_timeout'],
+            sock_read=self.http_config['read_timeout']
+        )
+        self.max_concurrency = max_concurrency or BATCH_CONFIG['async_max_concurrency']
+
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        logger.info(
+            f"Cliente assíncrono inicializado para {organization}/{project}")
+
+    async def __aenter__(self) -> 'AsyncAzureDevOpsClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Fecha a sessão aiohttp se ela foi criada por este cliente"""
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Cria a sessão e o pool de conexões no loop em execução"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.http_config['pool_maxsize'] * self.http_config['pool_connections'],
+                limit_per_host=self.http_config['pool_maxsize'],
+                force_close=not self.http_config['keep_alive']
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self.timeout,
+                trace_configs=self.hooks.aiohttp_trace_configs or None)
+            self._owns_session = True
+        return self._session
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Semáforo que limita as requisições em voo"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _request(self, method: str, url: str, idempotent: bool = None,
+                       **kwargs) -> Tuple[int, Any]:
+        """
+        Executa uma chamada HTTP respeitando os limites de concorrência e de taxa
+
+        Segue a mesma RetryPolicy e o mesmo prazo de lote do cliente síncrono.
+
+        Args:
+            method: Método HTTP
+            url: URL completa da chamada
+            idempotent: Se a chamada pode ser repetida sem efeito duplicado
+                (opcional, padrão: deduzido do método HTTP)
+            **kwargs: Argumentos repassados para aiohttp.ClientSession.request
+
+        Returns:
+            Tuple[int, Any]: (status HTTP, corpo JSON ou texto)
+
+        Raises:
+            DeadlineExceeded: Se o prazo do lote terminou
+        """
+        kwargs.setdefault('headers', self.headers)
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        max_throttle_retries = RATE_LIMIT_CONFIG['max_throttle_retries']
+        throttle_retries = 0
+        attempt = 0
+
+        async with self._get_semaphore():
+            while True:
+                deadline = self._deadline
+                if deadline is not None and deadline.expired():
+                    raise DeadlineExceeded(
+                        f"Prazo do lote ({deadline.budget_seconds:.0f}s) esgotado antes de {method}")
+
+                wait = self.scheduler.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                try:
+                    status, headers, body = await self._send_attempt(method, url, kwargs)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    error_kind = _classify_aiohttp_error(e)
+                    if not self._retry_allowed(attempt, idempotent, error_kind=error_kind):
+                        raise
+                    await self._wait_before_retry(attempt, error_kind, method, url)
+                    attempt += 1
+                    continue
+
+                throttle_delay = self.scheduler.observe(status, headers)
+                if throttle_delay is not None and throttle_retries < max_throttle_retries \
+                        and self._deadline_allows(throttle_delay):
+                    throttle_retries += 1
+                    self._record_retry('throttled', method, url)
+                    logger.warning(
+                        f"Throttling ({status}) em {method} {url.split('?')[0]}; "
+                        f"reenviando em {throttle_delay:.1f}s ({throttle_retries}/{max_throttle_retries})")
+                    continue
+
+                if throttle_delay is None and self._retry_allowed(attempt, idempotent, status_code=status):
+                    await self._wait_before_retry(attempt, f"http_{status}", method, url)
+                    attempt += 1
+                    continue
+
+                return status, body
+
+    async def _send_attempt(self, method: str, url: str, kwargs: Dict) -> Tuple[int, Any, Any]:
+        """Uma tentativa HTTP, registrada nas métricas, em um span e nos hooks"""
+        hooks = self.hooks
+        if hooks.before_request:
+            hooks.dispatch('before_request', method, url, kwargs)
+
+        start = time.perf_counter()
+        with span(SPAN_HTTP, {'http.method': method, 'http.url': url.split('?')[0]}) as http_span:
+            try:
+                async with self._get_session().request(method, url, **kwargs) as response:
+                    raw = await response.read()
+                    if response.content_type == 'application/json':
+                        body = await response.json()
+                    else:
+                        body = await response.text()
+                    status, headers = response.status, response.headers
+                    bytes_sent = int(response.request_info.headers.get('Content-Length') or 0)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                elapsed = time.perf_counter() - start
+                if self.metrics is not None:
+                    self.metrics.record_request(method, url, None, elapsed)
+                if hooks.on_error:
+                    hooks.dispatch('on_error', method, url, e, elapsed)
+                raise
+            set_span_attribute(http_span, 'http.status_code', status)
+
+        elapsed = time.perf_counter() - start
+        if self.metrics is not None:
+            self.metrics.record_request(method, url, status, elapsed, bytes_sent, len(raw))
+        if hooks.after_response:
+            hooks.dispatch('after_response', method, url, HookResponse(status, headers, body), elapsed)
+        return status, headers, body
+
+    async def _wait_before_retry(self, attempt: int, reason: str, method: str, url: str) -> None:
+        """Aplica o backoff (sem bloquear o loop) e contabiliza o reenvio"""
+        delay = self.retry_policy.compute_delay(attempt)
+        self._record_retry(reason, method, url)
+        logger.warning(
+            f"Falha transitória ({reason}); tentativa {attempt + 2}/"
+            f"{self.retry_policy.max_retries + 1} em {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+    async def test_connection(self) -> bool:
+        """
+        Testa a conexão com a API do Azure DevOps
+
+        Returns:
+            bool: True se a conexão foi bem-sucedida
+        """
+        try:
+            status, body = await self._request('GET', self.projects_url)
+
+            if status == 200:
+                logger.info(
+                    f"Conexão estabelecida! Projetos encontrados: {len(body['value'])}")
+                return True
+            else:
+                logger.error(f"Erro na conexão: {status}")
+                return False
+
+        except asyncio.TimeoutError:
+            logger.error(
+                f"Timeout na conexão (>{self.http_config['read_timeout']}s)")
+            return False
+        except Exception as e:
+            logger.error(f"Erro de conexão: {str(e)}")
+            return False
+
+    async def get_work_item_type_fields(self, work_item_type: str) -> Optional[FrozenSet[str]]:
+        """
+        Retorna o índice de campos do tipo, consultando a API apenas em cache miss
+
+        Args:
+            work_item_type: Nome do tipo de work item
+
+        Returns:
+            Optional[FrozenSet[str]]: referenceNames dos campos ou None se houve erro
+        """
+        fields = self.schema_cache.get_fields(
+            self.organization, self.project, work_item_type)
+        if fields is not None:
+            return fields
+
+        try:
+            status, body = await self._request('GET', self.work_item_type_url(work_item_type))
+
+            if status == 200:
+                return self.schema_cache.set_fields(
+                    self.organization, self.project, work_item_type,
+                    (field.get('referenceName') for field in body.get('fields', []))
+                )
+            else:
+                logger.warning(
+                    f"Erro ao verificar campos do tipo '{work_item_type}': {status}")
+                return None
+
+        except Exception as e:
+            logger.warning(
+                f"Erro ao carregar campos do tipo '{work_item_type}': {str(e)}")
+            return None
+
+    async def create_work_item_from_ticket(self, ticket: Dict,
+                                           prepared: Optional[Tuple[str, List[Dict]]] = None,
+                                           ticket_span: Any = None) -> Optional[int]:
+        """
+        Cria um work item baseado nos dados de um ticket do Fusion
+
+        Args:
+            ticket: Dicionário com dados do ticket
+            prepared: (tipo, patch document) já validado e montado pelo lote (opcional)
+            ticket_span: Span do ticket aberto por prepare_patch_documents (opcional)
+
+        Returns:
+            Optional[int]: ID do work item criado ou None se houve erro
+        """
+        if not self.hooks.on_ticket_complete:
+            return await self._create_work_item(ticket, prepared, ticket_span)
+
+        start = time.perf_counter()
+        work_item_id = await self._create_work_item(ticket, prepared, ticket_span)
+        self._ticket_complete(ticket, work_item_id, time.perf_counter() - start)
+        return work_item_id
+
+    async def _create_work_item(self, ticket: Dict,
+                                prepared: Optional[Tuple[str, List[Dict]]] = None,
+                                ticket_span: Any = None) -> Optional[int]:
+        """Validação, montagem e POST de um ticket (corpo de create_work_item_from_ticket)"""
+        try:
+            with (use_span(ticket_span) if ticket_span is not None
+                  else span(SPAN_TICKET, {'fusion.ticket_id': str(ticket.get('id'))})):
+                if prepared is None:
+                    # Valida o ticket antes de processar
+                    with span(SPAN_VALIDATE):
+                        is_valid, validation_errors = self.validate_ticket(ticket)
+                    if not is_valid:
+                        self._log_validation_errors(ticket, validation_errors)
+                        return None
+
+                    work_item_type = self._resolve_work_item_type(ticket)
+                    fields = await self.get_work_item_type_fields(work_item_type)
+                    with span(SPAN_TRANSFORM), self.hooks.transform(ticket):
+                        patch_document = self._build_patch_document(
+                            ticket, work_item_type, fields is not None and FUSION_ID_FIELD in fields)
+                else:
+                    work_item_type, patch_document = prepared
+
+                logger.info(
+                    f"Criando work item: {work_item_type} - {ticket.get('id')}")
+
+                with span(SPAN_POST):
+                    status, body = await self._request(
+                        'POST', self.create_work_item_url(work_item_type), json=patch_document)
+
+                if status == 200:
+                    work_item_id = body['id']
+                    logger.info(f"Work item criado: ID {work_item_id}")
+                    return work_item_id
+                else:
+                    logger.error(f"Erro ao criar work item: {status}")
+                    logger.error(f"Response: {body}")
+                    return None
+
+        except Exception as e:
+            logger.error(
+                f"Erro ao processar ticket {ticket.get('id')}: {str(e)}")
+            return None
+
+    async def create_work_items_with_results(self, tickets: List[Dict],
+                                             deadline_seconds: float = None) -> List[Tuple[Dict, Optional[int]]]:
+        """
+        Cria múltiplos work items concorrentemente mantendo o vínculo ticket -> ID
+
+        Args:
+            tickets: Lista de dicionários com dados dos tickets
+            deadline_seconds: Prazo total do lote, incluindo retries (opcional, padrão: RETRY_CONFIG)
+
+        Returns:
+            List[Tuple[Dict, Optional[int]]]: (ticket, ID criado ou None), na ordem de entrada
+        """
+        logger.info(
+            f"Iniciando criação de {len(tickets)} work items ({self.max_concurrency} em voo)...")
+
+        ticket_spans: List[Any] = []
+        self._start_deadline(deadline_seconds)
+        try:
+            # Carrega o schema de cada tipo uma vez antes da criação concorrente
+            work_item_types = list({self._resolve_work_item_type(ticket) for ticket in tickets})
+            schemas = dict(zip(work_item_types, await asyncio.gather(*(
+                self.get_work_item_type_fields(work_item_type) for work_item_type in work_item_types
+            ))))
+
+            # Valida e monta todos os patch documents em uma passada
+            builder = self.create_patch_builder(
+                lambda work_item_type: FUSION_ID_FIELD in (schemas.get(work_item_type) or ()))
+            # O span de cada ticket fica aberto até o POST terminar
+            prepared = self.prepare_patch_documents(tickets, builder, ticket_spans)
+
+            async def create(ticket: Dict, document: Optional[Tuple[str, List[Dict]]],
+                             ticket_span: Any) -> Optional[int]:
+                if document is None:
+                    end_span(ticket_span)
+                    self._ticket_complete(ticket, None, 0.0)
+                    return None
+                return await self.create_work_item_from_ticket(ticket, document, ticket_span)
+
+            results = await asyncio.gather(*(
+                create(ticket, document, ticket_span)
+                for ticket, document, ticket_span in zip(tickets, prepared, ticket_spans)
+            ))
+        finally:
+            for ticket_span in ticket_spans:
+                end_span(ticket_span)
+            self._clear_deadline()
+
+        return list(zip(tickets, results))
+
+    async def create_work_items_batch(self, tickets: List[Dict],
+                                      deadline_seconds: float = None) -> Tuple[List[int], List[Dict]]:
+        """
+        Cria múltiplos work items em lote
+
+        Args:
+            tickets: Lista de dicionários com dados dos tickets
+            deadline_seconds: Prazo total do lote, incluindo retries (opcional, padrão: RETRY_CONFIG)
+
+        Returns:
+            Tuple[List[int], List[Dict]]: (IDs_criados, tickets_falharam)
+        """
+        created_ids = []
+        failed_tickets = []
+
+        for ticket, work_item_id in await self.create_work_items_with_results(tickets, deadline_seconds):
+            if work_item_id:
+                created_ids.append(work_item_id)
+            else:
+                failed_tickets.append(ticket)
+
+        logger.info(
+            f"Concluído: {len(created_ids)} criados, {len(failed_tickets)} falharam")
+
+        return created_ids, failed_tickets
+
+
+def _is_connect_timeout(error: Exception) -> bool:
+    """Timeout da fase de conexão (aiohttp >= 3.10 tem exceção própria; antes, só a mensagem)"""
+    if _CONNECTION_TIMEOUT_ERROR is not None:
+        return isinstance(error, _CONNECTION_TIMEOUT_ERROR)
+    return isinstance(error, aiohttp.ServerTimeoutError) and str(error).startswith('Connection timeout')
+
+
+def _classify_aiohttp_error(error: Exception) -> str:
+    """
+    Classifica uma exceção do aiohttp para a RetryPolicy
+
+    Args:
+        error: Exceção levantada pela sessão
+
+    Returns:
+        str: Tipo de falha
+    """
+    if isinstance(error, aiohttp.ClientConnectorError):
+        return ERROR_CONNECT
+    # Timeout na conexão: a requisição não chegou ao servidor (como requests.ConnectTimeout)
+    if _is_connect_timeout(error):
+        return ERROR_CONNECT
+    if isinstance(error, (asyncio.TimeoutError, aiohttp.ServerTimeoutError)):
+        return ERROR_TIMEOUT
+    return ERROR_CONNECTION
+
+
+def create_async_azure_devops_client(organization: str, project: str, pat_token: str,
+                                     area_path: str = None, **kwargs) -> AsyncAzureDevOpsClient:
+    """
+    Factory function para criar cliente Azure DevOps assíncrono
+
+    Args:
+        organization: Nome da organização no Azure DevOps
+        project: Nome do projeto
+        pat_token: Personal Access Token
+        area_path: Caminho da área (opcional)
+        **kwargs: Opções extras do cliente (session, http_config, max_concurrency, server_url, metrics)
+
+    Returns:
+        AsyncAzureDevOpsClient: Instância do cliente configurada
+    """
+    return AsyncAzureDevOpsClient(organization, project, pat_token, area_path, **kwargs)
@@ -4,41 +4,116 @@ Versão de produção - sem dados hardcoded ou testes
 """
 
 import base64
+import json
+import re
+import time
 import requests
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
 import logging
 
+from urllib3.exceptions import NewConnectionError
+
 from .config import (
     AZURE_DEVOPS_CONFIG,
+    BATCH_CONFIG,
     CATEGORY_TO_WORKITEM_MAPPING,
+    DEDUP_CONFIG,
+    METRICS_CONFIG,
+    TICKET_INDEX_CONFIG,
     PRIORITY_MAPPING,
-    INITIAL_STATES
+    RATE_LIMIT_CONFIG,
+    RETRY_CONFIG,
+    SYNC_CONFIG
+)
+from .journal import CreationJournal
+from .lifecycle import ClientHooks
+from .patch_diff import MANAGED_FIELDS, minimize_updates
+from .metrics import (
+    SPAN_BATCH,
+    SPAN_HTTP,
+    SPAN_POST,
+    SPAN_TICKET,
+    SPAN_TRANSFORM,
+    SPAN_VALIDATE,
+    RequestMetrics,
+    end_span,
+    get_shared_metrics,
+    set_span_attribute,
+    span,
+    span_links,
+    stats_delta,
+    start_span,
+    use_span
 )
+from .rate_limit import RequestScheduler, get_shared_scheduler
+from .retry import (
+    ERROR_CONNECT,
+    ERROR_CONNECTION,
+    ERROR_TIMEOUT,
+    IDEMPOTENT_METHODS,
+    Deadline,
+    DeadlineExceeded,
+    RetryPolicy
+)
+from .schema_cache import WorkItemTypeSchemaCache, get_shared_schema_cache
+from .session import build_timeout, get_shared_session
+from .ticket_index import TicketIndex
+from .transformer import FUSION_ID_FIELD, PatchDocumentBuilder
+from .work_item_cache import WorkItemCache
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+# Prefixo "[ID do chamado]" usado no título dos work items criados
+TITLE_TICKET_ID_PATTERN = re.compile(r'^\[([^\]]+)\]')
 
-class AzureDevOpsClient:
-    """Cliente para integração com Azure DevOps API"""
 
-    def __init__(self, organization: str, project: str, pat_token: str, area_path: str = None):
+class BaseAzureDevOpsClient:
+    """Base comum dos clientes Azure DevOps: credenciais, validação e montagem de payloads"""
+
+    def __init__(self, organization: str, project: str, pat_token: str, area_path: str = None,
+                 server_url: str = None, schema_cache: Optional[WorkItemTypeSchemaCache] = None,
+                 scheduler: Optional[RequestScheduler] = None, retry_policy: Optional[RetryPolicy] = None,
+                 metrics: Optional[RequestMetrics] = None):
         """
-        Inicializa o cliente Azure DevOps
+        Inicializa os dados comuns do cliente
 
         Args:
             organization: Nome da organização no Azure DevOps
             project: Nome do projeto
             pat_token: Personal Access Token
             area_path: Caminho da área (opcional)
+            server_url: URL do servidor Azure DevOps (opcional)
+            schema_cache: Cache de schemas de tipos (opcional, padrão: cache compartilhado do processo)
+            scheduler: Agendador de requisições (opcional, padrão: compartilhado por organização)
+            retry_policy: Política de reenvio (opcional, padrão: RETRY_CONFIG)
+            metrics: Agregador de métricas (opcional, padrão: compartilhado do processo)
         """
         self.organization = organization
         self.project = project
-        self.base_url = f"https://dev.azure.com/{organization}/{project}/_apis/wit"
+        self.server_url = (server_url or AZURE_DEVOPS_CONFIG.get(
+            'server_url', 'https://dev.azure.com')).rstrip('/')
+        self.base_url = f"{self.server_url}/{organization}/{project}/_apis/wit"
+
+        # Cache de campos por tipo de work item
+        self.schema_cache = schema_cache or get_shared_schema_cache()
 
-        # Configurações de timeout
-        self.timeout = 30
+        # Controle de taxa: toda chamada passa pelo agendador
+        self.scheduler = scheduler or get_shared_scheduler(organization)
+
+        # Reenvio de falhas transitórias e prazo do lote em andamento
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._deadline: Optional[Deadline] = None
+
+        # Métricas por endpoint (None quando desligadas em METRICS_CONFIG)
+        if metrics is None and METRICS_CONFIG['enabled']:
+            metrics = get_shared_metrics()
+        self.metrics = metrics
+
+        # Hooks de ciclo de vida (profilers, amostradores, contabilidade própria)
+        self.hooks = ClientHooks()
 
         # Define o area path
         self.area_path = area_path or AZURE_DEVOPS_CONFIG.get(
@@ -52,35 +127,184 @@ class AzureDevOpsClient:
             'Content-Type': 'application/json-patch+json'
         }
 
-        logger.info(f"Cliente inicializado para {organization}/{project}")
+    @property
+    def projects_url(self) -> str:
+        """URL de listagem de projetos usada no teste de conexão"""
+        return f"{self.server_url}/{self.organization}/_apis/projects?api-version={AZURE_DEVOPS_CONFIG['api_version']}"
+
+    @property
+    def project_url(self) -> str:
+        """URL do próprio projeto (sonda de saúde leve)"""
+        return (f"{self.server_url}/{self.organization}/_apis/projects/{quote(self.project)}"
+                f"?api-version={AZURE_DEVOPS_CONFIG['api_version']}")
+
+    def work_item_type_url(self, work_item_type: str) -> str:
+        """URL da definição de um tipo de work item"""
+        return f"{self.base_url}/workitemtypes/{work_item_type}?api-version={AZURE_DEVOPS_CONFIG['api_version']}"
+
+    def create_work_item_url(self, work_item_type: str) -> str:
+        """URL de criação de work item do tipo informado"""
+        return f"{self.base_url}/workitems/${work_item_type}?api-version={AZURE_DEVOPS_CONFIG['api_version']}"
+
+    def work_item_url(self, work_item_id: int) -> str:
+        """URL de um work item existente (leitura e atualização)"""
+        return f"{self.base_url}/workitems/{work_item_id}?api-version={AZURE_DEVOPS_CONFIG['api_version']}"
+
+    @property
+    def wiql_url(self) -> str:
+        """URL do endpoint de consultas WIQL do projeto"""
+        return f"{self.base_url}/wiql?api-version={AZURE_DEVOPS_CONFIG['api_version']}"
+
+    @property
+    def work_items_batch_url(self) -> str:
+        """URL do endpoint de leitura em lote (workitemsbatch)"""
+        return f"{self.base_url}/workitemsbatch?api-version={AZURE_DEVOPS_CONFIG['api_version']}"
+
+    @property
+    def batch_url(self) -> str:
+        """URL do endpoint wit/$batch da organização"""
+        return f"{self.server_url}/{self.organization}/_apis/wit/$batch?api-version={AZURE_DEVOPS_CONFIG['api_version']}"
+
+    def _build_batch_operation(self, work_item_type: str, patch_document: List[Dict]) -> Dict:
+        """
+        Empacota a criação de um work item como operação do wit/$batch
 
-    def test_connection(self) -> bool:
+        Args:
+            work_item_type: Tipo de work item de destino
+            patch_document: Operações JSON Patch do work item
+
+        Returns:
+            Dict: Operação no formato aceito pelo $batch
         """
-        Testa a conexão com a API do Azure DevOps
+        return {
+            'method': 'PATCH',
+            'uri': f"/{quote(self.project)}/_apis/wit/workitems/${quote(work_item_type)}"
+                   f"?api-version={AZURE_DEVOPS_CONFIG['api_version']}",
+            'headers': {'Content-Type': 'application/json-patch+json'},
+            'body': patch_document
+        }
+
+    def _build_batch_update_operation(self, work_item_id: int, patch_document: List[Dict]) -> Dict:
+        """
+        Empacota a atualização de um work item como operação do wit/$batch
+
+        Args:
+            work_item_id: ID do work item de destino
+            patch_document: Operações JSON Patch do work item
 
         Returns:
-            bool: True se a conexão foi bem-sucedida
+            Dict: Operação no formato aceito pelo $batch
         """
-        try:
-            url = f"https://dev.azure.com/{self.organization}/_apis/projects?api-version={AZURE_DEVOPS_CONFIG['api_version']}"
-            response = requests.get(
-                url, headers=self.headers, timeout=self.timeout)
+        return {
+            'method': 'PATCH',
+            'uri': f"/_apis/wit/workitems/{work_item_id}?api-version={AZURE_DEVOPS_CONFIG['api_version']}",
+            'headers': {'Content-Type': 'application/json-patch+json'},
+            'body': patch_document
+        }
 
-            if response.status_code == 200:
-                projects = response.json()
-                logger.info(
-                    f"Conexão estabelecida! Projetos encontrados: {len(projects['value'])}")
-                return True
-            else:
-                logger.error(f"Erro na conexão: {response.status_code}")
-                return False
+    def get_retry_stats(self) -> Dict:
+        """
+        Retorna os contadores de reenvios realizados pelo cliente
 
-        except requests.exceptions.Timeout:
-            logger.error(f"Timeout na conexão (>{self.timeout}s)")
-            return False
-        except Exception as e:
-            logger.error(f"Erro de conexão: {str(e)}")
+        Returns:
+            Dict: Total de retries e quebra por motivo
+        """
+        return self.retry_policy.get_stats()
+
+    def get_request_metrics(self, since: Optional[Dict] = None) -> Dict:
+        """
+        Retorna as métricas por endpoint das chamadas HTTP
+
+        O agregador padrão é compartilhado pelo processo (get_shared_metrics) e
+        acumula as chamadas de todas as tasks que passaram por ele; para medir
+        só um trecho, guarde um retorno anterior e passe-o em since.
+
+        Args:
+            since: Retorno anterior deste método (opcional); devolve só a diferença
+                desde ele (stats_delta, sem latency_ms_max)
+
+        Returns:
+            Dict: endpoint -> contagem, latência, status, bytes e retries
+        """
+        if self.metrics is None:
+            return {}
+        stats = self.metrics.get_stats()
+        return stats if since is None else stats_delta(since, stats)
+
+    def add_hook(self, event: str, callback: Callable) -> None:
+        """
+        Registra um callback de ciclo de vida
+
+        Args:
+            event: before_request, after_response, on_error, on_ticket_complete
+                ou around_transform (ver lifecycle.EVENTS)
+            callback: Função chamada no evento
+        """
+        self.hooks.add(event, callback)
+
+    def register_hooks(self, handler: Any) -> Any:
+        """
+        Registra os métodos de evento de um objeto (ex.: TimingBreakdownHook, TransformProfiler)
+
+        Args:
+            handler: Objeto com um ou mais métodos de evento
+
+        Returns:
+            Any: O próprio handler
+        """
+        return self.hooks.register(handler)
+
+    def _ticket_complete(self, ticket: Dict, work_item_id: Optional[int], elapsed_seconds: float) -> None:
+        """Dispara on_ticket_complete, se houver callbacks"""
+        if self.hooks.on_ticket_complete:
+            self.hooks.dispatch('on_ticket_complete', ticket, work_item_id, elapsed_seconds)
+
+    def _record_retry(self, reason: str, method: str, url: str) -> None:
+        """Contabiliza um reenvio na RetryPolicy e nas métricas do endpoint"""
+        self.retry_policy.record_retry(reason)
+        if self.metrics is not None:
+            self.metrics.record_retry(method, url, reason)
+
+    def _start_deadline(self, deadline_seconds: float = None) -> Optional[Deadline]:
+        """
+        Abre o prazo total de um lote; todas as requisições seguintes o respeitam
+
+        Args:
+            deadline_seconds: Orçamento em segundos (opcional, padrão: RETRY_CONFIG; 0 desativa)
+
+        Returns:
+            Optional[Deadline]: Prazo ativo ou None
+        """
+        if deadline_seconds is None:
+            deadline_seconds = RETRY_CONFIG['batch_deadline_seconds']
+        self._deadline = Deadline(deadline_seconds) if deadline_seconds else None
+        return self._deadline
+
+    def _clear_deadline(self) -> None:
+        """Encerra o prazo do lote"""
+        self._deadline = None
+
+    def _deadline_allows(self, delay: float) -> bool:
+        """Se ainda há prazo para esperar delay segundos antes de reenviar"""
+        return self._deadline is None or self._deadline.remaining() > delay
+
+    def _retry_allowed(self, attempt: int, idempotent: bool, status_code: int = None,
+                       error_kind: str = None) -> bool:
+        """Consulta a RetryPolicy considerando o prazo do lote"""
+        if not self.retry_policy.should_retry(attempt, idempotent, status_code, error_kind):
             return False
+        # Espera máxima possível desta tentativa precisa caber no prazo
+        return self._deadline_allows(
+            min(self.retry_policy.backoff_max, self.retry_policy.backoff_base * (2 ** attempt)))
+
+    def get_rate_limit_state(self) -> Dict:
+        """
+        Retorna o estado do agendador de requisições para monitoramento
+
+        Returns:
+            Dict: Tokens, taxa atual, atrasos aplicados e requisições adiadas
+        """
+        return self.scheduler.get_state()
 
     def validate_ticket(self, ticket: Dict) -> Tuple[bool, List[str]]:
         """
@@ -115,121 +339,299 @@ class AzureDevOpsClient:
         is_valid = len(errors) == 0
         return is_valid, errors
 
-    def create_work_item_from_ticket(self, ticket: Dict) -> Optional[int]:
+    def _resolve_work_item_type(self, ticket: Dict) -> str:
         """
-        Cria um work item baseado nos dados de um ticket do Fusion
+        Mapeia a categoria do ticket para o tipo de work item
 
         Args:
             ticket: Dicionário com dados do ticket
 
         Returns:
-            Optional[int]: ID do work item criado ou None se houve erro
+            str: Nome do tipo de work item
         """
-        try:
-            # Valida o ticket antes de processar
-            is_valid, validation_errors = self.validate_ticket(ticket)
+        return CATEGORY_TO_WORKITEM_MAPPING.get(
+            ticket.get('categoria', 'Desenvolvimento'),
+            "Product backlog item"
+        )
+
+    def _build_patch_document(self, ticket: Dict, work_item_type: str,
+                              include_fusion_id: bool) -> List[Dict]:
+        """
+        Monta o JSON Patch de criação de um único work item
+
+        Para lotes, prefira um PatchDocumentBuilder reaproveitado (create_patch_builder).
+
+        Args:
+            ticket: Dicionário com dados do ticket
+            work_item_type: Tipo de work item de destino
+            include_fusion_id: Se o campo Custom.IDChamadoFusion existe no tipo
+
+        Returns:
+            List[Dict]: Operações do patch document
+        """
+        builder = PatchDocumentBuilder(self.full_area_path, lambda _: include_fusion_id)
+        return builder.build(ticket)[1]
+
+    def create_patch_builder(self, has_fusion_field: Callable[[str], bool] = None) -> PatchDocumentBuilder:
+        """
+        Cria o builder de patch documents de uma execução
+
+        Args:
+            has_fusion_field: Indica se o tipo tem o campo do Fusion
+                (opcional, padrão: consulta síncrona ao schema do tipo)
+
+        Returns:
+            PatchDocumentBuilder: Builder ligado à área e ao schema deste cliente
+        """
+        if has_fusion_field is None:
+            def has_fusion_field(work_item_type: str) -> bool:
+                return self._field_exists_in_work_item_type(work_item_type, FUSION_ID_FIELD)
+
+        return PatchDocumentBuilder(self.full_area_path, has_fusion_field)
+
+    def prepare_patch_documents(self, tickets: List[Dict],
+                                builder: PatchDocumentBuilder = None,
+                                ticket_spans: Optional[List[Any]] = None
+                                ) -> List[Optional[Tuple[str, List[Dict]]]]:
+        """
+        Valida e monta os patch documents de um bloco de tickets
+
+        Validação e montagem abrem como filhas do span do ticket. Com ticket_spans,
+        o span de cada ticket fica aberto para que o POST também seja aberto sob ele
+        (quem chama encerra com use_span/end_span); sem, é encerrado aqui.
+
+        Args:
+            tickets: Lista de dicionários com dados dos tickets
+            builder: Builder reaproveitado entre blocos (opcional, padrão: um novo)
+            ticket_spans: Lista que recebe o span aberto de cada ticket, na ordem de entrada (opcional)
+
+        Returns:
+            List[Optional[Tuple[str, List[Dict]]]]: (tipo, patch document) por ticket,
+                None para tickets inválidos
+        """
+        builder = builder or self.create_patch_builder()
+        prepared: List[Optional[Tuple[str, List[Dict]]]] = []
+
+        for ticket in tickets:
+            ticket_span = start_span(SPAN_TICKET, {'fusion.ticket_id': str(ticket.get('id'))})
+            with span(SPAN_VALIDATE, parent=ticket_span):
+                is_valid, validation_errors = self.validate_ticket(ticket)
             if not is_valid:
-                logger.error(f"Ticket inválido {ticket.get('id', 'SEM-ID')}:")
-                for error in validation_errors:
-                    logger.error(f"  • {error}")
-                return None
+                self._log_validation_errors(ticket, validation_errors)
+                prepared.append(None)
+            else:
+                with span(SPAN_TRANSFORM, parent=ticket_span), self.hooks.transform(ticket):
+                    prepared.append(builder.build(ticket))
+
+            if ticket_spans is None:
+                end_span(ticket_span)
+            else:
+                ticket_spans.append(ticket_span)
 
-            # Mapeia categoria para tipo de work item
-            work_item_type = CATEGORY_TO_WORKITEM_MAPPING.get(
-                ticket.get('categoria', 'Desenvolvimento'),
-                "Product backlog item"
-            )
-
-            # Mapeia prioridade
-            priority = PRIORITY_MAPPING.get(
-                ticket.get('prioridade', 'Normal'),
-                3
-            )
-
-            # Estado inicial
-            initial_state = INITIAL_STATES.get(work_item_type, "Backlog")
-
-            # Monta URL
-            url = f"{self.base_url}/workitems/${work_item_type}?api-version={AZURE_DEVOPS_CONFIG['api_version']}"
-
-            # Monta descrição enriquecida
-            description = self._build_description(ticket)
-
-            # Patch document
-            patch_document = [
-                {
-                    "op": "add",
-                    "path": "/fields/System.Title",
-                    "value": f"[{ticket.get('id', 'SEM-ID')}] {ticket.get('titulo', 'Sem título')}"
-                },
-                {
-                    "op": "add",
-                    "path": "/fields/System.Description",
-                    "value": description
-                },
-                {
-                    "op": "add",
-                    "path": "/fields/System.State",
-                    "value": initial_state
-                },
-                {
-                    "op": "add",
-                    "path": "/fields/Microsoft.VSTS.Common.Priority",
-                    "value": priority
-                },
-                {
-                    "op": "add",
-                    "path": "/fields/System.AreaPath",
-                    "value": self.full_area_path
-                }
-            ]
-
-            # Adiciona campo ID Chamado Fusion se existir no tipo de work item
-            if self._field_exists_in_work_item_type(work_item_type, "Custom.IDChamadoFusion"):
-                patch_document.append({
-                    "op": "add",
-                    "path": "/fields/Custom.IDChamadoFusion",
-                    "value": ticket.get('id', 'SEM-ID')
-                })
+        return prepared
+
+    def _log_validation_errors(self, ticket: Dict, validation_errors: List[str]) -> None:
+        """Registra os erros de validação de um ticket"""
+        logger.error(f"Ticket inválido {ticket.get('id', 'SEM-ID')}:")
+        for error in validation_errors:
+            logger.error(f"  • {error}")
+
+
+class AzureDevOpsClient(BaseAzureDevOpsClient):
+    """Cliente para integração com Azure DevOps API"""
+
+    def __init__(self, organization: str, project: str, pat_token: str, area_path: str = None,
+                 session: Optional[requests.Session] = None, http_config: Optional[Dict] = None,
+                 server_url: str = None, schema_cache: Optional[WorkItemTypeSchemaCache] = None,
+                 scheduler: Optional[RequestScheduler] = None, retry_policy: Optional[RetryPolicy] = None,
+                 ticket_index: Optional[TicketIndex] = None, metrics: Optional[RequestMetrics] = None):
+        """
+        Inicializa o cliente Azure DevOps
+
+        Args:
+            organization: Nome da organização no Azure DevOps
+            project: Nome do projeto
+            pat_token: Personal Access Token
+            area_path: Caminho da área (opcional)
+            session: Sessão HTTP a reutilizar (opcional, padrão: pool compartilhado do processo)
+            http_config: Sobrescreve valores de HTTP_CONFIG (opcional)
+            server_url: URL do servidor Azure DevOps (opcional)
+            schema_cache: Cache de schemas de tipos (opcional, padrão: cache compartilhado do processo)
+            scheduler: Agendador de requisições (opcional, padrão: compartilhado por organização)
+            retry_policy: Política de reenvio (opcional, padrão: RETRY_CONFIG)
+            ticket_index: Índice local ticket -> work item (opcional)
+            metrics: Agregador de métricas (opcional, padrão: compartilhado do processo)
+        """
+        super().__init__(organization, project, pat_token, area_path,
+                         server_url=server_url, schema_cache=schema_cache, scheduler=scheduler,
+                         retry_policy=retry_policy, metrics=metrics)
+
+        # Índice local consultado antes da WIQL e atualizado a cada criação
+        self.ticket_index = ticket_index
+
+        # Configurações de timeout (conexão, leitura)
+        self.timeout = build_timeout(http_config)
+
+        # Sessão HTTP com pool de conexões keep-alive
+        self.session = session or get_shared_session(http_config)
+
+        logger.info(f"Cliente inicializado para {organization}/{project}")
+
+    def close(self) -> None:
+        """
+        Libera os recursos próprios do cliente (conexão SQLite do índice local)
+
+        A sessão HTTP não é fechada: é o pool compartilhado do processo
+        (get_shared_session) ou pertence a quem a passou ao cliente. Depois de
+        fechado, o cliente continua funcionando sem o índice local.
+        """
+        ticket_index, self.ticket_index = self.ticket_index, None
+        if ticket_index is not None:
+            ticket_index.close()
+
+    def test_connection(self) -> bool:
+        """
+        Testa a conexão com a API do Azure DevOps
+
+        Returns:
+            bool: True se a conexão foi bem-sucedida
+        """
+        try:
+            response = self._request('GET', self.projects_url)
+
+            if response.status_code == 200:
+                projects = response.json()
                 logger.info(
-                    f"Campo 'ID Chamado Fusion' adicionado: {ticket.get('id')}")
+                    f"Conexão estabelecida! Projetos encontrados: {len(projects['value'])}")
+                return True
             else:
-                logger.warning(
-                    f"Campo 'ID Chamado Fusion' não existe no tipo '{work_item_type}'")
+                logger.error(f"Erro na conexão: {response.status_code}")
+                return False
 
-            logger.info(
-                f"Criando work item: {work_item_type} - {ticket.get('id')}")
+        except requests.exceptions.Timeout:
+            logger.error(f"Timeout na conexão (>{self.timeout[1]}s)")
+            return False
+        except Exception as e:
+            logger.error(f"Erro de conexão: {str(e)}")
+            return False
+
+    def check_health(self) -> bool:
+        """
+        Verifica credenciais e projeto com uma única leitura pequena
 
-            response = requests.post(
-                url, headers=self.headers, json=patch_document, timeout=self.timeout)
+        Mais barato que test_connection, que lista todos os projetos da organização.
+
+        Returns:
+            bool: True se o projeto respondeu
+        """
+        try:
+            response = self._request('GET', self.project_url)
 
             if response.status_code == 200:
-                work_item = response.json()
-                work_item_id = work_item['id']
-                work_item_url = work_item.get('_links', {}).get(
-                    'html', {}).get('href', '')
+                logger.info(f"Azure DevOps disponível: projeto {self.project}")
+                return True
+
+            logger.error(f"Sonda de saúde falhou: {response.status_code}")
+            return False
 
-                logger.info(f"Work item criado: ID {work_item_id}")
-                logger.info(f"URL: {work_item_url}")
+        except Exception as e:
+            logger.error(f"Erro na sonda de saúde: {str(e)}")
+            return False
 
-                return work_item_id
-            else:
-                logger.error(
-                    f"Erro ao criar work item: {response.status_code}")
-                logger.error(f"Response: {response.text}")
-                return None
+    def create_work_item_from_ticket(self, ticket: Dict,
+                                     prepared: Optional[Tuple[str, List[Dict]]] = None,
+                                     ticket_span: Any = None) -> Optional[int]:
+        """
+        Cria um work item baseado nos dados de um ticket do Fusion
+
+        Args:
+            ticket: Dicionário com dados do ticket
+            prepared: (tipo, patch document) já validado e montado pelo lote (opcional)
+            ticket_span: Span do ticket aberto por prepare_patch_documents (opcional)
+
+        Returns:
+            Optional[int]: ID do work item criado ou None se houve erro
+        """
+        if not self.hooks.on_ticket_complete:
+            return self._create_work_item(ticket, prepared, ticket_span)
+
+        start = time.perf_counter()
+        work_item_id = self._create_work_item(ticket, prepared, ticket_span)
+        self._ticket_complete(ticket, work_item_id, time.perf_counter() - start)
+        return work_item_id
+
+    def _create_work_item(self, ticket: Dict,
+                          prepared: Optional[Tuple[str, List[Dict]]] = None,
+                          ticket_span: Any = None) -> Optional[int]:
+        """Validação, montagem e POST de um ticket (corpo de create_work_item_from_ticket)"""
+        try:
+            with (use_span(ticket_span) if ticket_span is not None
+                  else span(SPAN_TICKET, {'fusion.ticket_id': str(ticket.get('id'))})):
+                if prepared is None:
+                    # Valida o ticket antes de processar
+                    with span(SPAN_VALIDATE):
+                        is_valid, validation_errors = self.validate_ticket(ticket)
+                    if not is_valid:
+                        self._log_validation_errors(ticket, validation_errors)
+                        return None
+
+                    # Mapeia categoria para tipo de work item
+                    with span(SPAN_TRANSFORM), self.hooks.transform(ticket):
+                        work_item_type = self._resolve_work_item_type(ticket)
+
+                        patch_document = self._build_patch_document(
+                            ticket, work_item_type,
+                            self._field_exists_in_work_item_type(work_item_type, FUSION_ID_FIELD))
+                else:
+                    work_item_type, patch_document = prepared
+
+                # Monta URL
+                url = self.create_work_item_url(work_item_type)
+
+                logger.info(
+                    f"Criando work item: {work_item_type} - {ticket.get('id')}")
+
+                with span(SPAN_POST):
+                    response = self._request('POST', url, json=patch_document)
+
+                if response.status_code == 200:
+                    work_item = response.json()
+                    work_item_id = work_item['id']
+                    work_item_url = work_item.get('_links', {}).get(
+                        'html', {}).get('href', '')
+
+                    logger.info(f"Work item criado: ID {work_item_id}")
+                    logger.info(f"URL: {work_item_url}")
+
+                    if self.ticket_index is not None:
+                        self.ticket_index.record(
+                            ticket.get('id'), work_item_id,
+                            work_item.get('fields', {}).get('System.ChangedDate'))
+
+                    return work_item_id
+                else:
+                    logger.error(
+                        f"Erro ao criar work item: {response.status_code}")
+                    logger.error(f"Response: {response.text}")
+                    return None
 
         except Exception as e:
             logger.error(
                 f"Erro ao processar ticket {ticket.get('id')}: {str(e)}")
             return None
 
-    def create_work_items_batch(self, tickets: List[Dict]) -> Tuple[List[int], List[Dict]]:
+    def create_work_items_batch(self, tickets: List[Dict], max_workers: int = None,
+                                use_batch_api: bool = None, deadline_seconds: float = None,
+                                journal: Optional[CreationJournal] = None) -> Tuple[List[int], List[Dict]]:
         """
         Cria múltiplos work items em lote
 
         Args:
             tickets: Lista de dicionários com dados dos tickets
+            max_workers: Máximo de requisições simultâneas (opcional, padrão: BATCH_CONFIG)
+            use_batch_api: Agrupa as criações no endpoint wit/$batch (opcional, padrão: BATCH_CONFIG)
+            deadline_seconds: Prazo total do lote, incluindo retries (opcional, padrão: RETRY_CONFIG)
+            journal: Journal da execução para retomar um lote interrompido (opcional)
 
         Returns:
             Tuple[List[int], List[Dict]]: (IDs_criados, tickets_falharam)
@@ -237,13 +639,8 @@ class AzureDevOpsClient:
         created_ids = []
         failed_tickets = []
 
-        logger.info(f"Iniciando criação de {len(tickets)} work items...")
-
-        for i, ticket in enumerate(tickets, 1):
-            logger.info(f"Processando {i}/{len(tickets)}: {ticket.get('id')}")
-
-            work_item_id = self.create_work_item_from_ticket(ticket)
-
+        for ticket, work_item_id in self.create_work_items_with_results(
+                tickets, max_workers, use_batch_api, deadline_seconds, journal):
             if work_item_id:
                 created_ids.append(work_item_id)
             else:
@@ -254,41 +651,803 @@ class AzureDevOpsClient:
 
         return created_ids, failed_tickets
 
-    def _build_description(self, ticket: Dict) -> str:
+    def create_work_items_with_results(self, tickets: List[Dict], max_workers: int = None,
+                                       use_batch_api: bool = None, deadline_seconds: float = None,
+                                       journal: Optional[CreationJournal] = None
+                                       ) -> List[Tuple[Dict, Optional[int]]]:
         """
-        Monta descrição enriquecida do work item
+        Cria múltiplos work items mantendo o vínculo ticket -> ID criado
+
+        As requisições rodam em um pool de threads limitado a max_workers; a falha
+        de um ticket não interrompe os demais. Quando o prazo do lote termina, os
+        tickets ainda não enviados falham imediatamente em vez de estourar o SLA.
+
+        Com um journal, cada envio é registrado antes (intenção) e depois (resultado).
+        Numa nova tentativa, tickets concluídos não são reenviados e os que ficaram
+        em dúvida são conferidos no Azure DevOps com uma única busca antes de recriar.
 
         Args:
-            ticket: Dicionário com dados do ticket
+            tickets: Lista de dicionários com dados dos tickets
+            max_workers: Máximo de requisições simultâneas (opcional, padrão: BATCH_CONFIG)
+            use_batch_api: Agrupa as criações no endpoint wit/$batch (opcional, padrão: BATCH_CONFIG)
+            deadline_seconds: Prazo total do lote, incluindo retries (opcional, padrão: RETRY_CONFIG)
+            journal: Journal da execução para retomar um lote interrompido (opcional)
 
         Returns:
-            str: Descrição HTML formatada
+            List[Tuple[Dict, Optional[int]]]: (ticket, ID criado ou None), na ordem de entrada
         """
-        import html
+        max_workers = max_workers or BATCH_CONFIG['max_workers']
+        if use_batch_api is None:
+            use_batch_api = BATCH_CONFIG['use_batch_api']
+
+        ticket_spans: List[Any] = []
+        self._start_deadline(deadline_seconds)
+        try:
+            # Tickets concluídos numa tentativa anterior não são reenviados
+            resumed = self._resume_from_journal(tickets, journal) if journal is not None else {}
+            pending = [ticket for ticket in tickets
+                       if str(ticket.get('id')) not in resumed] if resumed else tickets
+            total = len(pending)
 
-        # Escapa caracteres especiais HTML para segurança
-        safe_id = html.escape(str(ticket.get('id', 'N/A')))
-        safe_desc = html.escape(str(ticket.get('descricao', 'Sem descrição')))
-        safe_solicitante = html.escape(str(ticket.get('solicitante', 'N/A')))
-        safe_categoria = html.escape(str(ticket.get('categoria', 'N/A')))
-        safe_prioridade = html.escape(str(ticket.get('prioridade', 'N/A')))
-        safe_status = html.escape(str(ticket.get('status', 'N/A')))
+            logger.info(
+                f"Iniciando criação de {total} work items ({max_workers} simultâneos"
+                f"{', via $batch' if use_batch_api else ''})...")
 
-        description = f"""
-<h3>📋 Detalhes do Chamado</h3>
-<p><strong>ID Original:</strong> {safe_id}</p>
-<p><strong>Descrição:</strong> {safe_desc}</p>
-<p><strong>Solicitante:</strong> {safe_solicitante}</p>
-<p><strong>Categoria:</strong> {safe_categoria}</p>
-<p><strong>Prioridade:</strong> {safe_prioridade}</p>
-<p><strong>Status Original:</strong> {safe_status}</p>
+            # Valida e monta todos os patch documents antes de abrir as threads;
+            # o schema de cada tipo é consultado uma única vez nessa passada.
+            # O span de cada ticket fica aberto até o POST (ou o $batch) terminar
+            prepared = self.prepare_patch_documents(pending, ticket_spans=ticket_spans)
 
-<h3>🤖 Informações de Integração</h3>
-<p><strong>Importado via:</strong> Airflow + Fusion Integration</p>
-<p><strong>Data de Importação:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-<p><strong>Área de Destino:</strong> {html.escape(self.full_area_path)}</p>
-"""
-        return description
+            if use_batch_api:
+                results = self._create_work_items_via_batch_api(
+                    pending, prepared, max_workers, journal, ticket_spans)
+            else:
+                def process(position: int, ticket: Dict) -> Optional[int]:
+                    ticket_span = ticket_spans[position - 1]
+                    if prepared[position - 1] is None:
+                        end_span(ticket_span)
+                        self._ticket_complete(ticket, None, 0.0)
+                        return None
+                    logger.info(f"Processando {position}/{total}: {ticket.get('id')}")
+                    if journal is None:
+                        return self.create_work_item_from_ticket(ticket, prepared[position - 1], ticket_span)
+
+                    journal.log_intents([ticket.get('id')])
+                    work_item_id = self.create_work_item_from_ticket(ticket, prepared[position - 1], ticket_span)
+                    journal.log_outcomes([(ticket.get('id'), work_item_id)])
+                    return work_item_id
+
+                results = self._run_concurrently(
+                    lambda item: process(*item), list(enumerate(pending, 1)), max_workers,
+                    describe=lambda item: item[1].get('id'))
+        finally:
+            # Tickets não enviados (prazo esgotado, erro no lote) também encerram o span
+            for ticket_span in ticket_spans:
+                end_span(ticket_span)
+            self._clear_deadline()
+
+        retry_stats = self.get_retry_stats()
+        if retry_stats['retries_total']:
+            logger.info(f"Retries realizados: {retry_stats['retries_by_reason']}")
+
+        if resumed:
+            pending_results = iter(results)
+            results = [resumed[str(ticket.get('id'))] if str(ticket.get('id')) in resumed
+                       else next(pending_results) for ticket in tickets]
+
+        return list(zip(tickets, results))
+
+    def _resume_from_journal(self, tickets: List[Dict], journal: CreationJournal) -> Dict[str, int]:
+        """
+        Descobre, pelo journal, quais tickets do lote já têm work item
+
+        Tickets em dúvida (intenção sem resultado, ou falha que pode ter ocorrido
+        no servidor) são conferidos com uma única chamada a find_existing_work_items.
+
+        Args:
+            tickets: Lista de dicionários com dados dos tickets
+            journal: Journal da execução
+
+        Returns:
+            Dict[str, int]: ID do ticket -> ID do work item já existente
+
+        Raises:
+            requests.HTTPError: Se a conferência falhar (evita recriar às cegas)
+        """
+        completed, in_doubt = journal.split(ticket.get('id') for ticket in tickets)
+
+        if in_doubt:
+            found = self.find_existing_work_items(in_doubt)
+            journal.log_outcomes(found.items())
+            completed.update(found)
+            logger.info(
+                f"Journal: {len(found)}/{len(in_doubt)} tickets em dúvida já existiam no Azure DevOps")
+
+        if completed:
+            logger.info(
+                f"Journal: {len(completed)} tickets já concluídos em tentativa anterior serão pulados")
+
+        return completed
+
+    def _create_work_items_via_batch_api(self, tickets: List[Dict],
+                                         prepared: List[Optional[Tuple[str, List[Dict]]]],
+                                         max_workers: int,
+                                         journal: Optional[CreationJournal] = None,
+                                         ticket_spans: Optional[List[Any]] = None) -> List[Optional[int]]:
+        """
+        Cria work items agrupando os patch documents em chamadas do wit/$batch
+
+        Cada chamada abre um span SPAN_BATCH ligado aos spans dos tickets do bloco,
+        e cada ticket recebe um SPAN_POST filho com a duração da chamada.
+
+        Args:
+            tickets: Lista de dicionários com dados dos tickets
+            prepared: (tipo, patch document) de cada ticket, None para inválidos
+            max_workers: Máximo de chamadas $batch simultâneas
+            journal: Journal da execução (opcional)
+            ticket_spans: Span aberto de cada ticket, de prepare_patch_documents (opcional)
+
+        Returns:
+            List[Optional[int]]: ID criado (ou None) para cada ticket, na ordem de entrada
+        """
+        results: List[Optional[int]] = [None] * len(tickets)
+
+        # Operações apenas para tickets válidos
+        indexes = []
+        operations = []
+        for index, document in enumerate(prepared):
+            if document is None:
+                continue
+            work_item_type, patch_document = document
+            indexes.append(index)
+            operations.append(self._build_batch_operation(work_item_type, patch_document))
+
+        chunks = _chunk_batch_operations(
+            operations, BATCH_CONFIG['batch_api_max_items'], BATCH_CONFIG['batch_api_max_bytes'])
+
+        logger.info(
+            f"Enviando {len(operations)} operações em {len(chunks)} chamadas $batch")
+
+        elapsed: List[float] = [0.0] * len(tickets)
+
+        def send(chunk: List[int]) -> List[Optional[int]]:
+            ticket_ids = [tickets[indexes[position]].get('id') for position in chunk]
+            if journal is not None:
+                journal.log_intents(ticket_ids)
+
+            chunk_spans = [ticket_spans[indexes[position]] for position in chunk] if ticket_spans else []
+            post_spans = [start_span(SPAN_POST, parent=ticket_span) for ticket_span in chunk_spans]
+
+            start = time.perf_counter()
+            try:
+                with span(SPAN_BATCH, {'azure_devops.batch.size': len(chunk)}, links=span_links(chunk_spans)):
+                    chunk_ids = self._send_batch_chunk([operations[i] for i in chunk])
+            finally:
+                for position in chunk:
+                    elapsed[indexes[position]] = time.perf_counter() - start
+                for post_span, ticket_span in zip(post_spans, chunk_spans):
+                    end_span(post_span)
+                    end_span(ticket_span)
+
+            if journal is not None:
+                journal.log_outcomes(zip(ticket_ids, chunk_ids))
+            return chunk_ids
+
+        chunk_results = self._run_concurrently(send, chunks, max_workers)
+
+        for chunk, chunk_ids in zip(chunks, chunk_results):
+            for position, work_item_id in zip(chunk, chunk_ids or []):
+                results[indexes[position]] = work_item_id
+
+        if self.hooks.on_ticket_complete:
+            for index, ticket in enumerate(tickets):
+                self._ticket_complete(ticket, results[index], elapsed[index])
+
+        if self.ticket_index is not None:
+            self.ticket_index.record_many(
+                (ticket.get('id'), work_item_id, None)
+                for ticket, work_item_id in zip(tickets, results) if work_item_id)
+
+        return results
+
+    def _send_batch_chunk(self, operations: List[Dict], update: bool = False) -> List[Optional[int]]:
+        """
+        Envia uma chamada wit/$batch e interpreta a resposta de cada operação
+
+        Args:
+            operations: Operações do $batch (já dentro dos limites de tamanho)
+            update: Operações são atualizações (idempotentes, podem ser reenviadas)
+
+        Returns:
+            List[Optional[int]]: ID criado/atualizado (ou None) para cada operação, na mesma ordem
+        """
+        work_item_ids: List[Optional[int]] = [None] * len(operations)
+        action = 'atualizar' if update else 'criar'
+
+        try:
+            response = self._request(
+                'POST', self.batch_url, idempotent=update, json=operations,
+                headers={**self.headers, 'Content-Type': 'application/json'})
+
+            if response.status_code != 200:
+                logger.error(
+                    f"Erro na chamada $batch ({len(operations)} operações): {response.status_code}")
+                logger.error(f"Response: {response.text}")
+                return work_item_ids
+
+            for position, item in enumerate(response.json().get('value', [])[:len(operations)]):
+                body = item.get('body')
+                if isinstance(body, str):
+                    body = json.loads(body) if body else {}
+
+                if item.get('code') == 200 and body and 'id' in body:
+                    work_item_ids[position] = body['id']
+                    logger.info(f"Work item {'atualizado' if update else 'criado'}: ID {body['id']}")
+                else:
+                    message = (body or {}).get('message', '') if isinstance(body, dict) else body
+                    logger.error(
+                        f"Erro ao {action} work item via $batch: {item.get('code')} {message}")
+
+        except Exception as e:
+            logger.error(f"Erro na chamada $batch: {str(e)}")
+
+        return work_item_ids
+
+    def update_work_item(self, work_item_id: int, patch_document: List[Dict]) -> Optional[int]:
+        """
+        Aplica um patch document a um work item existente
+
+        Args:
+            work_item_id: ID do work item
+            patch_document: Operações JSON Patch
+
+        Returns:
+            Optional[int]: ID do work item atualizado ou None se houve erro
+        """
+        try:
+            # Reaplicar os mesmos valores não duplica nada: a atualização pode ser reenviada
+            response = self._request('PATCH', self.work_item_url(work_item_id),
+                                     idempotent=True, json=patch_document)
+
+            if response.status_code == 200:
+                logger.info(f"Work item atualizado: ID {work_item_id}")
+                return work_item_id
+
+            logger.error(f"Erro ao atualizar work item {work_item_id}: {response.status_code}")
+            logger.error(f"Response: {response.text}")
+            return None
+
+        except Exception as e:
+            logger.error(f"Erro ao atualizar work item {work_item_id}: {str(e)}")
+            return None
+
+    def sync_work_items(self, tickets: List[Dict], max_workers: int = None,
+                        use_batch_api: bool = None, deadline_seconds: float = None,
+                        minimal_diff: bool = None) -> Tuple[List[int], List[Dict], List[Dict]]:
+        """
+        Atualiza os work items de tickets já integrados que mudaram no Fusion
+
+        Os work items são localizados com find_existing_work_items (índice local
+        e WIQL em lote) e recebem o patch de PatchDocumentBuilder.build_update:
+        título, descrição, prioridade, área e estado mapeado do status. Com
+        minimal_diff, os campos atuais são lidos em lote e só as diferenças são
+        enviadas; work items já iguais não geram requisição nem revisão.
+
+        Args:
+            tickets: Tickets alterados no Fusion
+            max_workers: Máximo de requisições simultâneas (opcional, padrão: BATCH_CONFIG)
+            use_batch_api: Agrupa as atualizações no endpoint wit/$batch (opcional, padrão: SYNC_CONFIG)
+            deadline_seconds: Prazo total do lote, incluindo retries (opcional, padrão: RETRY_CONFIG)
+            minimal_diff: Envia só os campos que mudaram (opcional, padrão: SYNC_CONFIG)
+
+        Returns:
+            Tuple[List[int], List[Dict], List[Dict]]: (IDs_atualizados, tickets_falharam,
+                tickets_sem_work_item); work items já iguais não aparecem em nenhum dos três
+
+        Raises:
+            requests.HTTPError: Se a busca ou a leitura dos work items falhar
+        """
+        max_workers = max_workers or BATCH_CONFIG['max_workers']
+        if use_batch_api is None:
+            use_batch_api = SYNC_CONFIG['use_batch_api']
+        if minimal_diff is None:
+            minimal_diff = SYNC_CONFIG['minimal_diff']
+
+        failed_tickets: List[Dict] = []
+        valid_tickets: List[Dict] = []
+        for ticket in tickets:
+            is_valid, validation_errors = self.validate_ticket(ticket)
+            if is_valid:
+                valid_tickets.append(ticket)
+            else:
+                self._log_validation_errors(ticket, validation_errors)
+                failed_tickets.append(ticket)
+
+        self._start_deadline(deadline_seconds)
+        try:
+            work_item_ids = self.find_existing_work_items(ticket.get('id') for ticket in valid_tickets)
+            missing_tickets = [ticket for ticket in valid_tickets
+                               if str(ticket.get('id')) not in work_item_ids]
+            targets = [ticket for ticket in valid_tickets if str(ticket.get('id')) in work_item_ids]
+
+            logger.info(
+                f"Sincronizando {len(targets)} work items ({max_workers} simultâneos"
+                f"{', via $batch' if use_batch_api else ''}); {len(missing_tickets)} sem work item")
+
+            builder = self.create_patch_builder()
+            updates = []
+            for ticket in targets:
+                with self.hooks.transform(ticket):
+                    updates.append((work_item_ids[str(ticket.get('id'))], builder.build_update(ticket)))
+
+            unchanged = 0
+            if minimal_diff and updates:
+                current_items = self._read_work_items_fields(
+                    [work_item_id for work_item_id, _ in updates], list(MANAGED_FIELDS))
+                minimized = minimize_updates(updates, current_items)
+                unchanged = sum(patch_document is None for patch_document in minimized)
+                targets = [ticket for ticket, patch_document in zip(targets, minimized) if patch_document]
+                updates = [(work_item_id, patch_document)
+                           for (work_item_id, _), patch_document in zip(updates, minimized) if patch_document]
+                logger.info(f"Patch mínimo: {unchanged} work items já atualizados, {len(updates)} com diferenças")
+
+            if use_batch_api:
+                operations = [self._build_batch_update_operation(*update) for update in updates]
+                chunks = _chunk_batch_operations(
+                    operations, BATCH_CONFIG['batch_api_max_items'], BATCH_CONFIG['batch_api_max_bytes'])
+                chunk_results = self._run_concurrently(
+                    lambda chunk: self._send_batch_chunk([operations[i] for i in chunk], update=True),
+                    chunks, max_workers)
+
+                results: List[Optional[int]] = [None] * len(updates)
+                for chunk, chunk_ids in zip(chunks, chunk_results):
+                    for position, work_item_id in zip(chunk, chunk_ids or []):
+                        results[position] = work_item_id
+            else:
+                results = self._run_concurrently(
+                    lambda update: self.update_work_item(*update), updates, max_workers,
+                    describe=lambda update: update[0])
+        finally:
+            self._clear_deadline()
+
+        updated_ids = []
+        for ticket, work_item_id in zip(targets, results):
+            if work_item_id:
+                updated_ids.append(work_item_id)
+            else:
+                failed_tickets.append(ticket)
+
+        logger.info(
+            f"Sincronização concluída: {len(updated_ids)} atualizados, {unchanged} sem mudança, "
+            f"{len(failed_tickets)} falharam, {len(missing_tickets)} sem work item")
+
+        return updated_ids, failed_tickets, missing_tickets
+
+    def _run_concurrently(self, func: Callable[[Any], Any], items: List[Any], max_workers: int,
+                          describe: Callable[[Any], Any] = None) -> List[Any]:
+        """
+        Aplica func a cada item em um pool de threads, preservando a ordem de entrada
+
+        Args:
+            func: Função executada para cada item
+            items: Itens a processar
+            max_workers: Máximo de execuções simultâneas
+            describe: Descreve o item nas mensagens de erro (opcional)
+
+        Returns:
+            List[Any]: Resultado de cada item (None quando func levantou exceção)
+        """
+        if max_workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+
+        results: List[Any] = [None] * len(items)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            futures = {executor.submit(func, item): index for index, item in enumerate(items)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    label = describe(items[index]) if describe else index
+                    logger.error(f"Erro ao processar {label}: {str(e)}")
+
+        return results
+
+    def _request(self, method: str, url: str, idempotent: bool = None,
+                 **kwargs) -> requests.Response:
+        """
+        Executa uma chamada HTTP pela sessão compartilhada do cliente
+
+        Toda chamada passa pelo agendador de requisições; respostas 429/503 são
+        reenviadas após o Retry-After e falhas transitórias seguem a RetryPolicy,
+        sempre dentro do prazo do lote em andamento.
+
+        Args:
+            method: Método HTTP
+            url: URL completa da chamada
+            idempotent: Se a chamada pode ser repetida sem efeito duplicado
+                (opcional, padrão: deduzido do método HTTP)
+            **kwargs: Argumentos repassados para requests.Session.request
+
+        Returns:
+            requests.Response: Resposta da API
+
+        Raises:
+            DeadlineExceeded: Se o prazo do lote terminou
+        """
+        kwargs.setdefault('headers', self.headers)
+        base_timeout = kwargs.pop('timeout', self.timeout)
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        max_throttle_retries = RATE_LIMIT_CONFIG['max_throttle_retries']
+        throttle_retries = 0
+        attempt = 0
+
+        while True:
+            deadline = self._deadline
+            if deadline is not None and deadline.expired():
+                raise DeadlineExceeded(
+                    f"Prazo do lote ({deadline.budget_seconds:.0f}s) esgotado antes de {method} {_endpoint(url)}")
+
+            self.scheduler.acquire()
+            timeout = base_timeout
+            if deadline is not None:
+                timeout = (timeout[0], min(timeout[1], max(deadline.remaining(), timeout[0])))
+
+            try:
+                response = self._send_attempt(method, url, timeout, kwargs)
+            except requests.exceptions.RequestException as e:
+                error_kind = _classify_request_error(e)
+                if error_kind is None or not self._retry_allowed(attempt, idempotent, error_kind=error_kind):
+                    raise
+                self._wait_before_retry(attempt, f"{error_kind}", method, url)
+                attempt += 1
+                continue
+
+            throttle_delay = self.scheduler.observe(response.status_code, response.headers)
+            if throttle_delay is not None and throttle_retries < max_throttle_retries \
+                    and self._deadline_allows(throttle_delay):
+                throttle_retries += 1
+                self._record_retry('throttled', method, url)
+                logger.warning(
+                    f"Throttling ({response.status_code}) em {method} {_endpoint(url)}; "
+                    f"reenviando em {throttle_delay:.1f}s ({throttle_retries}/{max_throttle_retries})")
+                continue
+
+            if throttle_delay is None and self._retry_allowed(
+                    attempt, idempotent, status_code=response.status_code):
+                self._wait_before_retry(attempt, f"http_{response.status_code}", method, url)
+                attempt += 1
+                continue
+
+            return response
+
+    def _send_attempt(self, method: str, url: str, timeout: Tuple[float, float],
+                      kwargs: Dict) -> requests.Response:
+        """Uma tentativa HTTP, registrada nas métricas, em um span e nos hooks"""
+        hooks = self.hooks
+        if hooks.before_request:
+            hooks.dispatch('before_request', method, url, kwargs)
+
+        start = time.perf_counter()
+        with span(SPAN_HTTP, {'http.method': method, 'http.url': _endpoint(url)}) as http_span:
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except requests.exceptions.RequestException as e:
+                elapsed = time.perf_counter() - start
+                if self.metrics is not None:
+                    self.metrics.record_request(method, url, None, elapsed)
+                if hooks.on_error:
+                    hooks.dispatch('on_error', method, url, e, elapsed)
+                raise
+            set_span_attribute(http_span, 'http.status_code', response.status_code)
+
+        elapsed = time.perf_counter() - start
+        if self.metrics is not None:
+            self.metrics.record_request(
+                method, url, response.status_code, elapsed,
+                int(response.request.headers.get('Content-Length') or 0), len(response.content))
+        if hooks.after_response:
+            hooks.dispatch('after_response', method, url, response, elapsed)
+        return response
+
+    def _wait_before_retry(self, attempt: int, reason: str, method: str, url: str) -> None:
+        """Aplica o backoff e contabiliza o reenvio"""
+        delay = self.retry_policy.compute_delay(attempt)
+        self._record_retry(reason, method, url)
+        logger.warning(
+            f"Falha transitória ({reason}) em {method} {_endpoint(url)}; "
+            f"tentativa {attempt + 2}/{self.retry_policy.max_retries + 1} em {delay:.2f}s")
+        time.sleep(delay)
+
+    def find_existing_work_items(self, ticket_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Descobre quais tickets do Fusion já possuem work item, com poucas consultas WIQL
+
+        Com um índice local configurado, só os IDs ausentes dele vão ao Azure DevOps.
+        A consulta remota usa o campo Custom.IDChamadoFusion com IN (...) em blocos
+        limitados pelo tamanho máximo da WIQL. Se algum tipo mapeado não tiver o
+        campo, os IDs ainda não encontrados são procurados pelo prefixo "[ID]" do título.
+
+        Args:
+            ticket_ids: IDs dos tickets do Fusion
+
+        Returns:
+            Dict[str, int]: ID do ticket -> ID do work item existente
+
+        Raises:
+            requests.HTTPError: Se uma consulta falhar (evita criar duplicatas às cegas)
+        """
+        pending = list(dict.fromkeys(str(ticket_id) for ticket_id in ticket_ids if ticket_id))
+        if not pending:
+            return {}
+
+        indexed: Dict[str, int] = {}
+        if self.ticket_index is not None:
+            indexed = self.ticket_index.get_many(pending)
+            pending = [ticket_id for ticket_id in pending if ticket_id not in indexed]
+            if not pending:
+                logger.info(
+                    f"Verificação de duplicatas: {len(indexed)} tickets resolvidos pelo índice local")
+                return indexed
+
+        fusion_field = DEDUP_CONFIG['fusion_id_field']
+        field_presence = [
+            self._field_exists_in_work_item_type(work_item_type, fusion_field)
+            for work_item_type in set(CATEGORY_TO_WORKITEM_MAPPING.values())
+        ]
+
+        existing: Dict[str, int] = {}
+        queries = 0
+
+        if any(field_presence):
+            prefix = (f"SELECT [System.Id] FROM WorkItems WHERE [System.TeamProject] = @project "
+                      f"AND [{fusion_field}] IN (")
+            for chunk in _chunk_wiql_terms([_wiql_literal(i) for i in pending], prefix, ', ', ')'):
+                work_item_ids = self._query_wiql(prefix + ', '.join(chunk) + ')')
+                queries += 1
+                for item in self._read_work_items_fields(work_item_ids, [fusion_field]):
+                    ticket_id = item.get('fields', {}).get(fusion_field)
+                    if ticket_id:
+                        existing.setdefault(str(ticket_id), item['id'])
+
+        missing = [ticket_id for ticket_id in pending if ticket_id not in existing]
+        if missing and not all(field_presence):
+            wanted = set(missing)
+            prefix = "SELECT [System.Id] FROM WorkItems WHERE [System.TeamProject] = @project AND ("
+            terms = [f"[System.Title] CONTAINS {_wiql_literal(f'[{i}]')}" for i in missing]
+            for chunk in _chunk_wiql_terms(terms, prefix, ' OR ', ')'):
+                work_item_ids = self._query_wiql(prefix + ' OR '.join(chunk) + ')')
+                queries += 1
+                for item in self._read_work_items_fields(work_item_ids, ['System.Title']):
+                    match = TITLE_TICKET_ID_PATTERN.match(item.get('fields', {}).get('System.Title', ''))
+                    if match and match.group(1) in wanted:
+                        existing.setdefault(match.group(1), item['id'])
+
+        logger.info(
+            f"Verificação de duplicatas: {len(indexed)} pelo índice local, "
+            f"{len(existing)}/{len(pending)} remotos já possuem work item ({queries} consultas WIQL)")
+
+        if self.ticket_index is not None and existing:
+            self.ticket_index.record_many(
+                (ticket_id, work_item_id, None) for ticket_id, work_item_id in existing.items())
+
+        return {**indexed, **existing}
+
+    def filter_unprocessed_tickets(self, tickets: List[Dict]) -> List[Dict]:
+        """
+        Remove do lote os tickets que já possuem work item no Azure DevOps
+
+        Args:
+            tickets: Lista de dicionários com dados dos tickets
+
+        Returns:
+            List[Dict]: Tickets que ainda precisam de card, na ordem original
+        """
+        return self.partition_existing_tickets(tickets)[0]
+
+    def partition_existing_tickets(self, tickets: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Separa os tickets sem work item dos que já têm card no Azure DevOps
+
+        Args:
+            tickets: Lista de dicionários com dados dos tickets
+
+        Returns:
+            Tuple[List[Dict], List[Dict]]: (tickets_novos, tickets_com_card), na ordem original
+        """
+        existing = self.find_existing_work_items(ticket.get('id') for ticket in tickets)
+        new_tickets = []
+        existing_tickets = []
+        for ticket in tickets:
+            (existing_tickets if str(ticket.get('id')) in existing else new_tickets).append(ticket)
+        return new_tickets, existing_tickets
+
+    def reconcile_ticket_index(self) -> int:
+        """
+        Atualiza o índice local com work items alterados desde a última reconciliação
+
+        Consulta por System.ChangedDate a partir da marca d'água do índice, em
+        páginas de TICKET_INDEX_CONFIG['reconcile_page_size'], e avança a marca
+        para a maior data vista.
+
+        Returns:
+            int: Quantidade de mapeamentos gravados no índice
+
+        Raises:
+            ValueError: Se o cliente não tiver índice configurado
+        """
+        if self.ticket_index is None:
+            raise ValueError("Cliente sem ticket_index configurado")
+
+        fusion_field = DEDUP_CONFIG['fusion_id_field']
+        has_field = any(
+            self._field_exists_in_work_item_type(work_item_type, fusion_field)
+            for work_item_type in set(CATEGORY_TO_WORKITEM_MAPPING.values())
+        )
+        fields = ['System.Title', 'System.ChangedDate'] + ([fusion_field] if has_field else [])
+        scope = (f"[{fusion_field}] <> ''" if has_field
+                 else f"[System.AreaPath] UNDER {_wiql_literal(self.full_area_path)}")
+        page_size = TICKET_INDEX_CONFIG['reconcile_page_size']
+
+        watermark = self.ticket_index.get_watermark()
+        recorded = 0
+
+        while True:
+            since = f" AND [System.ChangedDate] >= {_wiql_literal(watermark)}" if watermark else ""
+            work_item_ids = self._query_wiql(
+                f"SELECT [System.Id] FROM WorkItems WHERE [System.TeamProject] = @project "
+                f"AND {scope}{since} ORDER BY [System.ChangedDate] ASC",
+                top=page_size, time_precision=True)
+
+            rows = []
+            newest = watermark
+            for item in self._read_work_items_fields(work_item_ids, fields):
+                item_fields = item.get('fields', {})
+                ticket_id = item_fields.get(fusion_field)
+                if not ticket_id:
+                    match = TITLE_TICKET_ID_PATTERN.match(item_fields.get('System.Title', ''))
+                    ticket_id = match.group(1) if match else None
+
+                changed_date = item_fields.get('System.ChangedDate')
+                if changed_date and (newest is None or changed_date > newest):
+                    newest = changed_date
+                if ticket_id:
+                    rows.append((ticket_id, item['id'], changed_date))
+
+            recorded += self.ticket_index.record_many(rows)
+            if newest and newest != watermark:
+                self.ticket_index.set_watermark(newest)
+
+            # Página incompleta, ou página inteira com a mesma data: fim da reconciliação
+            if len(work_item_ids) < page_size or newest == watermark:
+                break
+            watermark = newest
+
+        logger.info(
+            f"Índice local reconciliado: {recorded} mapeamentos atualizados "
+            f"(marca d'água: {self.ticket_index.get_watermark()})")
+
+        return recorded
+
+    def _query_wiql(self, query: str, top: int = None, time_precision: bool = False) -> List[int]:
+        """
+        Executa uma consulta WIQL e retorna os IDs encontrados
+
+        Args:
+            query: Consulta WIQL
+            top: Máximo de resultados (opcional)
+            time_precision: Compara datas com hora, não só o dia (opcional)
+
+        Returns:
+            List[int]: IDs dos work items
+        """
+        url = self.wiql_url
+        if top:
+            url += f"&$top={top}"
+        if time_precision:
+            url += "&timePrecision=true"
+
+        response = self._request(
+            'POST', url, idempotent=True, json={'query': query},
+            headers={**self.headers, 'Content-Type': 'application/json'})
+
+        if response.status_code != 200:
+            logger.error(f"Erro na consulta WIQL: {response.status_code}")
+            logger.error(f"Response: {response.text}")
+            response.raise_for_status()
+
+        return [item['id'] for item in response.json().get('workItems', [])]
+
+    def get_work_items(self, work_item_ids: Iterable[int], fields: Optional[List[str]] = None,
+                       max_workers: int = None, cache: Optional[WorkItemCache] = None) -> Iterator[Dict]:
+        """
+        Lê work items em lote pelo endpoint workitemsbatch, com projeção de campos
+
+        Os IDs são divididos em blocos de até 200 (DEDUP_CONFIG['work_items_batch_size'])
+        lidos em paralelo; cada bloco é entregue assim que chega, então a ordem de
+        saída não acompanha a de entrada. Work items inexistentes ou sem permissão
+        são omitidos. Com um cache, itens válidos em cache não vão à API e os
+        lidos são armazenados.
+
+        Args:
+            work_item_ids: IDs dos work items (duplicados são lidos uma vez)
+            fields: referenceNames dos campos a retornar (opcional, None = todos)
+            max_workers: Máximo de chamadas simultâneas (opcional, padrão: BATCH_CONFIG)
+            cache: Cache de work items (opcional)
+
+        Yields:
+            Dict: Work item retornado pela API (id, rev, fields)
+
+        Raises:
+            requests.HTTPError: Se uma leitura falhar
+        """
+        pending = list(dict.fromkeys(int(work_item_id) for work_item_id in work_item_ids))
+
+        if cache is not None:
+            missing = []
+            for work_item_id in pending:
+                item = cache.get(work_item_id, fields)
+                if item is None:
+                    missing.append(work_item_id)
+                else:
+                    yield item
+            pending = missing
+
+        if not pending:
+            return
+
+        batch_size = DEDUP_CONFIG['work_items_batch_size']
+        chunks = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+        max_workers = min(max_workers or BATCH_CONFIG['max_workers'], len(chunks))
+
+        def read(chunk: List[int]) -> List[Dict]:
+            body = {'ids': chunk, 'errorPolicy': 'omit'}
+            if fields is not None:
+                body['fields'] = list(fields)
+
+            response = self._request(
+                'POST', self.work_items_batch_url, idempotent=True, json=body,
+                headers={**self.headers, 'Content-Type': 'application/json'})
+
+            if response.status_code != 200:
+                logger.error(f"Erro ao ler work items: {response.status_code}")
+                logger.error(f"Response: {response.text}")
+                response.raise_for_status()
+
+            items = [item for item in response.json().get('value', []) if item]
+            if cache is not None:
+                for item in items:
+                    cache.put(item, fields)
+            return items
+
+        if max_workers <= 1:
+            for chunk in chunks:
+                yield from read(chunk)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [executor.submit(read, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            # Consumidor que para no meio não espera os blocos ainda não iniciados
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _read_work_items_fields(self, work_item_ids: List[int], fields: List[str]) -> List[Dict]:
+        """
+        Lê campos selecionados de vários work items pelo endpoint workitemsbatch
+
+        Args:
+            work_item_ids: IDs dos work items
+            fields: referenceNames dos campos a retornar
+
+        Returns:
+            List[Dict]: Work items retornados pela API (id, rev, fields)
+        """
+        return list(self.get_work_items(work_item_ids, fields))
 
     def _field_exists_in_work_item_type(self, work_item_type: str, field_reference_name: str) -> bool:
         """
@@ -301,33 +1460,160 @@ class AzureDevOpsClient:
         Returns:
             bool: True se o campo existe
         """
+        fields = self.get_work_item_type_fields(work_item_type)
+        if fields is None:
+            return False
+        return field_reference_name in fields
+
+    def get_work_item_type_fields(self, work_item_type: str) -> Optional[FrozenSet[str]]:
+        """
+        Retorna o índice de campos do tipo, consultando a API apenas em cache miss
+
+        Args:
+            work_item_type: Nome do tipo de work item
+
+        Returns:
+            Optional[FrozenSet[str]]: referenceNames dos campos ou None se houve erro
+        """
+        fields = self.schema_cache.get_fields(
+            self.organization, self.project, work_item_type)
+        if fields is not None:
+            return fields
+
         try:
-            url = f"{self.base_url}/workitemtypes/{work_item_type}?api-version={AZURE_DEVOPS_CONFIG['api_version']}"
-            response = requests.get(
-                url, headers=self.headers, timeout=self.timeout)
+            response = self._request('GET', self.work_item_type_url(work_item_type))
 
             if response.status_code == 200:
                 work_item_type_data = response.json()
-                fields = work_item_type_data.get('fields', [])
-
-                # Procura pelo campo específico
-                for field in fields:
-                    if field.get('referenceName') == field_reference_name:
-                        return True
-
-                return False
+                return self.schema_cache.set_fields(
+                    self.organization, self.project, work_item_type,
+                    (field.get('referenceName')
+                     for field in work_item_type_data.get('fields', []))
+                )
             else:
                 logger.warning(
                     f"Erro ao verificar campos do tipo '{work_item_type}': {response.status_code}")
-                return False
+                return None
 
         except Exception as e:
             logger.warning(
-                f"Erro ao verificar campo '{field_reference_name}': {str(e)}")
-            return False
+                f"Erro ao carregar campos do tipo '{work_item_type}': {str(e)}")
+            return None
+
+    def invalidate_schema_cache(self, work_item_type: str = None) -> int:
+        """
+        Descarta o schema em cache dos tipos deste projeto
+
+        Args:
+            work_item_type: Tipo específico a invalidar (opcional, padrão: todos)
+
+        Returns:
+            int: Quantidade de entradas removidas
+        """
+        return self.schema_cache.invalidate(
+            self.organization, self.project, work_item_type)
+
+
+def _endpoint(url: str) -> str:
+    """URL sem query string, para logs"""
+    return url.split('?')[0]
+
+
+def _classify_request_error(error: requests.exceptions.RequestException) -> Optional[str]:
+    """
+    Classifica uma exceção do requests para a RetryPolicy
+
+    Args:
+        error: Exceção levantada pela sessão
+
+    Returns:
+        Optional[str]: Tipo de falha ou None se não for transitória
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return ERROR_CONNECT
+    if isinstance(error, requests.exceptions.Timeout):
+        return ERROR_TIMEOUT
+    if isinstance(error, requests.exceptions.ConnectionError):
+        # NewConnectionError/DNS: a requisição nunca saiu do cliente
+        reason = error.args[0] if error.args else None
+        if isinstance(getattr(reason, 'reason', reason), NewConnectionError):
+            return ERROR_CONNECT
+        return ERROR_CONNECTION
+    return None
+
+
+def _wiql_literal(value: str) -> str:
+    """Converte um valor em literal de string WIQL (aspas simples escapadas)"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _chunk_wiql_terms(terms: List[str], prefix: str, separator: str, suffix: str) -> List[List[str]]:
+    """
+    Agrupa termos de uma consulta WIQL sem ultrapassar o tamanho máximo da consulta
+
+    Args:
+        terms: Termos (literais ou condições) a distribuir
+        prefix: Início fixo da consulta
+        separator: Separador entre termos
+        suffix: Fim fixo da consulta
+
+    Returns:
+        List[List[str]]: Termos de cada consulta
+    """
+    budget = DEDUP_CONFIG['max_wiql_length'] - len(prefix) - len(suffix)
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    length = 0
+
+    for term in terms:
+        added = len(term) + (len(separator) if current else 0)
+        if current and length + added > budget:
+            chunks.append(current)
+            current = []
+            added = len(term)
+            length = 0
+        current.append(term)
+        length += added
+
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def _chunk_batch_operations(operations: List[Dict], max_items: int, max_bytes: int) -> List[List[int]]:
+    """
+    Divide as operações do $batch respeitando quantidade e tamanho máximos por chamada
+
+    Args:
+        operations: Operações do $batch
+        max_items: Máximo de operações por chamada
+        max_bytes: Tamanho máximo do corpo JSON de cada chamada
+
+    Returns:
+        List[List[int]]: Índices das operações em cada chamada
+    """
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    current_bytes = 2  # colchetes da lista JSON
+
+    for index, operation in enumerate(operations):
+        size = len(json.dumps(operation).encode()) + 1  # vírgula separadora
+        if current and (len(current) >= max_items or current_bytes + size > max_bytes):
+            chunks.append(current)
+            current = []
+            current_bytes = 2
+        current.append(index)
+        current_bytes += size
+
+    if current:
+        chunks.append(current)
+
+    return chunks
 
 
-def create_azure_devops_client(organization: str, project: str, pat_token: str, area_path: str = None) -> AzureDevOpsClient:
+def create_azure_devops_client(organization: str, project: str, pat_token: str, area_path: str = None,
+                               **kwargs) -> AzureDevOpsClient:
     """
     Factory function para criar cliente Azure DevOps
 
@@ -336,8 +1622,9 @@ def create_azure_devops_client(organization: str, project: str, pat_token: str,
         project: Nome do projeto
         pat_token: Personal Access Token
         area_path: Caminho da área (opcional)
+        **kwargs: Opções extras do cliente (session, http_config, server_url, ticket_index, metrics)
 
     Returns:
         AzureDevOpsClient: Instância do cliente configurada
     """
-    return AzureDevOpsClient(organization, project, pat_token, area_path)
+    return AzureDevOpsClient(organization, project, pat_token, area_path, **kwargs)
@@ -9,7 +9,98 @@ AZURE_DEVOPS_CONFIG = {
     'projects_url_template': 'https://dev.azure.com/{organization}/_apis/projects',
     'boards_url_template': 'https://dev.azure.com/{organization}/{project}/_apis/work/boards',
     'wiql_url_template': 'https://dev.azure.com/{organization}/{project}/_apis/wit/wiql',
-    'default_area_path': 'Áreas meio'  # Área padrão para work items do Fusion
+    'default_area_path': 'Áreas meio',  # Área padrão para work items do Fusion
+    'server_url': 'https://dev.azure.com'  # Pode apontar para um servidor local em benchmarks
+}
+
+# HTTP Connection Pool Configuration
+HTTP_CONFIG = {
+    'pool_connections': 10,      # Quantidade de hosts distintos mantidos no pool
+    'pool_maxsize': 20,          # Conexões simultâneas por host
+    'pool_block': False,         # Bloqueia quando o pool está cheio em vez de abrir conexões extras
+    'keep_alive': True,          # Reutiliza conexões TCP/TLS entre chamadas
+    'connect_timeout': 5,        # Segundos para estabelecer a conexão
+    'read_timeout': 30           # Segundos aguardando resposta do servidor
+}
+
+# Rate Limit Configuration (agendador de requisições)
+RATE_LIMIT_CONFIG = {
+    'rate_per_second': 20,        # Taxa nominal de requisições por organização
+    'burst': 40,                  # Requisições que podem sair de uma vez após ociosidade
+    'min_rate_per_second': 1,     # Piso da taxa durante desaceleração
+    'slowdown_factor': 0.5,       # Multiplicador da taxa a cada sinal de throttling
+    'recovery_step': 0.05,        # Fração da taxa nominal recuperada por resposta limpa
+    'remaining_threshold': 50,    # X-RateLimit-Remaining abaixo disso reduz a taxa
+    'default_retry_after': 10,    # Espera (s) quando 429/503 chega sem Retry-After
+    'max_throttle_retries': 5     # Reenvios de uma requisição após 429/503
+}
+
+# Retry Configuration (falhas transitórias por requisição)
+RETRY_CONFIG = {
+    'max_retries': 3,                            # Reenvios por requisição
+    'backoff_base': 0.5,                         # Espera base (s), dobra a cada tentativa
+    'backoff_max': 8,                            # Espera máxima (s) entre tentativas
+    'jitter': True,                              # Full jitter para não sincronizar reenvios
+    'retry_status_codes': [500, 502, 504],       # Reenviados em leituras/idempotentes
+    'unsafe_retry_status_codes': [],             # Reenviados em criações: nenhum (502/504 podem ter criado)
+    'batch_deadline_seconds': 45 * 60            # Prazo total de um create_work_items_batch
+}
+
+# Batch Processing Configuration
+BATCH_CONFIG = {
+    'max_workers': 8,  # Requisições simultâneas em create_work_items_batch (1 = sequencial)
+    'async_max_concurrency': 50,  # Requisições em voo no AsyncAzureDevOpsClient
+    'use_batch_api': False,  # Agrupa as criações no endpoint wit/$batch
+    'batch_api_max_items': 200,  # Limite de operações por chamada do $batch
+    'batch_api_max_bytes': 2 * 1024 * 1024  # Tamanho máximo do corpo de cada chamada do $batch
+}
+
+# Sincronização de cards existentes com as mudanças do Fusion (status, prioridade, descrição)
+SYNC_CONFIG = {
+    'enabled': True,         # O DAG também atualiza cards de tickets já integrados que mudaram
+    'use_batch_api': True,   # Agrupa as atualizações no endpoint wit/$batch
+    'minimal_diff': True     # Lê os campos atuais e envia só o que mudou (pula cards já iguais)
+}
+
+# Métricas por endpoint e tracing (exportados via Airflow Stats / OpenTelemetry)
+METRICS_CONFIG = {
+    'enabled': True,                  # Agrega contagem, latência, status, bytes e retries por endpoint
+    'stats_prefix': 'azure_devops',   # Prefixo das métricas enviadas ao Airflow Stats (StatsD/OTel)
+    'export_to_airflow_stats': True,  # Emite cada requisição pelo Stats configurado no Airflow
+    'tracing_enabled': True,          # Abre spans OpenTelemetry quando o pacote estiver instalado
+    'latency_buckets_ms': [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]  # Histograma
+}
+
+# Duplicate Detection Configuration (consultas WIQL em lote)
+DEDUP_CONFIG = {
+    'fusion_id_field': 'Custom.IDChamadoFusion',  # Campo com o ID do chamado no work item
+    'max_wiql_length': 30000,                     # Limite da API é 32K caracteres por consulta
+    'work_items_batch_size': 200                  # IDs por chamada do workitemsbatch
+}
+
+# Local Ticket Index Configuration (SQLite no volume do Airflow)
+TICKET_INDEX_CONFIG = {
+    'path': '/opt/airflow/data/ticket_index.sqlite3',
+    'reconcile_page_size': 5000  # Work items por consulta WIQL na reconciliação incremental
+}
+
+# Work Item Type Schema Cache Configuration
+SCHEMA_CACHE_CONFIG = {
+    'ttl_seconds': 6 * 60 * 60,  # Schemas mudam raramente; expira junto com o ciclo do DAG
+    'persist_path': '/tmp/azure_devops_schema_cache.json'  # None desativa a persistência em disco
+}
+
+# Cache de curta duração dos work items lidos (get_work_items)
+WORK_ITEM_CACHE_CONFIG = {
+    'ttl_seconds': 5 * 60,  # Leituras repetidas na mesma execução; mudanças externas aparecem em minutos
+    'max_entries': 20000    # Work items mantidos em memória
+}
+
+# Caches por processo do AzureDevOpsHook (credenciais, cliente e sondas de saúde)
+HOOK_CACHE_CONFIG = {
+    'credentials_ttl_seconds': 60 * 60,  # PAT rotacionado na Connection é relido em até 1 hora
+    'health_ttl_seconds': 6 * 60 * 60,   # Sonda bem-sucedida vale pela execução da DAG
+    'max_health_entries': 256            # Execuções (run_id) lembradas; as mais antigas saem primeiro
 }
 
 # Work Item Type Mappings (Ambiente de Produção)
@@ -39,6 +130,29 @@ INITIAL_STATES = {
     "Melhoria pontual": "Backlog",       # Tipo específico configurado
 }
 
+# Status do Fusion -> System.State por tipo de work item (modo de sincronização)
+# Status sem mapeamento mantêm o estado atual do card
+FUSION_STATUS_TO_STATE = {
+    "Product backlog item": {
+        'Aberto': "Backlog",
+        'Pendente': "Backlog",
+        'Em análise': "Backlog",
+        'Em andamento': "Committed",
+        'Resolvido': "Done",
+        'Fechado': "Done",
+        'Cancelado': "Removed"
+    },
+    "Melhoria pontual": {
+        'Aberto': "Backlog",
+        'Pendente': "Backlog",
+        'Em análise': "Backlog",
+        'Em andamento': "Committed",
+        'Resolvido': "Done",
+        'Fechado': "Done",
+        'Cancelado': "Removed"
+    }
+}
+
 # Airflow Configuration
 AIRFLOW_CONFIG = {
     'dag_id': 'azure_devops_card_creation',
@@ -53,7 +167,13 @@ AIRFLOW_CONFIG = {
 SQL_SERVER_CONFIG = {
     'driver': 'ODBC Driver 17 for SQL Server',
     'query_timeout': 30,
-    'connection_timeout': 15
+    'connection_timeout': 15,
+    'port': 1433,
+    'pool_size': 5,                # Conexões mantidas abertas no pool do SQLAlchemy
+    'max_overflow': 5,             # Conexões extras sob demanda
+    'pool_recycle': 1800,          # Recicla conexões com mais de 30 minutos
+    'pool_pre_ping': True,         # Descarta conexões derrubadas pelo servidor
+    'fast_executemany': True       # pyodbc envia os parâmetros de um executemany em uma ida ao servidor
 }
 
 # Fusion System Configuration (para próximas fases)
@@ -61,7 +181,42 @@ FUSION_CONFIG = {
     'tickets_table': 'tickets_fusion',
     'processed_tickets_table': 'azure_devops_processed',
     'batch_size': 50,
-    'max_days_lookback': 30
+    'max_days_lookback': 30,       # Janela da primeira execução, antes de existir marca d'água
+    'max_failed_attempts': 5,      # Execuções que relêem um ticket que falhou antes de desistir dele
+    'watermark_table': 'azure_devops_watermark',
+    'watermark_name': 'azure_devops_card_creation'
+}
+
+# Colunas da tabela de tickets do Fusion (chave do ticket -> coluna no SQL Server)
+FUSION_COLUMNS = {
+    'id': 'id',
+    'titulo': 'titulo',
+    'descricao': 'descricao',
+    'categoria': 'categoria',
+    'prioridade': 'prioridade',
+    'solicitante': 'solicitante',
+    'status': 'status',
+    'data_criacao': 'data_criacao',
+    'data_atualizacao': 'data_atualizacao'
+}
+
+# Área de staging dos tickets entre tasks (só o manifesto passa pela XCom)
+STAGING_CONFIG = {
+    'base_dir': '/opt/airflow/data/staging',
+    'compress_level': 6,           # gzip: 6 equilibra tamanho e CPU melhor que o padrão 9
+    'read_chunk_size': 1000        # Tickets por bloco na leitura
+}
+
+# Journal write-ahead das criações (um arquivo por shard no diretório de staging da execução)
+JOURNAL_CONFIG = {
+    'fsync': True                  # Garante intenção/resultado no disco antes de seguir
+}
+
+# Particionamento da criação em tasks mapeadas (dynamic task mapping)
+SHARDING_CONFIG = {
+    'shard_size': 500,             # Tickets por shard desejados
+    'max_shards': 8,               # Teto de shards (slots de worker usados)
+    'shard_count': None            # Força um número fixo de shards (None = calcula por shard_size)
 }
 
 # Logging Configuration
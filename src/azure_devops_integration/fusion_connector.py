@@ -0,0 +1,588 @@
+"""
+Conector do Fusion (SQL Server)
+Lê tickets não processados em blocos de tamanho fixo, sem carregar o resultado inteiro em memória
+"""
+
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import logging
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, Engine
+
+from .config import FUSION_COLUMNS, FUSION_CONFIG, SQL_SERVER_CONFIG
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Resultado registrado na tabela de processados
+OUTCOME_CREATED = 'created'
+OUTCOME_UPDATED = 'updated'
+OUTCOME_FAILED = 'failed'              # Criação falhou: o ticket continua sem card
+OUTCOME_SYNC_FAILED = 'sync_failed'    # Card existe, mas a última sincronização falhou
+
+# (alteração, id do ticket); a alteração vem como datetime do banco ou ISO 8601 do staging
+Watermark = Tuple[Union[datetime, str], str]
+
+# Engines compartilhadas por processo, indexadas pelo destino da conexão
+_shared_engines: Dict[Tuple, Engine] = {}
+_shared_engines_lock = threading.Lock()
+
+
+def create_fusion_engine(server: str, database: str, username: str, password: str,
+                         port: int = None, sql_config: Optional[Dict] = None) -> Engine:
+    """
+    Cria a engine SQLAlchemy (mssql+pyodbc) com pool de conexões
+
+    O timeout de login vai para o pyodbc na conexão; o timeout de consulta é
+    aplicado em cada conexão nova do pool.
+
+    Args:
+        server: Host do SQL Server
+        database: Banco do Fusion
+        username: Usuário
+        password: Senha
+        port: Porta (opcional, padrão: SQL_SERVER_CONFIG['port'])
+        sql_config: Valores que sobrescrevem SQL_SERVER_CONFIG (opcional)
+
+    Returns:
+        Engine: Engine configurada
+    """
+    config = dict(SQL_SERVER_CONFIG)
+    if sql_config:
+        config.update(sql_config)
+
+    url = URL.create(
+        'mssql+pyodbc',
+        username=username,
+        password=password,
+        host=server,
+        port=port or config['port'],
+        database=database,
+        query={'driver': config['driver']}
+    )
+
+    engine = create_engine(
+        url,
+        pool_size=config['pool_size'],
+        max_overflow=config['max_overflow'],
+        pool_recycle=config['pool_recycle'],
+        pool_pre_ping=config['pool_pre_ping'],
+        fast_executemany=config['fast_executemany'],
+        connect_args={'timeout': config['connection_timeout']}
+    )
+
+    query_timeout = config['query_timeout']
+
+    @event.listens_for(engine, 'connect')
+    def _set_query_timeout(dbapi_connection, connection_record):
+        # pyodbc: Connection.timeout é o timeout de cada consulta, em segundos
+        dbapi_connection.timeout = query_timeout
+
+    logger.info(
+        f"Engine SQL Server criada: {server}/{database} "
+        f"(pool {config['pool_size']}+{config['max_overflow']})")
+
+    return engine
+
+
+def get_shared_engine(server: str, database: str, username: str, password: str,
+                      port: int = None) -> Engine:
+    """
+    Retorna a engine compartilhada do processo para o destino informado
+
+    Args:
+        server: Host do SQL Server
+        database: Banco do Fusion
+        username: Usuário
+        password: Senha
+        port: Porta (opcional)
+
+    Returns:
+        Engine: Engine reutilizada entre tasks do mesmo worker
+    """
+    key = (server, port, database, username)
+    with _shared_engines_lock:
+        engine = _shared_engines.get(key)
+        if engine is None:
+            engine = create_fusion_engine(server, database, username, password, port=port)
+            _shared_engines[key] = engine
+        return engine
+
+
+def dispose_shared_engines() -> None:
+    """Fecha os pools de todas as engines compartilhadas"""
+    with _shared_engines_lock:
+        for engine in _shared_engines.values():
+            engine.dispose()
+        _shared_engines.clear()
+
+
+class FusionConnector:
+    """Leitura de tickets do Fusion para criação de work items"""
+
+    def __init__(self, engine: Engine, tickets_table: str = None, processed_table: str = None,
+                 chunk_size: int = None):
+        """
+        Inicializa o conector
+
+        Args:
+            engine: Engine SQLAlchemy do SQL Server do Fusion
+            tickets_table: Tabela de tickets (opcional, padrão: FUSION_CONFIG)
+            processed_table: Tabela de tickets já processados (opcional, padrão: FUSION_CONFIG)
+            chunk_size: Tickets por bloco (opcional, padrão: FUSION_CONFIG['batch_size'])
+        """
+        self.engine = engine
+        self.tickets_table = tickets_table or FUSION_CONFIG['tickets_table']
+        self.processed_table = processed_table or FUSION_CONFIG['processed_tickets_table']
+        self.chunk_size = chunk_size or FUSION_CONFIG['batch_size']
+
+    def _build_unprocessed_query(self, incremental: bool, include_processed: bool = False) -> str:
+        """
+        Monta a consulta de tickets ainda sem registro na tabela de processados
+
+        Com marca d'água, seleciona apenas o intervalo (alteração, id) posterior
+        a ela, onde alteração = COALESCE(data_atualizacao, data_criacao): tickets
+        nunca atualizados (data_atualizacao nula) entram pela data de criação.
+        Para usar índice, a tabela deve ter uma coluna computada persistida com
+        essa expressão, indexada junto com o id. Sem marca d'água, varre a
+        janela de max_days_lookback dias.
+
+        Tickets com falha registrada na tabela de processados (criação ou
+        sincronização) voltam junto, fora da janela, até max_failed_attempts
+        tentativas, marcados na coluna nova_tentativa; assim a marca d'água
+        avança mesmo com falhas sem que elas se percam.
+
+        Args:
+            incremental: Se há marca d'água para a consulta por intervalo
+            include_processed: Mantém os tickets já processados, marcados na
+                coluna ja_processado, em vez de descartá-los
+
+        Returns:
+            str: SQL com os parâmetros :last_changed_at e :last_ticket_id, ou :lookback_days,
+                e :max_failed_attempts
+        """
+        columns = ', '.join(f"t.[{column}] AS [{key}]" for key, column in FUSION_COLUMNS.items())
+        created = FUSION_COLUMNS['data_criacao']
+        changed = FUSION_COLUMNS['data_atualizacao']
+        ticket_id = FUSION_COLUMNS['id']
+        changed_key = f"COALESCE(t.[{changed}], t.[{created}])"
+
+        if incremental:
+            window = (
+                f"({changed_key} > :last_changed_at "
+                f"OR ({changed_key} = :last_changed_at AND t.[{ticket_id}] > :last_ticket_id))"
+            )
+        else:
+            window = f"t.[{created}] >= DATEADD(day, -:lookback_days, SYSUTCDATETIME())"
+
+        # Falhas registradas não contam: o ticket volta para nova tentativa
+        processed = (
+            f"EXISTS (SELECT 1 FROM {self.processed_table} AS p "
+            f"WHERE p.ticket_id = t.[{ticket_id}] AND p.outcome <> '{OUTCOME_FAILED}')"
+        )
+        failed_statuses = (f"'{OUTCOME_FAILED}', '{OUTCOME_SYNC_FAILED}'" if include_processed
+                           else f"'{OUTCOME_FAILED}'")
+        retry = (
+            f"EXISTS (SELECT 1 FROM {self.processed_table} AS r "
+            f"WHERE r.ticket_id = t.[{ticket_id}] AND r.outcome IN ({failed_statuses}) "
+            f"AND r.attempts < :max_failed_attempts)"
+        )
+        columns += f", CASE WHEN {window} THEN 0 ELSE 1 END AS [nova_tentativa]"
+
+        if include_processed:
+            return (
+                f"SELECT {columns}, CASE WHEN {processed} THEN 1 ELSE 0 END AS [ja_processado] "
+                f"FROM {self.tickets_table} AS t "
+                f"WHERE ({window} OR {retry}) "
+                f"ORDER BY {changed_key}, t.[{ticket_id}]"
+            )
+
+        return (
+            f"SELECT {columns} FROM {self.tickets_table} AS t "
+            f"WHERE ({window} OR {retry}) "
+            f"AND NOT {processed} "
+            f"ORDER BY {changed_key}, t.[{ticket_id}]"
+        )
+
+    def iter_unprocessed_tickets(self, max_days_lookback: int = None,
+                                 watermark: Optional[Watermark] = None) -> Iterator[List[Dict]]:
+        """
+        Lê os tickets não processados em blocos de chunk_size
+
+        O resultado é consumido com fetchmany sobre o cursor forward-only do
+        SQL Server: cada bloco é entregue assim que chega, sem esperar o
+        restante da consulta. Os tickets saem ordenados por
+        (COALESCE(data_atualizacao, data_criacao), id), a mesma ordem usada pela marca d'água.
+
+        Args:
+            max_days_lookback: Janela em dias sem marca d'água (opcional, padrão: FUSION_CONFIG)
+            watermark: (alteração, id) do último ticket concluído (opcional)
+
+        Yields:
+            List[Dict]: Bloco de tickets no formato esperado pelo cliente
+        """
+        total = 0
+        chunks = 0
+        for chunk in self._iter_tickets(max_days_lookback, watermark, include_processed=False):
+            total += len(chunk)
+            chunks += 1
+            yield chunk
+
+        logger.info(f"Fusion: {total} tickets não processados lidos em {chunks} blocos")
+
+    def iter_changed_tickets(self, max_days_lookback: int = None,
+                             watermark: Optional[Watermark] = None) -> Iterator[List[Dict]]:
+        """
+        Lê, em uma única varredura, os tickets novos e os já processados que mudaram
+
+        Mesma janela e ordem de iter_unprocessed_tickets, mas os tickets já
+        registrados na tabela de processados são mantidos com
+        ja_processado=True: após a marca d'água, eles são exatamente os
+        tickets alterados no Fusion cujo card precisa ser sincronizado.
+
+        Args:
+            max_days_lookback: Janela em dias sem marca d'água (opcional, padrão: FUSION_CONFIG)
+            watermark: (alteração, id) do último ticket concluído (opcional)
+
+        Yields:
+            List[Dict]: Bloco de tickets com a chave ja_processado
+        """
+        total = 0
+        processed = 0
+        for chunk in self._iter_tickets(max_days_lookback, watermark, include_processed=True):
+            for ticket in chunk:
+                ticket['ja_processado'] = bool(ticket.get('ja_processado'))
+                processed += ticket['ja_processado']
+            total += len(chunk)
+            yield chunk
+
+        logger.info(f"Fusion: {total} tickets lidos ({processed} já processados e alterados)")
+
+    def _iter_tickets(self, max_days_lookback: Optional[int], watermark: Optional[Watermark],
+                      include_processed: bool) -> Iterator[List[Dict]]:
+        """Executa a consulta em streaming e entrega blocos de chunk_size tickets"""
+        if watermark:
+            # Parâmetros tipados: datetime (uma string com 6 casas decimais não converte
+            # para DATETIME) e ID numérico como inteiro, na mesma ordem do ORDER BY
+            params = {'last_changed_at': _as_datetime(watermark[0]),
+                      'last_ticket_id': _bind_ticket_id(watermark[1])}
+            logger.info(f"Fusion: leitura incremental após {watermark[0]} / {watermark[1]}")
+        else:
+            params = {'lookback_days': max_days_lookback or FUSION_CONFIG['max_days_lookback']}
+            logger.info(f"Fusion: sem marca d'água, lendo {params['lookback_days']} dias")
+        params['max_failed_attempts'] = FUSION_CONFIG['max_failed_attempts']
+
+        query = text(self._build_unprocessed_query(
+            incremental=bool(watermark), include_processed=include_processed))
+
+        with self.engine.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=self.chunk_size
+            ).execute(query, params)
+
+            for partition in result.mappings().partitions(self.chunk_size):
+                chunk = [_row_to_ticket(row) for row in partition]
+                for ticket in chunk:
+                    ticket['nova_tentativa'] = bool(ticket.get('nova_tentativa'))
+                yield chunk
+
+    def get_unprocessed_tickets(self, max_days_lookback: int = None,
+                                watermark: Optional[Watermark] = None) -> List[Dict]:
+        """
+        Lê todos os tickets não processados em uma lista
+
+        Args:
+            max_days_lookback: Janela em dias sem marca d'água (opcional)
+            watermark: (alteração, id) do último ticket concluído (opcional)
+
+        Returns:
+            List[Dict]: Tickets não processados
+        """
+        tickets = []
+        for chunk in self.iter_unprocessed_tickets(max_days_lookback, watermark):
+            tickets.extend(chunk)
+        return tickets
+
+
+class WatermarkStore:
+    """
+    Marca d'água da extração incremental, persistida no SQL Server do Fusion
+
+    Guarda (alteração, id) do último ticket concluído, com alteração =
+    COALESCE(data_atualizacao, data_criacao) (ver ticket_changed_at). O id desempata
+    tickets atualizados no mesmo instante. Tabela esperada:
+
+        CREATE TABLE azure_devops_watermark (
+            name NVARCHAR(100) PRIMARY KEY,
+            last_changed_at DATETIME2 NOT NULL,
+            last_ticket_id NVARCHAR(100) NOT NULL,
+            updated_at DATETIME2 NOT NULL
+        )
+    """
+
+    def __init__(self, engine: Engine, table: str = None, name: str = None):
+        """
+        Inicializa o armazenamento
+
+        Args:
+            engine: Engine SQLAlchemy do SQL Server do Fusion
+            table: Tabela da marca d'água (opcional, padrão: FUSION_CONFIG['watermark_table'])
+            name: Identificador do pipeline (opcional, padrão: FUSION_CONFIG['watermark_name'])
+        """
+        self.engine = engine
+        self.table = table or FUSION_CONFIG['watermark_table']
+        self.name = name or FUSION_CONFIG['watermark_name']
+
+    def get(self) -> Optional[Tuple[datetime, str]]:
+        """
+        Lê a marca d'água atual
+
+        Returns:
+            Optional[Tuple[datetime, str]]: (alteração, id do ticket) ou None
+        """
+        with self.engine.connect() as connection:
+            row = connection.execute(
+                text(f"SELECT last_changed_at, last_ticket_id FROM {self.table} WHERE name = :name"),
+                {'name': self.name}
+            ).first()
+
+        if row is None:
+            return None
+
+        return _as_datetime(row[0]), str(row[1])
+
+    def advance(self, changed_at: Union[datetime, str], ticket_id: str, connection=None) -> None:
+        """
+        Avança a marca d'água (nunca retrocede)
+
+        A comparação com a marca atual é feita em Python, com a mesma ordem da
+        consulta incremental: data como datetime e IDs numéricos como números
+        ('9' < '10'); a linha atual é lida com UPDLOCK para serializar execuções.
+
+        Args:
+            changed_at: Alteração (ticket_changed_at) do último ticket concluído
+            ticket_id: ID desse ticket
+            connection: Conexão com transação aberta, para gravar junto com outras
+                escritas (opcional; sem ela, abre e confirma uma transação própria)
+        """
+        if connection is None:
+            with self.engine.begin() as own_connection:
+                self.advance(changed_at, ticket_id, connection=own_connection)
+            return
+
+        changed_at = _as_datetime(changed_at)
+        params = {'name': self.name, 'changed_at': changed_at, 'ticket_id': str(ticket_id)}
+
+        current = connection.execute(text(
+            f"SELECT last_changed_at, last_ticket_id FROM {self.table} WITH (UPDLOCK, HOLDLOCK) "
+            f"WHERE name = :name"
+        ), {'name': self.name}).first()
+
+        if current is None:
+            connection.execute(text(
+                f"INSERT INTO {self.table} (name, last_changed_at, last_ticket_id, updated_at) "
+                f"VALUES (:name, :changed_at, :ticket_id, SYSUTCDATETIME())"
+            ), params)
+        elif _watermark_key(current[0], current[1]) < _watermark_key(changed_at, ticket_id):
+            connection.execute(text(
+                f"UPDATE {self.table} SET last_changed_at = :changed_at, last_ticket_id = :ticket_id, "
+                f"updated_at = SYSUTCDATETIME() WHERE name = :name"
+            ), params)
+        else:
+            logger.info(f"Marca d'água do Fusion mantida em {current[0]} / {current[1]}")
+            return
+
+        logger.info(f"Marca d'água do Fusion: {changed_at.isoformat()} / {ticket_id}")
+
+
+class ProcessedTicketStore:
+    """
+    Registro em lote dos tickets processados, no SQL Server do Fusion
+
+    Cada bloco de chunk_size linhas vai em um único executemany (com
+    fast_executemany, uma ida ao servidor) e é confirmado na sua própria
+    transação; o último bloco leva junto o avanço da marca d'água, que
+    assim só acontece com todos os registros gravados. Tabela esperada:
+
+        CREATE TABLE azure_devops_processed (
+            ticket_id NVARCHAR(100) PRIMARY KEY,
+            work_item_id INT NULL,
+            processed_at DATETIME2 NOT NULL,
+            outcome NVARCHAR(20) NOT NULL,
+            attempts INT NOT NULL DEFAULT 0
+        )
+
+    attempts conta falhas consecutivas (zera no sucesso); a consulta incremental
+    relê tickets com falha enquanto attempts < FUSION_CONFIG['max_failed_attempts'].
+    """
+
+    def __init__(self, engine: Engine, table: str = None, chunk_size: int = None):
+        """
+        Inicializa o armazenamento
+
+        Args:
+            engine: Engine SQLAlchemy do SQL Server do Fusion
+            table: Tabela de processados (opcional, padrão: FUSION_CONFIG['processed_tickets_table'])
+            chunk_size: Linhas por transação (opcional, padrão: FUSION_CONFIG['batch_size'])
+        """
+        self.engine = engine
+        self.table = table or FUSION_CONFIG['processed_tickets_table']
+        self.chunk_size = chunk_size or FUSION_CONFIG['batch_size']
+
+    def _build_upsert(self) -> str:
+        """
+        MERGE de uma linha, executado em lote pelo executemany
+
+        Uma falha de criação não sobrescreve um sucesso anterior, e um ID de
+        work item ausente mantém o gravado. Falhas incrementam attempts.
+        """
+        failures = f"('{OUTCOME_FAILED}', '{OUTCOME_SYNC_FAILED}')"
+        return (
+            f"MERGE {self.table} WITH (HOLDLOCK) AS target "
+            f"USING (SELECT :ticket_id AS ticket_id, :work_item_id AS work_item_id, "
+            f":outcome AS outcome) AS source "
+            f"ON target.ticket_id = source.ticket_id "
+            f"WHEN MATCHED AND (source.outcome <> '{OUTCOME_FAILED}' OR target.outcome = '{OUTCOME_FAILED}') "
+            f"THEN UPDATE SET work_item_id = COALESCE(source.work_item_id, target.work_item_id), "
+            f"processed_at = SYSUTCDATETIME(), outcome = source.outcome, "
+            f"attempts = CASE WHEN source.outcome IN {failures} THEN target.attempts + 1 ELSE 0 END "
+            f"WHEN NOT MATCHED THEN INSERT (ticket_id, work_item_id, processed_at, outcome, attempts) "
+            f"VALUES (source.ticket_id, source.work_item_id, SYSUTCDATETIME(), source.outcome, "
+            f"CASE WHEN source.outcome IN {failures} THEN 1 ELSE 0 END);"
+        )
+
+    def record(self, outcomes: Iterable[Tuple[str, Optional[int], str]],
+               watermark: Optional[Watermark] = None,
+               watermark_store: Optional['WatermarkStore'] = None) -> int:
+        """
+        Grava os resultados e, na mesma transação do último bloco, avança a marca d'água
+
+        Args:
+            outcomes: (ID do ticket, ID do work item ou None, resultado OUTCOME_*)
+            watermark: (alteração, id) para avançar ao final (opcional)
+            watermark_store: Marca d'água do pipeline (opcional, padrão: mesma engine)
+
+        Returns:
+            int: Quantidade de linhas gravadas
+        """
+        rows = [
+            {'ticket_id': str(ticket_id), 'work_item_id': work_item_id, 'outcome': outcome}
+            for ticket_id, work_item_id, outcome in outcomes
+        ]
+        if not rows and watermark is None:
+            return 0
+        if watermark is not None and watermark_store is None:
+            watermark_store = WatermarkStore(self.engine)
+
+        statement = text(self._build_upsert())
+        chunks = [rows[start:start + self.chunk_size] for start in range(0, len(rows), self.chunk_size)] or [[]]
+
+        for position, chunk in enumerate(chunks, 1):
+            with self.engine.begin() as connection:
+                if chunk:
+                    connection.execute(statement, chunk)
+                if watermark is not None and position == len(chunks):
+                    watermark_store.advance(*watermark, connection=connection)
+
+        logger.info(f"{len(rows)} tickets registrados em {self.table} ({len(chunks)} transações)")
+        return len(rows)
+
+
+def stream_watermark(tickets: Iterable[Dict]) -> Optional[Tuple[str, str]]:
+    """
+    Calcula até onde a marca d'água pode avançar após um lote
+
+    Avança até o último ticket da janela lida, mesmo que algum tenha falhado:
+    as falhas ficam registradas na tabela de processados (ProcessedTicketStore,
+    na mesma transação do avanço) e voltam pela consulta incremental até
+    max_failed_attempts, sem segurar a marca d'água. Tickets relidos por
+    nova tentativa (fora da janela) não contam.
+
+    Args:
+        tickets: Tickets lidos do Fusion, na ordem da consulta
+
+    Returns:
+        Optional[Tuple[str, str]]: (alteração, id) do último ticket da janela ou None
+    """
+    watermark = None
+
+    for ticket in tickets:
+        if ticket.get('nova_tentativa'):
+            continue
+        key = ticket_changed_at(ticket)
+        if key:
+            watermark = (key, str(ticket['id']))
+        else:
+            logger.warning(f"Ticket {ticket.get('id')} sem data_atualizacao nem data_criacao")
+
+    return watermark
+
+
+def ticket_changed_at(ticket: Dict):
+    """
+    Chave de alteração do ticket, a mesma da consulta incremental
+
+    Args:
+        ticket: Ticket lido do Fusion
+
+    Returns:
+        data_atualizacao, ou data_criacao para tickets nunca atualizados
+    """
+    return ticket.get('data_atualizacao') or ticket.get('data_criacao')
+
+
+def _as_datetime(value: Union[datetime, date, str]) -> datetime:
+    """Converte a alteração (datetime do banco ou ISO 8601 do staging) em datetime"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value))
+
+
+def _bind_ticket_id(ticket_id) -> Union[int, str]:
+    """ID do ticket como parâmetro: numérico vai como inteiro, comparado como número"""
+    ticket_id = str(ticket_id)
+    return int(ticket_id) if ticket_id.isdigit() else ticket_id
+
+
+def _watermark_key(changed_at, ticket_id) -> Tuple:
+    """Chave de ordenação (alteração, id) compatível com o ORDER BY da consulta incremental"""
+    bound = _bind_ticket_id(ticket_id)
+    return _as_datetime(changed_at), (0, bound, '') if isinstance(bound, int) else (1, 0, bound)
+
+
+def _row_to_ticket(row) -> Dict:
+    """Converte uma linha do SQL Server em ticket serializável (datas em ISO 8601)"""
+    ticket = {}
+    for key, value in row.items():
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        ticket[key] = value
+
+    if ticket.get('id') is not None:
+        ticket['id'] = str(ticket['id'])
+
+    return ticket
+
+
+def create_fusion_connector(server: str, database: str, username: str, password: str,
+                            port: int = None, **kwargs) -> FusionConnector:
+    """
+    Factory function para criar conector do Fusion
+
+    Args:
+        server: Host do SQL Server
+        database: Banco do Fusion
+        username: Usuário
+        password: Senha
+        port: Porta (opcional)
+        **kwargs: Opções extras do conector (tickets_table, processed_table, chunk_size)
+
+    Returns:
+        FusionConnector: Conector sobre a engine compartilhada do processo
+    """
+    engine = get_shared_engine(server, database, username, password, port=port)
+    return FusionConnector(engine, **kwargs)
@@ -0,0 +1,276 @@
+"""
+Hook do Airflow para o Azure DevOps
+Resolve as credenciais uma vez por processo worker e reaproveita o cliente entre tasks
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+from airflow.exceptions import AirflowNotFoundException
+from airflow.hooks.base import BaseHook
+from airflow.models import Variable
+
+from .client import AzureDevOpsClient
+from .config import HOOK_CACHE_CONFIG
+from .ticket_index import TicketIndex
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+Credentials = Tuple[str, str, str, Optional[str], Optional[str]]
+
+# Caches por processo, indexados pelo conn_id; cada entrada guarda o instante
+# em que foi criada e expira após HOOK_CACHE_CONFIG['credentials_ttl_seconds']
+_credentials_cache: Dict[str, Tuple[Credentials, float]] = {}
+_client_cache: Dict[str, Tuple[AzureDevOpsClient, float]] = {}
+# (conn_id, run_id) -> instante da última sonda bem-sucedida, em ordem de inserção
+_health_cache: Dict[Tuple[str, str], float] = {}
+_cache_lock = threading.Lock()
+
+
+class AzureDevOpsHook(BaseHook):
+    """
+    Acesso ao Azure DevOps a partir de uma Connection do Airflow
+
+    Campos da Connection:
+        login: organização
+        schema: projeto
+        password: Personal Access Token
+        host: URL do servidor (opcional, padrão: AZURE_DEVOPS_CONFIG['server_url'])
+        extra: {"area_path": "..."} (opcional)
+
+    Sem a Connection, usa as Variables azure_devops_organization,
+    azure_devops_project, azure_devops_pat e azure_devops_area_path.
+    """
+
+    conn_name_attr = 'azure_devops_conn_id'
+    default_conn_name = 'azure_devops_default'
+    conn_type = 'azure_devops_integration'
+    hook_name = 'Azure DevOps (Fusion Integration)'
+
+    def __init__(self, azure_devops_conn_id: str = default_conn_name, **kwargs):
+        """
+        Inicializa o hook
+
+        Args:
+            azure_devops_conn_id: ID da Connection do Airflow
+        """
+        super().__init__(**kwargs)
+        self.azure_devops_conn_id = azure_devops_conn_id
+
+    @classmethod
+    def get_ui_field_behaviour(cls) -> Dict[str, Any]:
+        """Rótulos dos campos da Connection na interface do Airflow"""
+        return {
+            'hidden_fields': ['port'],
+            'relabeling': {
+                'login': 'Organização',
+                'schema': 'Projeto',
+                'password': 'Personal Access Token',
+                'host': 'URL do servidor (opcional)'
+            }
+        }
+
+    def get_credentials(self) -> Credentials:
+        """
+        Resolve as credenciais (uma leitura do banco de metadados por processo e TTL)
+
+        Returns:
+            Tuple: (organization, project, pat_token, area_path, server_url)
+
+        Raises:
+            ValueError: Se alguma credencial obrigatória estiver vazia
+        """
+        with _cache_lock:
+            cached = _get_fresh(_credentials_cache, self.azure_devops_conn_id)
+        if cached is not None:
+            return cached
+
+        try:
+            conn = self.get_connection(self.azure_devops_conn_id)
+            extra = conn.extra_dejson
+            credentials = (
+                conn.login,
+                conn.schema,
+                conn.password,
+                extra.get('area_path'),
+                conn.host or None
+            )
+            logger.info(f"Credenciais Azure DevOps lidas da Connection '{self.azure_devops_conn_id}'")
+        except AirflowNotFoundException:
+            credentials = (
+                Variable.get("azure_devops_organization"),
+                Variable.get("azure_devops_project"),
+                Variable.get("azure_devops_pat"),
+                Variable.get("azure_devops_area_path", default_var=None),
+                None
+            )
+            logger.info("Connection ausente: credenciais Azure DevOps lidas das Variables")
+
+        # Validação básica
+        if not all(credentials[:3]):
+            raise ValueError("Uma ou mais credenciais estão vazias")
+
+        with _cache_lock:
+            _credentials_cache[self.azure_devops_conn_id] = (credentials, time.monotonic())
+
+        return credentials
+
+    def get_conn(self) -> AzureDevOpsClient:
+        """
+        Retorna o cliente do processo para esta Connection (criado na primeira chamada)
+
+        O cliente já vem com o índice local de tickets e compartilha a sessão
+        HTTP, o cache de schemas e o agendador de taxa do processo. Ele expira
+        junto com as credenciais, e uma resposta 401 descarta os dois: a próxima
+        chamada relê a Connection (PAT rotacionado ou revogado). O cliente
+        descartado é fechado (libera a conexão SQLite do índice local).
+
+        Returns:
+            AzureDevOpsClient: Cliente pronto para uso
+        """
+        expired: List[AzureDevOpsClient] = []
+        with _cache_lock:
+            client = _get_fresh(_client_cache, self.azure_devops_conn_id, expired)
+        _close_clients(expired)
+        if client is not None:
+            return client
+
+        organization, project, pat_token, area_path, server_url = self.get_credentials()
+        client = AzureDevOpsClient(
+            organization, project, pat_token, area_path,
+            server_url=server_url, ticket_index=TicketIndex())
+        client.add_hook('after_response', _evict_on_unauthorized(self.azure_devops_conn_id))
+
+        with _cache_lock:
+            # Outra thread pode ter criado o cliente enquanto este era montado
+            cached = _get_fresh(_client_cache, self.azure_devops_conn_id, expired)
+            if cached is None:
+                _client_cache[self.azure_devops_conn_id] = (client, time.monotonic())
+        if cached is not None:
+            expired.append(client)
+            client = cached
+        _close_clients(expired)
+
+        return client
+
+    def get_client(self) -> AzureDevOpsClient:
+        """Alias de get_conn"""
+        return self.get_conn()
+
+    def check_health(self, run_id: str = None) -> bool:
+        """
+        Sonda leve do Azure DevOps, com resultado guardado por execução da DAG
+
+        Só o sucesso fica em cache: uma falha é sondada de novo na próxima chamada.
+        As entradas expiram após HOOK_CACHE_CONFIG['health_ttl_seconds'] e só as
+        max_health_entries execuções mais recentes são mantidas.
+
+        Args:
+            run_id: ID da execução da DAG (opcional; sem ele, sonda sempre)
+
+        Returns:
+            bool: True se o projeto respondeu
+        """
+        key = (self.azure_devops_conn_id, run_id)
+        if run_id is not None:
+            with _cache_lock:
+                probed_at = _health_cache.get(key)
+                ttl = HOOK_CACHE_CONFIG['health_ttl_seconds']
+                if probed_at is not None and time.monotonic() - probed_at <= ttl:
+                    return True
+
+        healthy = self.get_conn().check_health()
+
+        if healthy and run_id is not None:
+            with _cache_lock:
+                _health_cache.pop(key, None)
+                _health_cache[key] = time.monotonic()
+                _evict_health_entries()
+
+        return healthy
+
+    def test_connection(self) -> Tuple[bool, str]:
+        """Botão "Test" da Connection na interface do Airflow"""
+        try:
+            if self.get_conn().check_health():
+                return True, "Conexão com Azure DevOps estabelecida"
+            return False, "Azure DevOps não respondeu à sonda de saúde"
+        except Exception as e:
+            return False, str(e)
+
+
+def clear_hook_cache(conn_id: str = None) -> None:
+    """
+    Descarta credenciais, clientes e sondas guardados no processo
+
+    Args:
+        conn_id: Connection a descartar (opcional, None = todas)
+    """
+    with _cache_lock:
+        if conn_id is None:
+            evicted = [client for client, _ in _client_cache.values()]
+            _credentials_cache.clear()
+            _client_cache.clear()
+            _health_cache.clear()
+        else:
+            entry = _client_cache.pop(conn_id, None)
+            evicted = [entry[0]] if entry is not None else []
+            _credentials_cache.pop(conn_id, None)
+            for key in [key for key in _health_cache if key[0] == conn_id]:
+                del _health_cache[key]
+
+    _close_clients(evicted)
+
+
+def _get_fresh(cache: Dict[str, Tuple[Any, float]], conn_id: str, expired: List[Any] = None) -> Any:
+    """
+    Valor em cache ainda dentro do TTL; chamar com _cache_lock
+
+    A entrada expirada é removida e, com expired, devolvida nele para ser
+    fechada fora do lock.
+    """
+    entry = cache.get(conn_id)
+    if entry is None:
+        return None
+
+    value, created_at = entry
+    if time.monotonic() - created_at > HOOK_CACHE_CONFIG['credentials_ttl_seconds']:
+        del cache[conn_id]
+        if expired is not None:
+            expired.append(value)
+        return None
+    return value
+
+
+def _close_clients(clients: List[AzureDevOpsClient]) -> None:
+    """Fecha clientes descartados do cache, sem interromper quem chamou"""
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.warning(f"Falha ao fechar cliente Azure DevOps descartado: {str(e)}")
+
+
+def _evict_health_entries() -> None:
+    """Remove sondas expiradas e as execuções mais antigas além do limite; chamar com _cache_lock"""
+    expires_before = time.monotonic() - HOOK_CACHE_CONFIG['health_ttl_seconds']
+    for key in [key for key, probed_at in _health_cache.items() if probed_at < expires_before]:
+        del _health_cache[key]
+
+    excess = len(_health_cache) - HOOK_CACHE_CONFIG['max_health_entries']
+    for key in list(_health_cache)[:max(excess, 0)]:
+        del _health_cache[key]
+
+
+def _evict_on_unauthorized(conn_id: str) -> Callable:
+    """Callback after_response que descarta o cache da Connection quando o PAT é recusado"""
+    def after_response(method: str, url: str, response: Any, elapsed_seconds: float) -> None:
+        if response.status_code == 401:
+            logger.warning(
+                f"Azure DevOps recusou o PAT (401): cache da Connection '{conn_id}' descartado")
+            clear_hook_cache(conn_id)
+
+    return after_response
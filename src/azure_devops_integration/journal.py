@@ -0,0 +1,183 @@
+"""
+Journal de criação (write-ahead) por execução
+Registra a intenção antes de cada POST e o resultado depois, em JSONL com fsync,
+para que o retry de uma task retome só o que não terminou.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+from .config import JOURNAL_CONFIG
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Eventos do journal
+EVENT_INTENT = 'intent'
+EVENT_DONE = 'done'
+EVENT_FAILED = 'failed'
+
+
+class CreationJournal:
+    """
+    Journal append-only de criações de work items
+
+    Estado de cada ticket = último evento registrado:
+        done: work item criado (ID conhecido), pular no retry
+        intent: POST enviado sem resultado registrado (processo morreu no meio)
+        failed: criação retornou erro; pode ter ocorrido no servidor (timeout)
+
+    intent e failed são "em dúvida": no retry, são conferidos no Azure DevOps
+    com uma única consulta antes de recriar.
+
+    O arquivo é lido uma única vez, na primeira consulta; depois disso o estado
+    em memória é atualizado a cada gravação. Um journal tem um único escritor
+    (o processo da task do shard).
+    """
+
+    def __init__(self, path: str, fsync: bool = None):
+        """
+        Abre (ou cria) o journal
+
+        Args:
+            path: Arquivo JSONL do journal
+            fsync: Força cada gravação até o disco (opcional, padrão: JOURNAL_CONFIG)
+        """
+        self.path = path
+        self.fsync = fsync if fsync is not None else JOURNAL_CONFIG['fsync']
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        # ID do ticket -> {'event', 'work_item_id'}; None até a primeira consulta
+        self._state: Optional[Dict[str, Dict]] = None
+
+        # Uma queda no meio da gravação deixa a última linha sem quebra; fecha a
+        # linha para que a próxima entrada não seja colada a ela
+        size = os.fstat(self._fd).st_size
+        if size:
+            with open(path, 'rb') as file:
+                file.seek(size - 1)
+                if file.read(1) != b'\n':
+                    os.write(self._fd, b'\n')
+
+    def __enter__(self) -> 'CreationJournal':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Fecha o arquivo"""
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def _append(self, entries: List[Dict]) -> None:
+        """Grava as entradas com um único write (e fsync)"""
+        if not entries:
+            return
+        recorded_at = datetime.now(timezone.utc).isoformat()
+        payload = ''.join(
+            json.dumps({**entry, 'at': recorded_at}, ensure_ascii=False) + '\n' for entry in entries
+        ).encode('utf-8')
+
+        with self._lock:
+            os.write(self._fd, payload)
+            if self.fsync:
+                os.fsync(self._fd)
+            if self._state is not None:
+                for entry in entries:
+                    self._state[entry['ticket_id']] = {
+                        'event': entry['event'],
+                        'work_item_id': entry.get('work_item_id')
+                    }
+
+    def log_intents(self, ticket_ids: Iterable[str]) -> None:
+        """
+        Registra que os tickets vão ser enviados (antes do POST)
+
+        Args:
+            ticket_ids: IDs dos tickets do Fusion
+        """
+        self._append([{'event': EVENT_INTENT, 'ticket_id': str(ticket_id)} for ticket_id in ticket_ids])
+
+    def log_outcomes(self, outcomes: Iterable[Tuple[str, Optional[int]]]) -> None:
+        """
+        Registra o resultado dos envios (depois do POST)
+
+        Args:
+            outcomes: (ID do ticket, ID do work item ou None se falhou)
+        """
+        self._append([
+            {'event': EVENT_DONE, 'ticket_id': str(ticket_id), 'work_item_id': work_item_id}
+            if work_item_id else {'event': EVENT_FAILED, 'ticket_id': str(ticket_id)}
+            for ticket_id, work_item_id in outcomes
+        ])
+
+    def load(self) -> Dict[str, Dict]:
+        """
+        Lê o estado atual de cada ticket do journal
+
+        Linhas incompletas (gravação interrompida pela queda do processo) são ignoradas.
+
+        Returns:
+            Dict[str, Dict]: ID do ticket -> {'event', 'work_item_id'}
+        """
+        with self._lock:
+            return {ticket_id: dict(entry) for ticket_id, entry in self._get_state().items()}
+
+    def _get_state(self) -> Dict[str, Dict]:
+        """Estado em memória, lido do arquivo na primeira chamada (chamar com o lock)"""
+        if self._state is not None:
+            return self._state
+
+        state: Dict[str, Dict] = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Linha incompleta ignorada no journal {self.path}")
+                        continue
+                    state[entry['ticket_id']] = {
+                        'event': entry['event'],
+                        'work_item_id': entry.get('work_item_id')
+                    }
+
+        self._state = state
+        return state
+
+    def split(self, ticket_ids: Iterable[str]) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Separa os tickets já concluídos dos que estão em dúvida
+
+        Args:
+            ticket_ids: IDs dos tickets do lote
+
+        Returns:
+            Tuple[Dict[str, int], List[str]]: (ticket -> work item concluídos, tickets em dúvida);
+                tickets ausentes do journal não aparecem em nenhum dos dois
+        """
+        completed: Dict[str, int] = {}
+        in_doubt: List[str] = []
+
+        # Custo proporcional ao bloco, não ao journal inteiro (chamado a cada bloco do shard)
+        with self._lock:
+            state = self._get_state()
+            for ticket_id in dict.fromkeys(str(ticket_id) for ticket_id in ticket_ids):
+                entry = state.get(ticket_id)
+                if entry is None:
+                    continue
+                if entry['event'] == EVENT_DONE and entry['work_item_id']:
+                    completed[ticket_id] = entry['work_item_id']
+                else:
+                    in_doubt.append(ticket_id)
+
+        return completed, in_doubt
@@ -0,0 +1,305 @@
+"""
+Hooks do ciclo de vida das requisições e dos tickets
+Permite acoplar profilers, amostradores e contabilidade própria ao cliente sem
+alterá-lo. Sem hooks registrados, o custo é um teste de lista vazia por evento.
+"""
+
+import contextlib
+import cProfile
+import io
+import pstats
+import threading
+import time
+from typing import Any, Callable, ContextManager, Dict, List, NamedTuple, Optional
+import logging
+
+from .metrics import endpoint_name
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Eventos e assinaturas dos callbacks
+#   before_request(method, url, kwargs)                   kwargs pode ser alterado
+#   after_response(method, url, response, elapsed_seconds)
+#   on_error(method, url, error, elapsed_seconds)         falha sem resposta (timeout, conexão)
+#   on_ticket_complete(ticket, work_item_id, elapsed_seconds)   work_item_id None = falhou
+#   around_transform(ticket) -> context manager           envolve a montagem do patch document
+#
+# O response de after_response sempre tem status_code e headers: é o requests.Response
+# no cliente síncrono e um HookResponse no assíncrono. Outros atributos (elapsed,
+# text etc.) só existem no síncrono; leia-os com getattr.
+EVENTS = ('before_request', 'after_response', 'on_error', 'on_ticket_complete', 'around_transform')
+
+_NOOP_CONTEXT = contextlib.nullcontext()
+
+
+class HookResponse(NamedTuple):
+    """Resposta entregue a after_response pelo cliente assíncrono (corpo já lido)"""
+    status_code: int
+    headers: Any
+    body: Any
+
+
+class ClientHooks:
+    """Registro de callbacks de um cliente, uma lista por evento"""
+
+    def __init__(self):
+        self.before_request: List[Callable] = []
+        self.after_response: List[Callable] = []
+        self.on_error: List[Callable] = []
+        self.on_ticket_complete: List[Callable] = []
+        self.around_transform: List[Callable] = []
+        self.aiohttp_trace_configs: List[Any] = []
+
+    def add(self, event: str, callback: Callable) -> None:
+        """
+        Registra um callback
+
+        Args:
+            event: Um dos EVENTS
+            callback: Função chamada no evento
+
+        Raises:
+            ValueError: Se o evento não existir
+        """
+        if event not in EVENTS:
+            raise ValueError(f"Evento de hook desconhecido: {event} (válidos: {', '.join(EVENTS)})")
+        getattr(self, event).append(callback)
+
+    def remove(self, event: str, callback: Callable) -> None:
+        """Remove um callback registrado (ignora se ausente)"""
+        callbacks = getattr(self, event, None)
+        if callbacks is not None and callback in callbacks:
+            callbacks.remove(callback)
+
+    def register(self, handler: Any) -> Any:
+        """
+        Registra todos os métodos de um objeto cujo nome é um evento
+
+        Objetos com aiohttp_trace_config() também instrumentam a sessão do
+        cliente assíncrono (precisa ocorrer antes da primeira requisição).
+
+        Args:
+            handler: Objeto com métodos before_request, after_response etc.
+
+        Returns:
+            Any: O próprio handler
+        """
+        for event in EVENTS:
+            callback = getattr(handler, event, None)
+            if callable(callback):
+                self.add(event, callback)
+
+        trace_config_factory = getattr(handler, 'aiohttp_trace_config', None)
+        if callable(trace_config_factory):
+            self.aiohttp_trace_configs.append(trace_config_factory())
+
+        return handler
+
+    def dispatch(self, event: str, *args) -> None:
+        """Chama os callbacks do evento; um callback com erro nunca interrompe o cliente"""
+        for callback in getattr(self, event):
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.warning(f"Hook {event} ({getattr(callback, '__qualname__', callback)}) falhou: {str(e)}")
+
+    def transform(self, ticket: Dict) -> ContextManager:
+        """
+        Contexto que envolve a montagem do patch document de um ticket
+
+        Args:
+            ticket: Ticket sendo transformado
+
+        Returns:
+            ContextManager: Contextos de around_transform combinados
+        """
+        if not self.around_transform:
+            return _NOOP_CONTEXT
+
+        stack = contextlib.ExitStack()
+        for callback in self.around_transform:
+            try:
+                stack.enter_context(callback(ticket))
+            except Exception as e:
+                logger.warning(f"Hook around_transform falhou: {str(e)}")
+        return stack
+
+
+class TimingBreakdownHook:
+    """
+    Quebra do tempo das requisições por fase e por endpoint
+
+    Fases disponíveis:
+        total: duração da tentativa (ambos os clientes)
+        server: até receber os headers da resposta (requests: response.elapsed;
+            aiohttp: via TraceConfig, incluindo queue/dns/connect)
+        download: leitura do corpo (cliente síncrono)
+        queue, dns, connect: espera por conexão do pool, resolução DNS e
+            abertura da conexão com TLS (cliente assíncrono, via TraceConfig)
+    """
+
+    def __init__(self):
+        # endpoint -> fase -> [ocorrências, segundos]
+        self._phases: Dict[str, Dict[str, List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, endpoint: str, phase: str, seconds: float) -> None:
+        with self._lock:
+            totals = self._phases.setdefault(endpoint, {}).setdefault(phase, [0, 0.0])
+            totals[0] += 1
+            totals[1] += max(seconds, 0.0)
+
+    def after_response(self, method: str, url: str, response: Any, elapsed_seconds: float) -> None:
+        endpoint = endpoint_name(method, url)
+        self._add(endpoint, 'total', elapsed_seconds)
+
+        server_elapsed = getattr(response, 'elapsed', None)
+        if server_elapsed is not None:
+            server_seconds = server_elapsed.total_seconds()
+            self._add(endpoint, 'server', server_seconds)
+            self._add(endpoint, 'download', elapsed_seconds - server_seconds)
+
+    def on_error(self, method: str, url: str, error: Exception, elapsed_seconds: float) -> None:
+        self._add(endpoint_name(method, url), 'error', elapsed_seconds)
+
+    def aiohttp_trace_config(self):
+        """TraceConfig do aiohttp que alimenta as fases queue/dns/connect/server"""
+        import aiohttp
+
+        trace_config = aiohttp.TraceConfig()
+
+        def started(key):
+            async def handler(session, context, params):
+                setattr(context, key, time.perf_counter())
+            return handler
+
+        def finished(key, phase):
+            async def handler(session, context, params):
+                start = getattr(context, key, None)
+                if start is not None:
+                    self._add(getattr(context, 'endpoint', 'other'), phase, time.perf_counter() - start)
+            return handler
+
+        async def on_request_start(session, context, params):
+            context.endpoint = endpoint_name(params.method, str(params.url))
+            context.request_start = time.perf_counter()
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_queued_start.append(started('queue_start'))
+        trace_config.on_connection_queued_end.append(finished('queue_start', 'queue'))
+        trace_config.on_dns_resolvehost_start.append(started('dns_start'))
+        trace_config.on_dns_resolvehost_end.append(finished('dns_start', 'dns'))
+        trace_config.on_connection_create_start.append(started('connect_start'))
+        trace_config.on_connection_create_end.append(finished('connect_start', 'connect'))
+        trace_config.on_request_end.append(finished('request_start', 'server'))
+        return trace_config
+
+    def get_breakdown(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Retorna a quebra acumulada
+
+        Returns:
+            Dict: endpoint -> fase -> {count, total_ms, avg_ms}
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    phase: {
+                        'count': int(count),
+                        'total_ms': round(seconds * 1000, 3),
+                        'avg_ms': round(seconds * 1000 / count, 3) if count else 0.0
+                    }
+                    for phase, (count, seconds) in phases.items()
+                }
+                for endpoint, phases in self._phases.items()
+            }
+
+    def summary(self) -> str:
+        """Tabela texto com a média de cada fase por endpoint"""
+        lines = []
+        for endpoint, phases in sorted(self.get_breakdown().items()):
+            parts = ', '.join(f"{phase} {values['avg_ms']:.1f} ms" for phase, values in phases.items())
+            lines.append(f"{endpoint} ({phases.get('total', {}).get('count', 0)}x): {parts}")
+        return '\n'.join(lines)
+
+    def reset(self) -> None:
+        """Zera a quebra acumulada"""
+        with self._lock:
+            self._phases.clear()
+
+
+class TransformProfiler:
+    """
+    Coletor cProfile por amostragem da etapa de transformação
+
+    Perfila um a cada `every` tickets transformados e acumula as amostras em
+    um único perfil. Só uma transformação é perfilada por vez: amostras que
+    coincidem com outra em andamento (em outra thread) são puladas.
+    """
+
+    def __init__(self, every: int = 100):
+        """
+        Inicializa o coletor
+
+        Args:
+            every: Intervalo de amostragem em tickets (1 = todos)
+        """
+        self.every = max(1, int(every))
+        self.samples = 0
+        self._seen = 0
+        self._profile = cProfile.Profile()
+        self._profiling = threading.Lock()
+        self._counter_lock = threading.Lock()
+
+    def around_transform(self, ticket: Dict) -> ContextManager:
+        with self._counter_lock:
+            self._seen += 1
+            sampled = (self._seen - 1) % self.every == 0
+        if not sampled or not self._profiling.acquire(blocking=False):
+            return _NOOP_CONTEXT
+        return self._profiled()
+
+    @contextlib.contextmanager
+    def _profiled(self):
+        try:
+            self._profile.enable()
+            try:
+                yield
+            finally:
+                self._profile.disable()
+                self.samples += 1
+        finally:
+            self._profiling.release()
+
+    def get_stats(self) -> Optional[pstats.Stats]:
+        """
+        Retorna o perfil acumulado
+
+        Returns:
+            Optional[pstats.Stats]: Estatísticas ou None se nada foi amostrado
+        """
+        if not self.samples:
+            return None
+        return pstats.Stats(self._profile)
+
+    def report(self, limit: int = 20, sort: str = 'cumulative') -> str:
+        """
+        Relatório texto das funções mais custosas
+
+        Args:
+            limit: Quantidade de linhas
+            sort: Critério de ordenação do pstats
+
+        Returns:
+            str: Relatório (vazio se nada foi amostrado)
+        """
+        if not self.samples:
+            return ''
+        output = io.StringIO()
+        pstats.Stats(self._profile, stream=output).sort_stats(sort).print_stats(limit)
+        return f"{self.samples} transformações amostradas (1 a cada {self.every})\n{output.getvalue()}"
+
+    def dump(self, path: str) -> None:
+        """Grava o perfil no formato do pstats (snakeviz, gprof2dot...)"""
+        self._profile.dump_stats(path)
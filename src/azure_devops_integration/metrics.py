@@ -0,0 +1,385 @@
+"""
+Métricas por endpoint e tracing das chamadas ao Azure DevOps
+Agrega contagem, latência, status, bytes e retries por endpoint, emite cada
+requisição pelo Stats do Airflow (StatsD/OpenTelemetry conforme a configuração
+de métricas do Airflow) e abre spans OpenTelemetry quando o pacote está instalado.
+"""
+
+import contextlib
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote, urlsplit
+import logging
+
+from .config import METRICS_CONFIG
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # OpenTelemetry é opcional
+    otel_trace = None
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Nomes dos spans do ciclo de vida de um ticket
+SPAN_TICKET = 'azure_devops.ticket'
+SPAN_VALIDATE = 'azure_devops.ticket.validate'
+SPAN_TRANSFORM = 'azure_devops.ticket.transform'
+SPAN_POST = 'azure_devops.ticket.post'
+SPAN_BATCH = 'azure_devops.batch'
+SPAN_HTTP = 'azure_devops.http'
+
+# Status registrado quando a requisição falha sem resposta (timeout, conexão)
+STATUS_ERROR = 'error'
+
+_NOOP_SPAN = contextlib.nullcontext()
+_UNRESOLVED = object()
+_tracer: Any = _UNRESOLVED
+_airflow_stats: Any = _UNRESOLVED
+
+
+def endpoint_name(method: str, url: str) -> str:
+    """
+    Nome estável (baixa cardinalidade) do endpoint chamado
+
+    Args:
+        method: Método HTTP
+        url: URL completa da chamada
+
+    Returns:
+        str: Ex.: workitems_create, wit_batch, wiql, workitemtypes, project
+    """
+    path = unquote(urlsplit(url).path)
+    resource = path.partition('/_apis/')[2]
+
+    if resource.startswith('wit/'):
+        resource = resource[4:]
+        if resource == '$batch':
+            return 'wit_batch'
+        if resource.startswith('workitems/$'):
+            return 'workitems_create'
+        if resource.startswith('workitems/'):
+            return 'workitems_update' if method.upper() == 'PATCH' else 'workitems_get'
+        return resource.split('/', 1)[0] or 'wit'
+
+    if resource == 'projects':
+        return 'projects'
+    if resource.startswith('projects/'):
+        return 'project'
+    return resource.split('/', 1)[0] or 'other'
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None,
+         parent: Any = None, links: Optional[List[Any]] = None):
+    """
+    Abre um span OpenTelemetry como contexto atual
+
+    Sem OpenTelemetry instalado (ou com tracing desligado em METRICS_CONFIG)
+    retorna um contexto vazio compartilhado, sem custo relevante.
+
+    Args:
+        name: Nome do span
+        attributes: Atributos iniciais (opcional)
+        parent: Span pai aberto por start_span (opcional, padrão: o span atual)
+        links: Links para outros spans, de span_links (opcional)
+
+    Returns:
+        Context manager que entrega o span (ou None)
+    """
+    tracer = _get_tracer()
+    if tracer is None:
+        return _NOOP_SPAN
+    context = otel_trace.set_span_in_context(parent) if parent is not None else None
+    return tracer.start_as_current_span(name, context=context, attributes=attributes, links=links)
+
+
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None, parent: Any = None):
+    """
+    Inicia um span sem torná-lo o contexto atual
+
+    Usado quando as etapas de um ticket rodam em momentos diferentes (montagem
+    do lote e POST): o span fica aberto entre elas, as etapas são abertas com
+    parent=<span> e ele é encerrado com end_span (ou use_span) no final.
+
+    Args:
+        name: Nome do span
+        attributes: Atributos iniciais (opcional)
+        parent: Span pai (opcional, padrão: o span atual)
+
+    Returns:
+        Span iniciado, ou None sem tracing
+    """
+    tracer = _get_tracer()
+    if tracer is None:
+        return None
+    context = otel_trace.set_span_in_context(parent) if parent is not None else None
+    return tracer.start_span(name, context=context, attributes=attributes)
+
+
+def use_span(started_span):
+    """
+    Torna atual um span aberto por start_span e o encerra na saída
+
+    Args:
+        started_span: Span de start_span (None = contexto vazio)
+
+    Returns:
+        Context manager que entrega o span (ou None)
+    """
+    if started_span is None:
+        return _NOOP_SPAN
+    return otel_trace.use_span(started_span, end_on_exit=True)
+
+
+def end_span(started_span) -> None:
+    """Encerra um span aberto por start_span, ignorando None e spans já encerrados"""
+    if started_span is not None and started_span.is_recording():
+        started_span.end()
+
+
+def span_links(spans: List[Any]) -> Optional[List[Any]]:
+    """Links para os spans informados (None sem tracing)"""
+    spans = [linked for linked in spans if linked is not None]
+    if not spans:
+        return None
+    return [otel_trace.Link(linked.get_span_context()) for linked in spans]
+
+
+def set_span_attribute(current_span, key: str, value: Any) -> None:
+    """Define um atributo no span, ignorando o span vazio"""
+    if current_span is not None:
+        current_span.set_attribute(key, value)
+
+
+def _get_tracer():
+    """Tracer do pacote, resolvido uma vez por processo"""
+    global _tracer
+    if _tracer is _UNRESOLVED:
+        _tracer = (otel_trace.get_tracer(__name__)
+                   if otel_trace is not None and METRICS_CONFIG['tracing_enabled'] else None)
+    return _tracer
+
+
+def _get_airflow_stats():
+    """Stats do Airflow, importado só na primeira emissão (fora do Airflow: None)"""
+    global _airflow_stats
+    if _airflow_stats is _UNRESOLVED:
+        try:
+            from airflow.stats import Stats
+            _airflow_stats = Stats
+        except ImportError:
+            _airflow_stats = None
+    return _airflow_stats
+
+
+class RequestMetrics:
+    """Agregador de métricas das requisições HTTP, por endpoint"""
+
+    def __init__(self, latency_buckets_ms: List[float] = None, stats_prefix: str = None,
+                 export_to_airflow_stats: bool = None):
+        """
+        Inicializa o agregador
+
+        Args:
+            latency_buckets_ms: Limites superiores do histograma de latência (opcional)
+            stats_prefix: Prefixo das métricas no Airflow Stats (opcional)
+            export_to_airflow_stats: Emite cada requisição pelo Stats do Airflow (opcional)
+        """
+        config = METRICS_CONFIG
+        self.latency_buckets_ms = sorted(latency_buckets_ms or config['latency_buckets_ms'])
+        self.stats_prefix = stats_prefix or config['stats_prefix']
+        self.export_to_airflow_stats = (export_to_airflow_stats if export_to_airflow_stats is not None
+                                        else config['export_to_airflow_stats'])
+
+        self._endpoints: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, endpoint: str) -> Dict:
+        """Acumuladores do endpoint (chamar com o lock)"""
+        entry = self._endpoints.get(endpoint)
+        if entry is None:
+            entry = {
+                'requests': 0,
+                'errors': 0,
+                'status_codes': {},
+                'latency_ms_total': 0.0,
+                'latency_ms_max': 0.0,
+                'latency_histogram': [0] * (len(self.latency_buckets_ms) + 1),
+                'bytes_sent': 0,
+                'bytes_received': 0,
+                'retries': 0,
+                'retries_by_reason': {}
+            }
+            self._endpoints[endpoint] = entry
+        return entry
+
+    def record_request(self, method: str, url: str, status_code: Optional[int], duration_seconds: float,
+                       bytes_sent: int = 0, bytes_received: int = 0) -> None:
+        """
+        Registra uma tentativa HTTP
+
+        Args:
+            method: Método HTTP
+            url: URL chamada
+            status_code: Status da resposta (None se não houve resposta)
+            duration_seconds: Duração da tentativa
+            bytes_sent: Tamanho do corpo enviado
+            bytes_received: Tamanho do corpo recebido
+        """
+        endpoint = endpoint_name(method, url)
+        status = str(status_code) if status_code is not None else STATUS_ERROR
+        latency_ms = duration_seconds * 1000
+
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry['requests'] += 1
+            if status_code is None or status_code >= 400:
+                entry['errors'] += 1
+            entry['status_codes'][status] = entry['status_codes'].get(status, 0) + 1
+            entry['latency_ms_total'] += latency_ms
+            entry['latency_ms_max'] = max(entry['latency_ms_max'], latency_ms)
+            entry['latency_histogram'][bisect_left(self.latency_buckets_ms, latency_ms)] += 1
+            entry['bytes_sent'] += bytes_sent
+            entry['bytes_received'] += bytes_received
+
+        if self.export_to_airflow_stats:
+            self._emit(endpoint, status, latency_ms, bytes_sent, bytes_received)
+
+    def record_retry(self, method: str, url: str, reason: str) -> None:
+        """
+        Registra um reenvio
+
+        Args:
+            method: Método HTTP
+            url: URL chamada
+            reason: Motivo (throttled, http_502, timeout...)
+        """
+        endpoint = endpoint_name(method, url)
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry['retries'] += 1
+            entry['retries_by_reason'][reason] = entry['retries_by_reason'].get(reason, 0) + 1
+
+        if self.export_to_airflow_stats:
+            stats = _get_airflow_stats()
+            if stats is not None:
+                try:
+                    stats.incr(f"{self.stats_prefix}.{endpoint}.retries.{reason}")
+                except Exception as e:
+                    logger.debug(f"Falha ao emitir métrica de retry: {str(e)}")
+
+    def _emit(self, endpoint: str, status: str, latency_ms: float,
+              bytes_sent: int, bytes_received: int) -> None:
+        """Envia a requisição ao Stats do Airflow; falhas nunca afetam a chamada"""
+        stats = _get_airflow_stats()
+        if stats is None:
+            return
+        prefix = f"{self.stats_prefix}.{endpoint}"
+        try:
+            stats.incr(f"{prefix}.requests")
+            stats.incr(f"{prefix}.status.{status}")
+            stats.timing(f"{prefix}.latency", latency_ms)
+            if bytes_sent:
+                stats.incr(f"{prefix}.bytes_sent", count=bytes_sent)
+            if bytes_received:
+                stats.incr(f"{prefix}.bytes_received", count=bytes_received)
+        except Exception as e:
+            logger.debug(f"Falha ao emitir métricas: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Retorna as métricas acumuladas
+
+        Returns:
+            Dict[str, Dict]: endpoint -> requests, errors, status_codes, latência
+                (total, média, máxima e histograma "le_<ms>"), bytes e retries
+        """
+        labels = [f"le_{bucket:g}" for bucket in self.latency_buckets_ms] + ['le_inf']
+        with self._lock:
+            snapshot = {}
+            for endpoint, entry in self._endpoints.items():
+                requests_count = entry['requests']
+                snapshot[endpoint] = {
+                    'requests': requests_count,
+                    'errors': entry['errors'],
+                    'status_codes': dict(entry['status_codes']),
+                    'latency_ms_total': round(entry['latency_ms_total'], 3),
+                    'latency_ms_avg': round(entry['latency_ms_total'] / requests_count, 3) if requests_count else 0.0,
+                    'latency_ms_max': round(entry['latency_ms_max'], 3),
+                    'latency_histogram': dict(zip(labels, entry['latency_histogram'])),
+                    'bytes_sent': entry['bytes_sent'],
+                    'bytes_received': entry['bytes_received'],
+                    'retries': entry['retries'],
+                    'retries_by_reason': dict(entry['retries_by_reason'])
+                }
+            return snapshot
+
+    def reset(self) -> None:
+        """Zera as métricas acumuladas"""
+        with self._lock:
+            self._endpoints.clear()
+
+
+def stats_delta(before: Dict[str, Dict], after: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Diferença entre dois get_stats() do mesmo agregador
+
+    Isola as requisições de um trecho (ex.: um shard) quando o agregador é
+    compartilhado pelo processo. A latência máxima não pode ser subtraída e
+    fica de fora; o histograma da diferença mostra a faixa das mais lentas.
+
+    Args:
+        before: get_stats() no início do trecho
+        after: get_stats() no fim do trecho
+
+    Returns:
+        Dict[str, Dict]: endpoint -> mesmos campos de get_stats(), sem latency_ms_max,
+            só para endpoints com requisições no trecho
+    """
+    def subtract(current: Dict, previous: Dict) -> Dict:
+        return {key: value - previous.get(key, 0) for key, value in current.items()
+                if value - previous.get(key, 0)}
+
+    delta = {}
+    for endpoint, current in after.items():
+        previous = before.get(endpoint, {})
+        requests_count = current['requests'] - previous.get('requests', 0)
+        if requests_count <= 0:
+            continue
+
+        latency_ms_total = current['latency_ms_total'] - previous.get('latency_ms_total', 0.0)
+        delta[endpoint] = {
+            'requests': requests_count,
+            'errors': current['errors'] - previous.get('errors', 0),
+            'status_codes': subtract(current['status_codes'], previous.get('status_codes', {})),
+            'latency_ms_total': round(latency_ms_total, 3),
+            'latency_ms_avg': round(latency_ms_total / requests_count, 3),
+            'latency_histogram': {
+                label: count - previous.get('latency_histogram', {}).get(label, 0)
+                for label, count in current['latency_histogram'].items()
+            },
+            'bytes_sent': current['bytes_sent'] - previous.get('bytes_sent', 0),
+            'bytes_received': current['bytes_received'] - previous.get('bytes_received', 0),
+            'retries': current['retries'] - previous.get('retries', 0),
+            'retries_by_reason': subtract(current['retries_by_reason'], previous.get('retries_by_reason', {}))
+        }
+    return delta
+
+
+_shared_metrics: Optional[RequestMetrics] = None
+_shared_metrics_lock = threading.Lock()
+
+
+def get_shared_metrics() -> RequestMetrics:
+    """
+    Retorna o agregador de métricas compartilhado do processo
+
+    Returns:
+        RequestMetrics: Agregador configurado por METRICS_CONFIG
+    """
+    global _shared_metrics
+    with _shared_metrics_lock:
+        if _shared_metrics is None:
+            _shared_metrics = RequestMetrics()
+        return _shared_metrics
@@ -0,0 +1,100 @@
+"""
+Patch mínimo para a sincronização de work items existentes
+Compara os valores que seriam gravados com os campos atuais do work item e
+mantém só as operações que mudam algo; documentos sem diferença são descartados.
+"""
+
+import html
+import re
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from .transformer import DESCRIPTION_IMPORT_DATE_LABEL
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Campos escritos pela sincronização (PatchDocumentBuilder.build_update)
+MANAGED_FIELDS = (
+    'System.Title',
+    'System.Description',
+    'Microsoft.VSTS.Common.Priority',
+    'System.State',
+    'System.AreaPath'
+)
+
+_FIELD_PREFIX = '/fields/'
+
+# Data de importação muda a cada execução e não conta como diferença
+_IMPORT_DATE = re.compile(re.escape(DESCRIPTION_IMPORT_DATE_LABEL) + r'[^<]*</p>')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(field: str, value: Any) -> Optional[str]:
+    """Forma canônica de um valor para comparação"""
+    if value is None:
+        return None
+
+    if field == 'System.Description':
+        # O Azure DevOps reformata o HTML salvo (entidades e espaços)
+        value = html.unescape(_IMPORT_DATE.sub('', str(value)))
+        return _WHITESPACE.sub(' ', value).strip()
+
+    if field == 'System.AreaPath':
+        return str(value).strip().casefold()
+
+    return str(value).strip()
+
+
+def diff_patch_document(patch_document: List[Dict], current_fields: Dict[str, Any]) -> List[Dict]:
+    """
+    Reduz um patch document às operações que alteram o work item
+
+    Args:
+        patch_document: Operações que seriam enviadas
+        current_fields: Campos atuais do work item (resposta do workitemsbatch)
+
+    Returns:
+        List[Dict]: Operações com valor diferente do atual (vazio = nada a atualizar)
+    """
+    changed = []
+    for operation in patch_document:
+        path = operation.get('path', '')
+        if operation.get('op') != 'add' or not path.startswith(_FIELD_PREFIX):
+            changed.append(operation)
+            continue
+
+        field = path[len(_FIELD_PREFIX):]
+        if _normalize(field, operation.get('value')) != _normalize(field, current_fields.get(field)):
+            changed.append(operation)
+
+    return changed
+
+
+def minimize_updates(updates: List[Tuple[int, List[Dict]]],
+                     current_items: List[Dict]) -> List[Optional[List[Dict]]]:
+    """
+    Calcula o patch mínimo de cada atualização
+
+    Work items ausentes da leitura (removidos ou sem permissão) mantêm o
+    patch completo, para que o erro apareça no envio.
+
+    Args:
+        updates: (ID do work item, patch document completo)
+        current_items: Work items lidos (id, fields) projetados em MANAGED_FIELDS
+
+    Returns:
+        List[Optional[List[Dict]]]: Patch mínimo de cada atualização, na ordem de
+            entrada; None quando o work item já está igual
+    """
+    current_by_id = {item['id']: item.get('fields', {}) for item in current_items}
+
+    minimized: List[Optional[List[Dict]]] = []
+    for work_item_id, patch_document in updates:
+        current_fields = current_by_id.get(work_item_id)
+        if current_fields is None:
+            minimized.append(patch_document)
+            continue
+        minimized.append(diff_patch_document(patch_document, current_fields) or None)
+
+    return minimized
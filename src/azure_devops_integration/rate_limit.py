@@ -0,0 +1,229 @@
+"""
+Agendador de requisições com controle de taxa
+Token bucket com desaceleração adaptativa guiada pelos headers de rate limit do Azure DevOps
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+import logging
+
+from .config import RATE_LIMIT_CONFIG
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Status que indicam throttling e devem ser reenviados após a espera
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Converte o header Retry-After (segundos ou data HTTP) em segundos de espera
+
+    Args:
+        value: Valor do header
+
+    Returns:
+        Optional[float]: Segundos a aguardar ou None se ausente/inválido
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """
+    Token bucket compartilhado por todas as chamadas de um cliente
+
+    A taxa cai quando o Azure DevOps sinaliza atraso (X-RateLimit-Delay) ou
+    poucas requisições restantes (X-RateLimit-Remaining), e volta gradualmente
+    ao valor configurado em respostas limpas. Respostas 429/503 bloqueiam novas
+    requisições até o fim do Retry-After.
+    """
+
+    def __init__(self, rate_per_second: float = None, burst: int = None, min_rate_per_second: float = None,
+                 slowdown_factor: float = None, recovery_step: float = None,
+                 remaining_threshold: int = None, default_retry_after: float = None):
+        """
+        Inicializa o agendador
+
+        Args:
+            rate_per_second: Taxa nominal de requisições por segundo (opcional)
+            burst: Capacidade do bucket (opcional)
+            min_rate_per_second: Taxa mínima durante desaceleração (opcional)
+            slowdown_factor: Fator aplicado à taxa a cada sinal de throttling (opcional)
+            recovery_step: Fração da taxa nominal recuperada por resposta limpa (opcional)
+            remaining_threshold: X-RateLimit-Remaining abaixo do qual a taxa é reduzida (opcional)
+            default_retry_after: Espera quando 429/503 chega sem Retry-After (opcional)
+        """
+        config = RATE_LIMIT_CONFIG
+        self.base_rate = rate_per_second or config['rate_per_second']
+        self.burst = burst or config['burst']
+        self.min_rate = min_rate_per_second or config['min_rate_per_second']
+        self.slowdown_factor = slowdown_factor or config['slowdown_factor']
+        self.recovery_step = recovery_step or config['recovery_step']
+        self.remaining_threshold = (remaining_threshold if remaining_threshold is not None
+                                    else config['remaining_threshold'])
+        self.default_retry_after = default_retry_after or config['default_retry_after']
+
+        self.rate = self.base_rate
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # Contadores para monitoramento
+        self._requests_scheduled = 0
+        self._requests_deferred = 0
+        self._total_wait_seconds = 0.0
+        self._delays_applied = 0
+        self._throttled_responses = 0
+
+    def reserve(self) -> float:
+        """
+        Reserva um token e retorna quanto tempo o chamador deve aguardar
+
+        Não bloqueia: permite uso tanto por threads (time.sleep) quanto por
+        corrotinas (asyncio.sleep).
+
+        Returns:
+            float: Segundos de espera antes de enviar a requisição
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            wait = max(wait, self._blocked_until - now)
+
+            self._requests_scheduled += 1
+            if wait > 0:
+                self._requests_deferred += 1
+                self._total_wait_seconds += wait
+
+            return wait
+
+    def acquire(self) -> None:
+        """Aguarda (bloqueando a thread) até poder enviar a próxima requisição"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Ajusta a taxa a partir da resposta recebida
+
+        Args:
+            status_code: Status HTTP da resposta
+            headers: Headers da resposta
+
+        Returns:
+            Optional[float]: Segundos até o reenvio se a resposta foi throttling, senão None
+        """
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+        delay = _parse_float(headers.get('X-RateLimit-Delay'))
+        remaining = _parse_float(headers.get('X-RateLimit-Remaining'))
+
+        with self._lock:
+            throttled = status_code in THROTTLE_STATUS_CODES
+            slow_down = throttled or bool(delay) or (
+                remaining is not None and remaining < self.remaining_threshold)
+
+            if slow_down:
+                self.rate = max(self.min_rate, self.rate * self.slowdown_factor)
+                self._delays_applied += 1
+            elif self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * self.recovery_step)
+
+            pause = retry_after
+            if pause is None and throttled:
+                pause = self.default_retry_after
+            if pause:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+
+            if throttled:
+                self._throttled_responses += 1
+
+            current_rate = self.rate
+
+        if slow_down:
+            logger.warning(
+                f"Rate limit Azure DevOps: status {status_code}, Retry-After={retry_after}, "
+                f"Delay={delay}, Remaining={remaining}; taxa ajustada para {current_rate:.2f} req/s")
+
+        return pause if throttled else None
+
+    def get_state(self) -> Dict:
+        """
+        Retorna o estado atual para monitoramento
+
+        Returns:
+            Dict: Tokens disponíveis, taxa atual e contadores acumulados
+        """
+        with self._lock:
+            now = time.monotonic()
+            tokens = min(float(self.burst), self._tokens + (now - self._last_refill) * self.rate)
+            return {
+                'tokens': round(tokens, 3),
+                'rate_per_second': round(self.rate, 3),
+                'base_rate_per_second': self.base_rate,
+                'blocked_for_seconds': round(max(0.0, self._blocked_until - now), 3),
+                'requests_scheduled': self._requests_scheduled,
+                'requests_deferred': self._requests_deferred,
+                'total_wait_seconds': round(self._total_wait_seconds, 3),
+                'delays_applied': self._delays_applied,
+                'throttled_responses': self._throttled_responses
+            }
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    """Converte um header numérico, ignorando valores inválidos"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+_shared_schedulers: Dict[str, RequestScheduler] = {}
+_shared_schedulers_lock = threading.Lock()
+
+
+def get_shared_scheduler(organization: str) -> RequestScheduler:
+    """
+    Retorna o agendador compartilhado do processo para a organização
+
+    Os limites do Azure DevOps valem por identidade/organização, então todos
+    os clientes do mesmo worker devem dividir o mesmo bucket.
+
+    Args:
+        organization: Nome da organização
+
+    Returns:
+        RequestScheduler: Agendador configurado por RATE_LIMIT_CONFIG
+    """
+    with _shared_schedulers_lock:
+        scheduler = _shared_schedulers.get(organization)
+        if scheduler is None:
+            scheduler = RequestScheduler()
+            _shared_schedulers[organization] = scheduler
+        return scheduler
@@ -0,0 +1,154 @@
+"""
+Política de retry por requisição
+Backoff exponencial com jitter, prazo total por lote e contadores de retries
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Iterable
+import logging
+
+from .config import RETRY_CONFIG
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Métodos HTTP que podem ser reenviados sem risco de efeito duplicado
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+# Tipos de falha de rede reconhecidos pela política
+ERROR_CONNECT = 'connect'          # Conexão não estabelecida: a requisição não saiu
+ERROR_CONNECTION = 'connection'    # Conexão resetada/interrompida durante a troca
+ERROR_TIMEOUT = 'timeout'          # Timeout de leitura: o servidor pode ter processado
+
+
+class DeadlineExceeded(Exception):
+    """O prazo total do lote terminou antes da requisição"""
+
+
+class Deadline:
+    """Prazo total compartilhado pelas requisições de um lote"""
+
+    def __init__(self, budget_seconds: float):
+        """
+        Inicializa o prazo
+
+        Args:
+            budget_seconds: Segundos disponíveis a partir de agora
+        """
+        self.budget_seconds = budget_seconds
+        self.expires_at = time.monotonic() + budget_seconds
+
+    def remaining(self) -> float:
+        """Segundos restantes (nunca negativo)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Se o prazo já terminou"""
+        return time.monotonic() >= self.expires_at
+
+
+class RetryPolicy:
+    """
+    Decide quando reenviar uma requisição e quanto esperar
+
+    Requisições idempotentes (GET e leituras como WIQL) são reenviadas após
+    resets de conexão, timeouts e 5xx. Criações só são reenviadas quando há
+    garantia de que o servidor não processou o pedido: falha ao conectar.
+    Um 502/504 só diz que o gateway desistiu de esperar; o backend pode ter
+    criado os itens, então por padrão não há reenvio por status
+    (unsafe_retry_status_codes vazio). A recuperação dessas falhas fica com o
+    journal de criação, que confere os tickets em dúvida antes de recriar.
+    Throttling (429/503) é tratado pelo RequestScheduler.
+    """
+
+    def __init__(self, max_retries: int = None, backoff_base: float = None, backoff_max: float = None,
+                 jitter: bool = None, retry_status_codes: Iterable[int] = None,
+                 unsafe_retry_status_codes: Iterable[int] = None):
+        """
+        Inicializa a política
+
+        Args:
+            max_retries: Reenvios por requisição (opcional)
+            backoff_base: Espera base em segundos do backoff exponencial (opcional)
+            backoff_max: Espera máxima entre tentativas (opcional)
+            jitter: Aplica full jitter às esperas (opcional)
+            retry_status_codes: Status reenviados em requisições idempotentes (opcional)
+            unsafe_retry_status_codes: Status reenviados em criações (opcional; só
+                status em que o servidor comprovadamente não processou o pedido)
+        """
+        config = RETRY_CONFIG
+        self.max_retries = max_retries if max_retries is not None else config['max_retries']
+        self.backoff_base = backoff_base or config['backoff_base']
+        self.backoff_max = backoff_max or config['backoff_max']
+        self.jitter = jitter if jitter is not None else config['jitter']
+        self.retry_status_codes = frozenset(
+            retry_status_codes if retry_status_codes is not None else config['retry_status_codes'])
+        self.unsafe_retry_status_codes = frozenset(
+            unsafe_retry_status_codes if unsafe_retry_status_codes is not None
+            else config['unsafe_retry_status_codes'])
+
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def should_retry(self, attempt: int, idempotent: bool, status_code: int = None,
+                     error_kind: str = None) -> bool:
+        """
+        Indica se a tentativa que falhou deve ser reenviada
+
+        Args:
+            attempt: Número de reenvios já realizados
+            idempotent: Se a requisição pode ser repetida sem efeito duplicado
+            status_code: Status HTTP recebido (quando houve resposta)
+            error_kind: Tipo de falha de rede (ERROR_CONNECT, ERROR_CONNECTION, ERROR_TIMEOUT)
+
+        Returns:
+            bool: True se deve reenviar
+        """
+        if attempt >= self.max_retries:
+            return False
+
+        if error_kind is not None:
+            return idempotent or error_kind == ERROR_CONNECT
+
+        if status_code is not None:
+            if idempotent:
+                return status_code in self.retry_status_codes
+            return status_code in self.unsafe_retry_status_codes
+
+        return False
+
+    def compute_delay(self, attempt: int) -> float:
+        """
+        Espera antes do próximo reenvio (backoff exponencial com full jitter)
+
+        Args:
+            attempt: Número de reenvios já realizados
+
+        Returns:
+            float: Segundos de espera
+        """
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def record_retry(self, reason: str) -> None:
+        """Contabiliza um reenvio pelo motivo informado"""
+        with self._lock:
+            self._counters[reason] = self._counters.get(reason, 0) + 1
+
+    def get_stats(self) -> Dict:
+        """
+        Retorna os contadores de reenvios
+
+        Returns:
+            Dict: Total de retries e quebra por motivo
+        """
+        with self._lock:
+            return {
+                'retries_total': sum(self._counters.values()),
+                'retries_by_reason': dict(self._counters)
+            }
+
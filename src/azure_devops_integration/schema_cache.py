@@ -0,0 +1,195 @@
+"""
+Cache de schemas de tipos de work item
+Evita baixar a definição completa do tipo a cada ticket processado
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+import logging
+
+from .config import SCHEMA_CACHE_CONFIG
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+SchemaKey = Tuple[str, str, str]
+
+
+class WorkItemTypeSchemaCache:
+    """Cache de campos por (organização, projeto, tipo de work item) com expiração"""
+
+    def __init__(self, ttl_seconds: float = None, persist_path: str = None):
+        """
+        Inicializa o cache
+
+        Args:
+            ttl_seconds: Tempo de vida de cada entrada em segundos (opcional)
+            persist_path: Arquivo JSON para persistir o cache entre processos (opcional)
+        """
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else SCHEMA_CACHE_CONFIG['ttl_seconds']
+        self.persist_path = persist_path if persist_path is not None else SCHEMA_CACHE_CONFIG['persist_path']
+
+        # (org, projeto, tipo) -> (conjunto de referenceNames, timestamp da carga)
+        self._entries: Dict[SchemaKey, Tuple[FrozenSet[str], float]] = {}
+        self._lock = threading.Lock()
+
+        if self.persist_path:
+            self._load()
+
+    def get_fields(self, organization: str, project: str, work_item_type: str) -> Optional[FrozenSet[str]]:
+        """
+        Retorna os campos do tipo se estiverem em cache e válidos
+
+        Args:
+            organization: Nome da organização
+            project: Nome do projeto
+            work_item_type: Nome do tipo de work item
+
+        Returns:
+            Optional[FrozenSet[str]]: Conjunto de referenceNames ou None se ausente/expirado
+        """
+        key = (organization, project, work_item_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            fields, loaded_at = entry
+            if time.time() - loaded_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+
+            return fields
+
+    def set_fields(self, organization: str, project: str, work_item_type: str,
+                   fields: Iterable[str]) -> FrozenSet[str]:
+        """
+        Armazena os campos de um tipo de work item
+
+        Args:
+            organization: Nome da organização
+            project: Nome do projeto
+            work_item_type: Nome do tipo de work item
+            fields: referenceNames dos campos do tipo
+
+        Returns:
+            FrozenSet[str]: Índice de campos armazenado
+        """
+        field_index = frozenset(fields)
+        with self._lock:
+            self._entries[(organization, project, work_item_type)] = (
+                field_index, time.time())
+
+        if self.persist_path:
+            self._save()
+
+        return field_index
+
+    def has_field(self, organization: str, project: str, work_item_type: str,
+                  field_reference_name: str) -> Optional[bool]:
+        """
+        Verifica em O(1) se o campo existe no tipo em cache
+
+        Returns:
+            Optional[bool]: True/False, ou None se o tipo não estiver em cache
+        """
+        fields = self.get_fields(organization, project, work_item_type)
+        if fields is None:
+            return None
+        return field_reference_name in fields
+
+    def invalidate(self, organization: str = None, project: str = None,
+                   work_item_type: str = None) -> int:
+        """
+        Remove entradas do cache; filtros omitidos casam com qualquer valor
+
+        Args:
+            organization: Filtra pela organização (opcional)
+            project: Filtra pelo projeto (opcional)
+            work_item_type: Filtra pelo tipo de work item (opcional)
+
+        Returns:
+            int: Quantidade de entradas removidas
+        """
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if (organization is None or key[0] == organization)
+                and (project is None or key[1] == project)
+                and (work_item_type is None or key[2] == work_item_type)
+            ]
+            for key in keys:
+                del self._entries[key]
+
+        if keys and self.persist_path:
+            self._save()
+
+        return len(keys)
+
+    def _load(self) -> None:
+        """Carrega entradas ainda válidas do arquivo de persistência"""
+        if not os.path.exists(self.persist_path):
+            return
+
+        try:
+            with open(self.persist_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            now = time.time()
+            with self._lock:
+                for item in data.get('entries', []):
+                    if now - item['loaded_at'] <= self.ttl_seconds:
+                        key = (item['organization'], item['project'], item['work_item_type'])
+                        self._entries[key] = (frozenset(item['fields']), item['loaded_at'])
+
+            logger.info(f"Cache de schemas carregado: {len(self._entries)} tipos")
+
+        except Exception as e:
+            logger.warning(f"Erro ao carregar cache de schemas: {str(e)}")
+
+    def _save(self) -> None:
+        """Grava o cache de forma atômica (arquivo temporário + rename)"""
+        with self._lock:
+            entries = [
+                {
+                    'organization': key[0],
+                    'project': key[1],
+                    'work_item_type': key[2],
+                    'fields': sorted(fields),
+                    'loaded_at': loaded_at
+                }
+                for key, (fields, loaded_at) in self._entries.items()
+            ]
+
+        try:
+            directory = os.path.dirname(os.path.abspath(self.persist_path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'entries': entries}, f)
+            os.replace(tmp_path, self.persist_path)
+
+        except Exception as e:
+            logger.warning(f"Erro ao persistir cache de schemas: {str(e)}")
+
+
+_shared_cache: Optional[WorkItemTypeSchemaCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_schema_cache() -> WorkItemTypeSchemaCache:
+    """
+    Retorna o cache de schemas compartilhado do processo
+
+    Returns:
+        WorkItemTypeSchemaCache: Cache configurado por SCHEMA_CACHE_CONFIG
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = WorkItemTypeSchemaCache()
+        return _shared_cache
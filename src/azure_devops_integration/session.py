@@ -0,0 +1,116 @@
+"""
+Camada de sessão HTTP com pool de conexões keep-alive
+Compartilhada entre clientes (e tasks do Airflow) no mesmo processo worker
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import HTTP_CONFIG
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Sessões compartilhadas por processo, indexadas pela configuração do pool
+_shared_sessions: Dict[Tuple, requests.Session] = {}
+_shared_sessions_lock = threading.Lock()
+
+
+def resolve_http_config(http_config: Optional[Dict] = None) -> Dict:
+    """
+    Combina a configuração informada com os valores padrão de HTTP_CONFIG
+
+    Args:
+        http_config: Valores que sobrescrevem HTTP_CONFIG (opcional)
+
+    Returns:
+        Dict: Configuração HTTP completa
+    """
+    config = dict(HTTP_CONFIG)
+    if http_config:
+        config.update(http_config)
+    return config
+
+
+def build_timeout(http_config: Optional[Dict] = None) -> Tuple[float, float]:
+    """
+    Monta o timeout separado (conexão, leitura) aceito pelo requests
+
+    Args:
+        http_config: Configuração HTTP (opcional)
+
+    Returns:
+        Tuple[float, float]: (connect_timeout, read_timeout)
+    """
+    config = resolve_http_config(http_config)
+    return config['connect_timeout'], config['read_timeout']
+
+
+def create_session(http_config: Optional[Dict] = None) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pool de conexões dimensionado pela configuração
+
+    Args:
+        http_config: Configuração HTTP (opcional)
+
+    Returns:
+        requests.Session: Sessão pronta para uso
+    """
+    config = resolve_http_config(http_config)
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config['pool_connections'],
+        pool_maxsize=config['pool_maxsize'],
+        pool_block=config['pool_block']
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    if not config['keep_alive']:
+        session.headers['Connection'] = 'close'
+
+    return session
+
+
+def get_shared_session(http_config: Optional[Dict] = None) -> requests.Session:
+    """
+    Retorna a sessão compartilhada do processo para a configuração informada
+
+    Clientes criados em tasks diferentes do mesmo worker reaproveitam as
+    conexões já abertas, evitando um novo handshake TCP + TLS por chamada.
+
+    Args:
+        http_config: Configuração HTTP (opcional)
+
+    Returns:
+        requests.Session: Sessão compartilhada
+    """
+    config = resolve_http_config(http_config)
+    key = (
+        config['pool_connections'],
+        config['pool_maxsize'],
+        config['pool_block'],
+        config['keep_alive']
+    )
+
+    with _shared_sessions_lock:
+        session = _shared_sessions.get(key)
+        if session is None:
+            session = create_session(config)
+            _shared_sessions[key] = session
+            logger.info(
+                f"Pool HTTP criado: {config['pool_maxsize']} conexões por host")
+        return session
+
+
+def close_shared_sessions() -> None:
+    """Fecha todas as sessões compartilhadas do processo"""
+    with _shared_sessions_lock:
+        for session in _shared_sessions.values():
+            session.close()
+        _shared_sessions.clear()
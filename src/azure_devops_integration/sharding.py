@@ -0,0 +1,132 @@
+"""
+Particionamento dos tickets em shards para criação paralela
+Hash estável do ID do ticket, para que o retry de um shard refaça sempre os mesmos tickets
+"""
+
+import math
+import zlib
+from typing import Dict, List, Optional
+import logging
+
+from .config import SHARDING_CONFIG
+from .staging import StageWriter, iter_stage, write_stage
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+def shard_for(ticket_id, shard_count: int) -> int:
+    """
+    Shard de um ticket (crc32 do ID, estável entre processos)
+
+    Args:
+        ticket_id: ID do ticket
+        shard_count: Quantidade de shards
+
+    Returns:
+        int: Índice do shard, de 0 a shard_count - 1
+    """
+    return zlib.crc32(str(ticket_id).encode('utf-8')) % shard_count
+
+
+def plan_shard_count(rows: int, shard_count: int = None, shard_size: int = None,
+                     max_shards: int = None) -> int:
+    """
+    Define quantos shards usar para um lote
+
+    Args:
+        rows: Quantidade de tickets
+        shard_count: Número fixo de shards (opcional, padrão: SHARDING_CONFIG)
+        shard_size: Tickets por shard desejados (opcional, padrão: SHARDING_CONFIG)
+        max_shards: Teto de shards (opcional, padrão: SHARDING_CONFIG)
+
+    Returns:
+        int: Quantidade de shards (0 se não há tickets)
+    """
+    if rows <= 0:
+        return 0
+
+    shard_count = shard_count or SHARDING_CONFIG['shard_count']
+    if shard_count:
+        return min(shard_count, rows)
+
+    shard_size = shard_size or SHARDING_CONFIG['shard_size']
+    max_shards = max_shards or SHARDING_CONFIG['max_shards']
+    return max(1, min(max_shards, math.ceil(rows / shard_size)))
+
+
+def write_shards(manifest: Optional[Dict], run_dir: str, stage: str = 'new',
+                 shard_count: int = None) -> List[Dict]:
+    """
+    Distribui os tickets de uma etapa em arquivos de staging por shard
+
+    Args:
+        manifest: Manifesto da etapa de origem
+        run_dir: Diretório da execução
+        stage: Prefixo dos arquivos de shard (opcional)
+        shard_count: Número fixo de shards (opcional)
+
+    Returns:
+        List[Dict]: Manifestos dos shards não vazios, em ordem de índice
+    """
+    rows = manifest['rows'] if manifest else 0
+    count = plan_shard_count(rows, shard_count=shard_count)
+    if not count:
+        return []
+
+    writers = [StageWriter(run_dir, f"{stage}_shard_{index:03d}") for index in range(count)]
+    try:
+        for chunk in iter_stage(manifest):
+            buckets: List[List[Dict]] = [[] for _ in range(count)]
+            for ticket in chunk:
+                buckets[shard_for(ticket.get('id'), count)].append(ticket)
+            for writer, bucket in zip(writers, buckets):
+                writer.write(bucket)
+    except Exception:
+        for writer in writers:
+            writer.discard()
+        raise
+
+    manifests = [writer.close() for writer in writers]
+    logger.info(
+        f"{rows} tickets distribuídos em {count} shards: "
+        f"{[shard['rows'] for shard in manifests]}")
+
+    return [shard for shard in manifests if shard['rows']]
+
+
+def merge_shard_results(results: List[Optional[Dict]], run_dir: str) -> Dict:
+    """
+    Junta os resultados das tasks de shard
+
+    Args:
+        results: Retorno de cada shard (shard_index, created_ids, failed_manifest,
+            processed_manifest)
+        run_dir: Diretório da execução, onde o staging 'failed' consolidado é gravado
+
+    Returns:
+        Dict: created_ids, failed_ids e failed_manifest consolidados, e os
+            processed_manifests dos shards
+    """
+    ordered = sorted((result for result in results if result), key=lambda result: result['shard_index'])
+
+    created_ids: List[int] = []
+    failed_tickets: List[Dict] = []
+    for result in ordered:
+        created_ids.extend(result['created_ids'])
+        for chunk in iter_stage(result['failed_manifest']):
+            failed_tickets.extend(chunk)
+
+    failed_manifest = write_stage(run_dir, 'failed', failed_tickets)
+
+    logger.info(
+        f"Resultado de {len(ordered)} shards: {len(created_ids)} criados, "
+        f"{failed_manifest['rows']} falhas")
+
+    return {
+        'created_ids': created_ids,
+        'failed_ids': [ticket.get('id') for ticket in failed_tickets],
+        'failed_manifest': failed_manifest,
+        'processed_manifests': [result['processed_manifest'] for result in ordered
+                                if result.get('processed_manifest')]
+    }
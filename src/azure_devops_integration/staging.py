@@ -0,0 +1,216 @@
+"""
+Área de staging em arquivo para os tickets de cada etapa da DAG
+Grava JSONL comprimido por execução e passa só um manifesto pequeno pela XCom
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from typing import Dict, Iterable, Iterator, List, Optional
+import logging
+
+from .config import STAGING_CONFIG
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Formato gravado no manifesto (permite trocar o formato sem quebrar leitores antigos)
+STAGE_FORMAT = 'jsonl.gz'
+
+_UNSAFE_PATH_CHARS = re.compile(r'[^A-Za-z0-9_.-]')
+
+
+class StagingChecksumError(Exception):
+    """O arquivo de staging não confere com o checksum do manifesto"""
+
+
+def build_run_dir(dag_id: str, run_id: str, base_dir: str = None) -> str:
+    """
+    Monta o diretório de staging de uma execução da DAG
+
+    Args:
+        dag_id: ID da DAG
+        run_id: ID da execução (ex.: scheduled__2025-08-28T06:00:00+00:00)
+        base_dir: Diretório raiz (opcional, padrão: STAGING_CONFIG['base_dir'])
+
+    Returns:
+        str: Caminho do diretório da execução
+    """
+    return os.path.join(
+        base_dir or STAGING_CONFIG['base_dir'],
+        _UNSAFE_PATH_CHARS.sub('_', dag_id),
+        _UNSAFE_PATH_CHARS.sub('_', run_id)
+    )
+
+
+class StageWriter:
+    """
+    Grava os tickets de uma etapa em blocos
+
+    O arquivo é escrito com sufixo temporário e renomeado no close(), então
+    um retry da task nunca lê um arquivo pela metade.
+    """
+
+    def __init__(self, run_dir: str, stage: str):
+        """
+        Abre o arquivo da etapa para escrita
+
+        Args:
+            run_dir: Diretório da execução (build_run_dir)
+            stage: Nome da etapa (ex.: 'pending', 'new', 'failed')
+        """
+        os.makedirs(run_dir, exist_ok=True)
+        self.stage = stage
+        self.path = os.path.join(run_dir, f"{stage}.{STAGE_FORMAT}")
+        self._tmp_path = f"{self.path}.tmp"
+        self._file = gzip.open(
+            self._tmp_path, 'wt', encoding='utf-8',
+            compresslevel=STAGING_CONFIG['compress_level'])
+        self.rows = 0
+        self._manifest: Optional[Dict] = None
+
+    def write(self, tickets: Iterable[Dict]) -> None:
+        """
+        Acrescenta tickets ao arquivo
+
+        Args:
+            tickets: Tickets a gravar
+        """
+        for ticket in tickets:
+            self._file.write(json.dumps(ticket, ensure_ascii=False, separators=(',', ':'), default=str))
+            self._file.write('\n')
+            self.rows += 1
+
+    def close(self) -> Dict:
+        """
+        Finaliza o arquivo e retorna o manifesto
+
+        Returns:
+            Dict: Manifesto com path, stage, format, rows e sha256
+        """
+        if self._manifest is None:
+            self._file.close()
+            os.replace(self._tmp_path, self.path)
+            self._manifest = {
+                'path': self.path,
+                'stage': self.stage,
+                'format': STAGE_FORMAT,
+                'rows': self.rows,
+                'sha256': _file_sha256(self.path)
+            }
+            logger.info(f"Staging '{self.stage}': {self.rows} tickets gravados em {self.path}")
+        return self._manifest
+
+    def discard(self) -> None:
+        """Abandona a escrita e remove o arquivo temporário"""
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self) -> 'StageWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Falha no meio da escrita: nada é publicado
+            self.discard()
+
+
+def write_stage(run_dir: str, stage: str, tickets: Iterable[Dict]) -> Dict:
+    """
+    Grava todos os tickets de uma etapa
+
+    Args:
+        run_dir: Diretório da execução
+        stage: Nome da etapa
+        tickets: Tickets a gravar
+
+    Returns:
+        Dict: Manifesto do arquivo gravado
+    """
+    with StageWriter(run_dir, stage) as writer:
+        writer.write(tickets)
+    return writer.close()
+
+
+def iter_stage(manifest: Optional[Dict], chunk_size: int = None,
+               verify: bool = True) -> Iterator[List[Dict]]:
+    """
+    Lê os tickets de uma etapa em blocos
+
+    Args:
+        manifest: Manifesto retornado pela escrita (None equivale a etapa vazia)
+        chunk_size: Tickets por bloco (opcional, padrão: STAGING_CONFIG['read_chunk_size'])
+        verify: Confere o sha256 antes de ler (opcional)
+
+    Yields:
+        List[Dict]: Bloco de tickets
+
+    Raises:
+        StagingChecksumError: Se o arquivo não confere com o manifesto
+    """
+    if not manifest or not manifest.get('rows'):
+        return
+
+    if manifest.get('format') != STAGE_FORMAT:
+        raise ValueError(f"Formato de staging não suportado: {manifest.get('format')}")
+
+    path = manifest['path']
+    if verify and _file_sha256(path) != manifest['sha256']:
+        raise StagingChecksumError(f"Checksum não confere para {path}")
+
+    chunk_size = chunk_size or STAGING_CONFIG['read_chunk_size']
+    chunk: List[Dict] = []
+
+    with gzip.open(path, 'rt', encoding='utf-8') as stage_file:
+        for line in stage_file:
+            chunk.append(json.loads(line))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def read_stage(manifest: Optional[Dict], verify: bool = True) -> List[Dict]:
+    """
+    Lê todos os tickets de uma etapa
+
+    Args:
+        manifest: Manifesto retornado pela escrita
+        verify: Confere o sha256 antes de ler (opcional)
+
+    Returns:
+        List[Dict]: Tickets da etapa
+    """
+    tickets: List[Dict] = []
+    for chunk in iter_stage(manifest, verify=verify):
+        tickets.extend(chunk)
+    return tickets
+
+
+def remove_run_dir(run_dir: str) -> None:
+    """
+    Remove os arquivos de staging de uma execução
+
+    Args:
+        run_dir: Diretório da execução
+    """
+    if os.path.isdir(run_dir):
+        shutil.rmtree(run_dir)
+        logger.info(f"Staging removido: {run_dir}")
+
+
+def _file_sha256(path: str) -> str:
+    """Calcula o sha256 do arquivo em blocos de 1 MB"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as stage_file:
+        for block in iter(lambda: stage_file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,159 @@
+"""
+Índice local persistente ticket do Fusion -> work item (SQLite)
+Torna a verificação de duplicatas uma consulta local indexada
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+import logging
+
+from .config import TICKET_INDEX_CONFIG
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Limite conservador de parâmetros por consulta no SQLite
+_MAX_SQL_PARAMS = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticket_work_items (
+    ticket_id TEXT PRIMARY KEY,
+    work_item_id INTEGER NOT NULL,
+    changed_date TEXT,
+    recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS index_metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class TicketIndex:
+    """Mapa persistente de IDs de chamados do Fusion para IDs de work items"""
+
+    def __init__(self, path: str = None):
+        """
+        Abre (ou cria) o índice
+
+        Args:
+            path: Arquivo SQLite (opcional, padrão: TICKET_INDEX_CONFIG['path'])
+        """
+        self.path = path or TICKET_INDEX_CONFIG['path']
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        # Uma conexão compartilhada entre as threads do lote, protegida por lock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, timeout=30)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(_SCHEMA)
+        self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM ticket_work_items').fetchone()[0]
+
+    def close(self) -> None:
+        """Fecha a conexão com o arquivo"""
+        with self._lock:
+            self._connection.close()
+
+    def get_many(self, ticket_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Busca os work items já conhecidos para os tickets informados
+
+        Args:
+            ticket_ids: IDs dos tickets do Fusion
+
+        Returns:
+            Dict[str, int]: ID do ticket -> ID do work item (apenas os encontrados)
+        """
+        ids = list(dict.fromkeys(str(ticket_id) for ticket_id in ticket_ids if ticket_id))
+        found: Dict[str, int] = {}
+
+        with self._lock:
+            for start in range(0, len(ids), _MAX_SQL_PARAMS):
+                chunk = ids[start:start + _MAX_SQL_PARAMS]
+                placeholders = ', '.join('?' * len(chunk))
+                rows = self._connection.execute(
+                    f'SELECT ticket_id, work_item_id FROM ticket_work_items '
+                    f'WHERE ticket_id IN ({placeholders})', chunk)
+                found.update(rows)
+
+        return found
+
+    def record(self, ticket_id: str, work_item_id: int, changed_date: str = None) -> None:
+        """
+        Registra (ou atualiza) o work item de um ticket
+
+        Args:
+            ticket_id: ID do ticket do Fusion
+            work_item_id: ID do work item no Azure DevOps
+            changed_date: System.ChangedDate do work item (opcional)
+        """
+        self.record_many([(ticket_id, work_item_id, changed_date)])
+
+    def record_many(self, rows: Iterable[Tuple[str, int, Optional[str]]]) -> int:
+        """
+        Registra vários mapeamentos em uma única transação
+
+        Args:
+            rows: Tuplas (ticket_id, work_item_id, changed_date)
+
+        Returns:
+            int: Quantidade de linhas gravadas
+        """
+        recorded_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        params = [
+            (str(ticket_id), int(work_item_id), changed_date, recorded_at)
+            for ticket_id, work_item_id, changed_date in rows
+        ]
+        if not params:
+            return 0
+
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    'INSERT INTO ticket_work_items (ticket_id, work_item_id, changed_date, recorded_at) '
+                    'VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT(ticket_id) DO UPDATE SET '
+                    'work_item_id = excluded.work_item_id, '
+                    'changed_date = COALESCE(excluded.changed_date, ticket_work_items.changed_date), '
+                    'recorded_at = excluded.recorded_at',
+                    params)
+
+        return len(params)
+
+    def get_watermark(self) -> Optional[str]:
+        """
+        Retorna o maior System.ChangedDate já reconciliado com o Azure DevOps
+
+        Returns:
+            Optional[str]: Data ISO 8601 ou None se nunca reconciliado
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM index_metadata WHERE key = 'changed_date_watermark'").fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, changed_date: str) -> None:
+        """
+        Avança a marca d'água de reconciliação
+
+        Args:
+            changed_date: Maior System.ChangedDate processado (ISO 8601)
+        """
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT INTO index_metadata (key, value) VALUES ('changed_date_watermark', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (changed_date,))
@@ -0,0 +1,207 @@
+"""
+Transformação de tickets do Fusion em patch documents do Azure DevOps
+Pré-calcula por execução o que não depende do ticket: mapeamentos, operações fixas e descrição
+"""
+
+import html
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Tuple
+import logging
+
+from .config import CATEGORY_TO_WORKITEM_MAPPING, FUSION_STATUS_TO_STATE, INITIAL_STATES, PRIORITY_MAPPING
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Campo personalizado com o ID do chamado de origem
+FUSION_ID_FIELD = 'Custom.IDChamadoFusion'
+
+# Distingue "chave ausente" de "chave com valor None" (os padrões diferem em cada caso)
+_MISSING = object()
+
+# Marcadores da seção de integração da descrição (a data muda a cada execução)
+DESCRIPTION_INTEGRATION_HEADER = "<h3>🤖 Informações de Integração</h3>"
+DESCRIPTION_IMPORT_DATE_LABEL = "<p><strong>Data de Importação:</strong> "
+
+
+class _Skeleton:
+    """Partes pré-calculadas para uma combinação (categoria, prioridade)"""
+
+    __slots__ = ('work_item_type', 'fixed_operations', 'include_fusion_id',
+                 'description_head', 'description_tail')
+
+    def __init__(self, work_item_type: str, fixed_operations: Tuple[Dict, ...],
+                 include_fusion_id: bool, description_head: str, description_tail: str):
+        self.work_item_type = work_item_type
+        self.fixed_operations = fixed_operations
+        self.include_fusion_id = include_fusion_id
+        self.description_head = description_head
+        self.description_tail = description_tail
+
+
+class PatchDocumentBuilder:
+    """
+    Monta os patch documents de criação de um lote de tickets
+
+    Para cada (categoria, prioridade) o tipo de work item, o estado inicial,
+    a prioridade, a área e os trechos fixos da descrição são calculados uma
+    única vez; por ticket restam o título, os campos livres da descrição e o
+    ID do Fusion. As operações fixas são compartilhadas entre documentos e
+    não devem ser alteradas.
+    """
+
+    def __init__(self, area_path: str, has_fusion_field: Callable[[str], bool],
+                 run_timestamp: datetime = None):
+        """
+        Inicializa o builder
+
+        Args:
+            area_path: Área completa de destino (projeto\\área)
+            has_fusion_field: Indica se o tipo de work item tem o campo Custom.IDChamadoFusion
+            run_timestamp: Data de importação gravada na descrição (opcional, padrão: agora)
+        """
+        self.area_path = area_path
+        self.has_fusion_field = has_fusion_field
+        self.run_timestamp = run_timestamp or datetime.now()
+
+        self._integration_section = (
+            f"\n{DESCRIPTION_INTEGRATION_HEADER}\n"
+            f"<p><strong>Importado via:</strong> Airflow + Fusion Integration</p>\n"
+            f"{DESCRIPTION_IMPORT_DATE_LABEL}{self.run_timestamp.strftime('%Y-%m-%d %H:%M:%S')}</p>\n"
+            f"<p><strong>Área de Destino:</strong> {html.escape(area_path)}</p>\n"
+        )
+        self._area_operation = {"op": "add", "path": "/fields/System.AreaPath", "value": area_path}
+        self._fusion_field_by_type: Dict[str, bool] = {}
+        self._skeletons: Dict[Tuple, _Skeleton] = {}
+
+    def _fusion_field_for(self, work_item_type: str) -> bool:
+        """Consulta (uma vez por tipo) se o campo do Fusion existe"""
+        include = self._fusion_field_by_type.get(work_item_type)
+        if include is None:
+            include = bool(self.has_fusion_field(work_item_type))
+            self._fusion_field_by_type[work_item_type] = include
+            if include:
+                logger.info(f"Campo 'ID Chamado Fusion' será preenchido em '{work_item_type}'")
+            else:
+                logger.warning(f"Campo 'ID Chamado Fusion' não existe no tipo '{work_item_type}'")
+        return include
+
+    def _skeleton(self, category, priority) -> _Skeleton:
+        """Retorna (criando na primeira vez) o esqueleto da combinação"""
+        key = (category, priority)
+        skeleton = self._skeletons.get(key)
+        if skeleton is not None:
+            return skeleton
+
+        work_item_type = CATEGORY_TO_WORKITEM_MAPPING.get(
+            'Desenvolvimento' if category is _MISSING else category, "Product backlog item")
+        priority_value = PRIORITY_MAPPING.get(
+            'Normal' if priority is _MISSING else priority, 3)
+
+        fixed_operations = (
+            {"op": "add", "path": "/fields/System.State",
+             "value": INITIAL_STATES.get(work_item_type, "Backlog")},
+            {"op": "add", "path": "/fields/Microsoft.VSTS.Common.Priority", "value": priority_value},
+            self._area_operation
+        )
+
+        safe_category = html.escape(str('N/A' if category is _MISSING else category))
+        safe_priority = html.escape(str('N/A' if priority is _MISSING else priority))
+
+        skeleton = _Skeleton(
+            work_item_type=work_item_type,
+            fixed_operations=fixed_operations,
+            include_fusion_id=self._fusion_field_for(work_item_type),
+            description_head=(
+                f"<p><strong>Categoria:</strong> {safe_category}</p>\n"
+                f"<p><strong>Prioridade:</strong> {safe_priority}</p>\n"
+                f"<p><strong>Status Original:</strong> "
+            ),
+            description_tail=f"</p>\n{self._integration_section}"
+        )
+        self._skeletons[key] = skeleton
+        return skeleton
+
+    @staticmethod
+    def _description(ticket: Dict, skeleton: _Skeleton) -> str:
+        """Descrição HTML do work item (trechos fixos vêm do esqueleto)"""
+        get = ticket.get
+        escape = html.escape
+        return (
+            "\n<h3>📋 Detalhes do Chamado</h3>\n"
+            "<p><strong>ID Original:</strong> " + escape(str(get('id', 'N/A'))) + "</p>\n"
+            "<p><strong>Descrição:</strong> " + escape(str(get('descricao', 'Sem descrição'))) + "</p>\n"
+            "<p><strong>Solicitante:</strong> " + escape(str(get('solicitante', 'N/A'))) + "</p>\n"
+            + skeleton.description_head + escape(str(get('status', 'N/A'))) + skeleton.description_tail
+        )
+
+    def build(self, ticket: Dict) -> Tuple[str, List[Dict]]:
+        """
+        Monta o patch document de um ticket
+
+        Args:
+            ticket: Dicionário com dados do ticket
+
+        Returns:
+            Tuple[str, List[Dict]]: (tipo de work item, operações do patch document)
+        """
+        get = ticket.get
+        skeleton = self._skeleton(get('categoria', _MISSING), get('prioridade', _MISSING))
+
+        ticket_id = get('id', 'SEM-ID')
+        patch_document = [
+            {"op": "add", "path": "/fields/System.Title",
+             "value": f"[{ticket_id}] {get('titulo', 'Sem título')}"},
+            {"op": "add", "path": "/fields/System.Description",
+             "value": self._description(ticket, skeleton)},
+            *skeleton.fixed_operations
+        ]
+
+        if skeleton.include_fusion_id:
+            patch_document.append({"op": "add", "path": f"/fields/{FUSION_ID_FIELD}", "value": ticket_id})
+
+        return skeleton.work_item_type, patch_document
+
+    def build_update(self, ticket: Dict) -> List[Dict]:
+        """
+        Monta o patch document de atualização de um work item já existente
+
+        Reescreve título, descrição, prioridade e área. O estado segue
+        FUSION_STATUS_TO_STATE e não é alterado quando o status não tem
+        mapeamento; tipo do work item e ID do Fusion nunca mudam.
+
+        Args:
+            ticket: Dicionário com dados do ticket
+
+        Returns:
+            List[Dict]: Operações do patch document
+        """
+        get = ticket.get
+        skeleton = self._skeleton(get('categoria', _MISSING), get('prioridade', _MISSING))
+
+        patch_document = [
+            {"op": "add", "path": "/fields/System.Title",
+             "value": f"[{get('id', 'SEM-ID')}] {get('titulo', 'Sem título')}"},
+            {"op": "add", "path": "/fields/System.Description",
+             "value": self._description(ticket, skeleton)},
+            *skeleton.fixed_operations[1:]
+        ]
+
+        state = FUSION_STATUS_TO_STATE.get(skeleton.work_item_type, {}).get(get('status'))
+        if state:
+            patch_document.append({"op": "add", "path": "/fields/System.State", "value": state})
+
+        return patch_document
+
+    def build_many(self, tickets: Iterable[Dict]) -> List[Tuple[str, List[Dict]]]:
+        """
+        Monta os patch documents de um bloco de tickets em uma passada
+
+        Args:
+            tickets: Tickets já validados
+
+        Returns:
+            List[Tuple[str, List[Dict]]]: (tipo, patch document) na ordem de entrada
+        """
+        build = self.build
+        return [build(ticket) for ticket in tickets]
@@ -0,0 +1,113 @@
+"""
+Trigger do Airflow que cria work items com o AsyncAzureDevOpsClient
+Base para um operador deferrable; a DAG de produção não o usa (cria por shard
+com o cliente síncrono, journal e $batch) e o docker-compose não sobe triggerer.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from airflow.triggers.base import BaseTrigger, TriggerEvent
+
+from .async_client import AsyncAzureDevOpsClient
+from .fusion_connector import OUTCOME_CREATED, OUTCOME_FAILED
+from .hooks import AzureDevOpsHook
+from .staging import StageWriter, iter_stage
+
+
+class AzureDevOpsBatchTrigger(BaseTrigger):
+    """
+    Cria os work items de uma etapa de staging e emite um evento com o resultado
+
+    Nem os tickets nem o PAT são serializados no banco de metadados: o trigger
+    guarda apenas o manifesto da etapa e o ID da Connection, e resolve as
+    credenciais pelo AzureDevOpsHook ao iniciar. O resultado volta da mesma
+    forma, como manifestos das etapas de falhas e de processados.
+
+    Não grava journal: um retry recria os tickets do manifesto inteiro.
+    """
+
+    def __init__(self, manifest: Dict, run_dir: str, stage_name: str = 'trigger',
+                 azure_devops_conn_id: str = AzureDevOpsHook.default_conn_name,
+                 max_concurrency: int = None):
+        """
+        Inicializa o trigger
+
+        Args:
+            manifest: Manifesto da etapa com os tickets a criar (staging.write_stage)
+            run_dir: Diretório de staging da execução, onde o resultado é gravado
+            stage_name: Sufixo das etapas de resultado (failed_<nome>, processed_<nome>)
+            azure_devops_conn_id: ID da Connection do Airflow
+            max_concurrency: Máximo de requisições em voo (opcional)
+        """
+        super().__init__()
+        self.manifest = manifest
+        self.run_dir = run_dir
+        self.stage_name = stage_name
+        self.azure_devops_conn_id = azure_devops_conn_id
+        self.max_concurrency = max_concurrency
+
+    def serialize(self) -> Tuple[str, Dict[str, Any]]:
+        """Serializa o trigger para o triggerer"""
+        return (
+            'azure_devops_integration.triggers.AzureDevOpsBatchTrigger',
+            {
+                'manifest': self.manifest,
+                'run_dir': self.run_dir,
+                'stage_name': self.stage_name,
+                'azure_devops_conn_id': self.azure_devops_conn_id,
+                'max_concurrency': self.max_concurrency
+            }
+        )
+
+    async def run(self) -> AsyncIterator[TriggerEvent]:
+        """Cria os work items bloco a bloco e emite os manifestos do resultado"""
+        try:
+            # Connection/Variables acessam o banco de metadados; roda fora do loop
+            organization, project, pat_token, area_path, server_url = await asyncio.to_thread(
+                AzureDevOpsHook(self.azure_devops_conn_id).get_credentials)
+
+            created_ids = []
+            chunks = iter_stage(self.manifest)
+
+            # Abrir, gravar e fechar o staging (gzip e sha256) sempre fora do loop
+            writers: List[StageWriter] = []
+            try:
+                for prefix in ('failed', 'processed'):
+                    writers.append(await asyncio.to_thread(
+                        StageWriter, self.run_dir, f"{prefix}_{self.stage_name}"))
+                failed_writer, processed_writer = writers
+
+                async with AsyncAzureDevOpsClient(
+                    organization, project, pat_token, area_path,
+                    max_concurrency=self.max_concurrency, server_url=server_url
+                ) as client:
+                    while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+                        results = await client.create_work_items_with_results(chunk)
+                        created_ids.extend(work_item_id for _, work_item_id in results if work_item_id)
+                        await asyncio.to_thread(
+                            failed_writer.write, [ticket for ticket, work_item_id in results if not work_item_id])
+                        await asyncio.to_thread(processed_writer.write, [
+                            {'ticket_id': ticket.get('id'), 'work_item_id': work_item_id,
+                             'outcome': OUTCOME_CREATED if work_item_id else OUTCOME_FAILED}
+                            for ticket, work_item_id in results
+                        ])
+
+                failed_manifest = await asyncio.to_thread(failed_writer.close)
+                processed_manifest = await asyncio.to_thread(processed_writer.close)
+            except BaseException:
+                # Falha ou cancelamento: nada é publicado (descarte só fecha e remove o .tmp)
+                for writer in writers:
+                    writer.discard()
+                raise
+
+            yield TriggerEvent({
+                'status': 'success',
+                'created_ids': created_ids,
+                'failed_manifest': failed_manifest,
+                'processed_manifest': processed_manifest
+            })
+
+        except Exception as e:
+            self.log.error(f"Erro no trigger Azure DevOps: {str(e)}")
+            yield TriggerEvent({'status': 'error', 'message': str(e)})
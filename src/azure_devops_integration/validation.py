@@ -0,0 +1,169 @@
+"""
+Validação de tickets em lote (pandas)
+Aplica as regras de validate_ticket a um bloco inteiro e gera um relatório colunar de erros
+"""
+
+from typing import Dict, List, Union
+import logging
+
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+from .config import CATEGORY_TO_WORKITEM_MAPPING, PRIORITY_MAPPING
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Códigos de erro do relatório
+ERROR_MISSING_FIELD = 'missing_field'
+ERROR_TITLE_TOO_LONG = 'title_too_long'
+ERROR_UNMAPPED_CATEGORY = 'unmapped_category'
+ERROR_UNMAPPED_PRIORITY = 'unmapped_priority'
+
+# Mesmas regras de BaseAzureDevOpsClient.validate_ticket
+REQUIRED_FIELDS = ('id', 'titulo')
+MAX_TITLE_LENGTH = 255
+
+REPORT_COLUMNS = ['position', 'ticket_id', 'error_code', 'field']
+
+
+class ValidationReport:
+    """Resultado da validação de um bloco de tickets"""
+
+    def __init__(self, errors: pd.DataFrame, valid_mask: pd.Series):
+        """
+        Inicializa o relatório
+
+        Args:
+            errors: Uma linha por erro (position, ticket_id, error_code, field)
+            valid_mask: Booleano por posição do bloco validado
+        """
+        self.errors = errors
+        self.valid_mask = valid_mask
+
+    @property
+    def valid_count(self) -> int:
+        """Quantidade de tickets válidos"""
+        return int(self.valid_mask.sum())
+
+    @property
+    def invalid_count(self) -> int:
+        """Quantidade de tickets com ao menos um erro"""
+        return int((~self.valid_mask).sum())
+
+    def filter_valid(self, tickets: Union[List[Dict], pd.DataFrame]) -> Union[List[Dict], pd.DataFrame]:
+        """
+        Mantém apenas os tickets válidos do bloco validado
+
+        Args:
+            tickets: O mesmo bloco passado ao validador
+
+        Returns:
+            Union[List[Dict], pd.DataFrame]: Tickets válidos, no tipo de entrada
+        """
+        mask = self.valid_mask.to_numpy()
+        if isinstance(tickets, pd.DataFrame):
+            return tickets[mask]
+        return [ticket for ticket, valid in zip(tickets, mask) if valid]
+
+    def to_records(self) -> List[Dict]:
+        """
+        Converte o relatório em registros (para gravar no staging)
+
+        Returns:
+            List[Dict]: Um dicionário por erro
+        """
+        return self.errors.to_dict('records')
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Contagem de erros por código
+
+        Returns:
+            Dict[str, int]: error_code -> ocorrências
+        """
+        return {str(code): int(count) for code, count in self.errors['error_code'].value_counts().items()}
+
+
+def validate_tickets(tickets: Union[List[Dict], pd.DataFrame]) -> ValidationReport:
+    """
+    Valida um bloco de tickets de uma vez
+
+    Regras: campos obrigatórios (id, titulo), título com até 255 caracteres,
+    categoria e prioridade mapeadas (quando preenchidas).
+
+    Args:
+        tickets: Lista de dicionários ou DataFrame com colunas do ticket
+
+    Returns:
+        ValidationReport: Relatório colunar e máscara de válidos
+    """
+    if isinstance(tickets, pd.DataFrame):
+        frame = tickets.reset_index(drop=True)
+        size = len(frame)
+
+        def column(name: str) -> pd.Series:
+            if name in frame.columns:
+                return frame[name]
+            return pd.Series([None] * size, dtype=object)
+    else:
+        # Monta só as colunas validadas (mais barato que um DataFrame com todos os campos)
+        records = tickets if isinstance(tickets, list) else list(tickets)
+        size = len(records)
+        columns: Dict[str, pd.Series] = {}
+
+        def column(name: str) -> pd.Series:
+            if name not in columns:
+                columns[name] = pd.Series([record.get(name) for record in records], dtype=object)
+            return columns[name]
+
+    ticket_ids = column('id').astype(object)
+    ticket_ids = ticket_ids.where(ticket_ids.notna(), None)
+    failures = []
+
+    # Campos obrigatórios
+    for field in REQUIRED_FIELDS:
+        failures.append((~_present(column(field)), ERROR_MISSING_FIELD, field))
+
+    # Limite do título (System.Title)
+    titles = column('titulo')
+    title_length = titles.where(titles.notna(), '').astype(str).str.len()
+    failures.append((title_length > MAX_TITLE_LENGTH, ERROR_TITLE_TOO_LONG, 'titulo'))
+
+    # Categoria e prioridade preenchidas precisam estar mapeadas
+    for field, mapping, code in (('categoria', CATEGORY_TO_WORKITEM_MAPPING, ERROR_UNMAPPED_CATEGORY),
+                                 ('prioridade', PRIORITY_MAPPING, ERROR_UNMAPPED_PRIORITY)):
+        values = column(field)
+        failures.append((_present(values) & ~values.isin(list(mapping)), code, field))
+
+    parts = []
+    invalid = pd.Series(False, index=pd.RangeIndex(size))
+    for mask, code, field in failures:
+        mask = mask.fillna(False).astype(bool).to_numpy()
+        if not mask.any():
+            continue
+        invalid |= mask
+        positions = mask.nonzero()[0]
+        parts.append(pd.DataFrame({
+            'position': positions,
+            'ticket_id': pd.Series(ticket_ids.to_numpy()[positions], dtype=object),
+            'error_code': code,
+            'field': field
+        }))
+
+    errors = (pd.concat(parts, ignore_index=True).sort_values('position', kind='stable', ignore_index=True)
+              if parts else pd.DataFrame(columns=REPORT_COLUMNS))
+
+    report = ValidationReport(errors, ~invalid)
+    if report.invalid_count:
+        logger.warning(
+            f"Validação em lote: {report.invalid_count}/{size} tickets inválidos {report.summary()}")
+
+    return report
+
+
+def _present(values: pd.Series) -> pd.Series:
+    """Equivalente vetorizado de bool(valor): None, NaN, '' e 0 contam como ausentes"""
+    if is_bool_dtype(values) or is_numeric_dtype(values):
+        return values.fillna(0).astype(bool)
+    return values.notna() & (values.where(values.notna(), '').astype(str).str.len() > 0)
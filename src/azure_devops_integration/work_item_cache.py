@@ -0,0 +1,143 @@
+"""
+Cache de curta duração de work items lidos
+Evita reler, na mesma execução, work items que acabaram de ser lidos pelo workitemsbatch
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+import logging
+
+from .config import WORK_ITEM_CACHE_CONFIG
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# (ID do work item, revisão)
+RevisionKey = Tuple[int, int]
+
+
+class WorkItemCache:
+    """
+    Cache de work items por (id, rev) com expiração e limite de entradas
+
+    Cada entrada guarda os campos lidos e a projeção usada na leitura
+    (None = todos os campos); uma consulta só é atendida se a projeção em
+    cache contém os campos pedidos. Só a revisão mais recente de cada work
+    item é mantida: uma revisão nova substitui a anterior, nunca o contrário.
+    """
+
+    def __init__(self, ttl_seconds: float = None, max_entries: int = None):
+        """
+        Inicializa o cache
+
+        Args:
+            ttl_seconds: Tempo de vida de cada entrada em segundos (opcional)
+            max_entries: Máximo de work items mantidos; os mais antigos saem primeiro (opcional)
+        """
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else WORK_ITEM_CACHE_CONFIG['ttl_seconds']
+        self.max_entries = max_entries or WORK_ITEM_CACHE_CONFIG['max_entries']
+
+        # (id, rev) -> (work item, projeção dos campos, timestamp da leitura)
+        self._entries: 'OrderedDict[RevisionKey, Tuple[Dict, Optional[FrozenSet[str]], float]]' = OrderedDict()
+        # id -> revisão em cache
+        self._revisions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, work_item_id: int, fields: Optional[Iterable[str]] = None,
+            rev: int = None) -> Optional[Dict]:
+        """
+        Retorna o work item em cache, se válido e com os campos pedidos
+
+        Args:
+            work_item_id: ID do work item
+            fields: Campos necessários (opcional, None = todos)
+            rev: Revisão exigida (opcional; None aceita a revisão em cache)
+
+        Returns:
+            Optional[Dict]: Work item (id, rev, fields) ou None se ausente/expirado
+        """
+        wanted = frozenset(fields) if fields is not None else None
+        with self._lock:
+            cached_rev = self._revisions.get(work_item_id)
+            if cached_rev is None or (rev is not None and rev != cached_rev):
+                self.misses += 1
+                return None
+
+            key = (work_item_id, cached_rev)
+            item, projection, loaded_at = self._entries[key]
+            if time.time() - loaded_at > self.ttl_seconds:
+                del self._entries[key]
+                del self._revisions[work_item_id]
+                self.misses += 1
+                return None
+
+            if projection is not None and (wanted is None or not wanted <= projection):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            if wanted is None:
+                return item
+            return {**item, 'fields': {name: value for name, value in item.get('fields', {}).items()
+                                       if name in wanted}}
+
+    def put(self, item: Dict, fields: Optional[Iterable[str]] = None) -> None:
+        """
+        Armazena um work item lido
+
+        Args:
+            item: Work item retornado pela API (id, rev, fields)
+            fields: Projeção usada na leitura (opcional, None = todos os campos)
+        """
+        work_item_id = item.get('id')
+        rev = item.get('rev')
+        if work_item_id is None or rev is None:
+            return
+
+        projection = frozenset(fields) if fields is not None else None
+        with self._lock:
+            cached_rev = self._revisions.get(work_item_id)
+            if cached_rev is not None:
+                if rev < cached_rev:
+                    return
+                self._entries.pop((work_item_id, cached_rev), None)
+
+            self._entries[(work_item_id, rev)] = (item, projection, time.time())
+            self._revisions[work_item_id] = rev
+
+            while len(self._entries) > self.max_entries:
+                (evicted_id, _), _ = self._entries.popitem(last=False)
+                del self._revisions[evicted_id]
+
+    def invalidate(self, work_item_ids: Iterable[int] = None) -> int:
+        """
+        Remove work items do cache
+
+        Args:
+            work_item_ids: IDs a remover (opcional, None = todos)
+
+        Returns:
+            int: Quantidade de entradas removidas
+        """
+        with self._lock:
+            if work_item_ids is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._revisions.clear()
+                return removed
+
+            removed = 0
+            for work_item_id in work_item_ids:
+                rev = self._revisions.pop(work_item_id, None)
+                if rev is not None:
+                    del self._entries[(work_item_id, rev)]
+                    removed += 1
+            return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
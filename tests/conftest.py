@@ -0,0 +1,40 @@
+"""
+Fixtures compartilhadas: servidor falso do Azure DevOps e cliente apontado para ele
+"""
+
+from typing import Callable, Dict, Iterator, List
+
+import pytest
+
+from azure_devops_integration.client import AzureDevOpsClient
+from azure_devops_integration.rate_limit import RequestScheduler
+from azure_devops_integration.schema_cache import WorkItemTypeSchemaCache
+from fake_azure_devops import FakeAzureDevOps
+
+
+@pytest.fixture
+def fake() -> Iterator[FakeAzureDevOps]:
+    """Servidor falso em memória, sem latência nem falhas injetadas"""
+    with FakeAzureDevOps(seed=1) as server:
+        yield server
+
+
+@pytest.fixture
+def client(fake: FakeAzureDevOps) -> AzureDevOpsClient:
+    """Cliente isolado: schema cache sem disco, agendador próprio e sem índice local"""
+    return AzureDevOpsClient(
+        'org', 'projeto', 'pat', server_url=fake.url,
+        schema_cache=WorkItemTypeSchemaCache(persist_path=''),
+        scheduler=RequestScheduler(1e6, 1000))
+
+
+@pytest.fixture
+def make_tickets() -> Callable[..., List[Dict]]:
+    """Gera tickets válidos do Fusion com IDs TK-<n>"""
+    def make(count: int, **overrides) -> List[Dict]:
+        return [
+            {'id': f"TK-{index}", 'titulo': f"Chamado {index}", 'descricao': f"Descrição {index}",
+             'categoria': 'Bug', 'prioridade': 'Alta', 'status': 'Aberto', **overrides}
+            for index in range(1, count + 1)
+        ]
+    return make
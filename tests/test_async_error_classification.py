@@ -0,0 +1,36 @@
+"""
+Classificação das falhas do aiohttp para a RetryPolicy (paridade com o cliente síncrono)
+"""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from azure_devops_integration import async_client
+from azure_devops_integration.retry import ERROR_CONNECT, ERROR_CONNECTION, ERROR_TIMEOUT
+
+
+@pytest.mark.parametrize('error, expected', [
+    (aiohttp.ServerTimeoutError('Timeout on reading data from socket'), ERROR_TIMEOUT),
+    (asyncio.TimeoutError(), ERROR_TIMEOUT),
+    (aiohttp.ServerDisconnectedError(), ERROR_CONNECTION),
+])
+def test_classification(error, expected):
+    assert async_client._classify_aiohttp_error(error) == expected
+
+
+@pytest.mark.skipif(not hasattr(aiohttp, 'ConnectionTimeoutError'), reason='aiohttp < 3.10')
+def test_connect_timeout_is_retryable_for_creates():
+    # Criações só são reenviadas em ERROR_CONNECT: a requisição não chegou ao servidor
+    error = aiohttp.ConnectionTimeoutError('Connection timeout to host http://azure')
+    assert async_client._classify_aiohttp_error(error) == ERROR_CONNECT
+
+
+def test_connect_timeout_before_aiohttp_3_10(monkeypatch):
+    # Versões sem ConnectionTimeoutError só identificam o timeout de conexão pela mensagem
+    monkeypatch.setattr(async_client, '_CONNECTION_TIMEOUT_ERROR', None)
+    connect = aiohttp.ServerTimeoutError('Connection timeout to host http://azure')
+    read = aiohttp.ServerTimeoutError('Timeout on reading data from socket')
+    assert async_client._classify_aiohttp_error(connect) == ERROR_CONNECT
+    assert async_client._classify_aiohttp_error(read) == ERROR_TIMEOUT
@@ -0,0 +1,28 @@
+"""
+Fechamento do cliente descartado pelo cache do hook
+"""
+
+import sqlite3
+
+import pytest
+
+from azure_devops_integration.ticket_index import TicketIndex
+
+
+def test_close_releases_ticket_index_and_keeps_shared_session(client, make_tickets):
+    index = TicketIndex(':memory:')
+    client.ticket_index = index
+    session = client.session
+
+    client.close()
+    client.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        len(index)
+    assert client.ticket_index is None
+    # A sessão é o pool compartilhado do processo e segue em uso por outros clientes
+    assert client.session is session and session.adapters
+
+    # Quem ainda segura o cliente (ex.: a task que recebeu o 401) continua sem o índice
+    results = client.create_work_items_with_results(make_tickets(1), use_batch_api=False)
+    assert results[0][1]
@@ -0,0 +1,100 @@
+"""
+Retomada de um lote pelo CreationJournal contra o servidor falso
+"""
+
+import pytest
+
+from azure_devops_integration.config import DEDUP_CONFIG
+from azure_devops_integration.journal import CreationJournal
+
+
+@pytest.fixture
+def interrupted_run(fake, tmp_path, make_tickets):
+    """
+    Estado deixado por uma tentativa interrompida:
+        TK-1 concluído, TK-2 em dúvida mas criado no servidor,
+        TK-3 em dúvida e não criado, TK-4 nunca enviado
+    """
+    tickets = make_tickets(4)
+    fusion_field = DEDUP_CONFIG['fusion_id_field']
+    done = fake._create('Bug', [{'op': 'add', 'path': f"/fields/{fusion_field}", 'value': 'TK-1'}])
+    in_doubt_created = fake._create('Bug', [{'op': 'add', 'path': f"/fields/{fusion_field}", 'value': 'TK-2'}])
+
+    journal_path = str(tmp_path / 'journal.jsonl')
+    with CreationJournal(journal_path) as journal:
+        journal.log_intents(['TK-1', 'TK-2', 'TK-3'])
+        journal.log_outcomes([('TK-1', done['id'])])
+
+    fake.requests.clear()
+    return tickets, journal_path, done['id'], in_doubt_created['id']
+
+
+@pytest.mark.parametrize('use_batch_api', [False, True])
+def test_resume_looks_up_in_doubt_tickets_instead_of_recreating(
+        fake, client, interrupted_run, use_batch_api):
+    tickets, journal_path, done_id, in_doubt_id = interrupted_run
+
+    with CreationJournal(journal_path) as journal:
+        results = client.create_work_items_with_results(
+            tickets, use_batch_api=use_batch_api, journal=journal)
+
+    result_ids = {ticket['id']: work_item_id for ticket, work_item_id in results}
+    assert [ticket['id'] for ticket, _ in results] == ['TK-1', 'TK-2', 'TK-3', 'TK-4']
+    assert result_ids['TK-1'] == done_id
+    assert result_ids['TK-2'] == in_doubt_id
+    assert result_ids['TK-3'] and result_ids['TK-4']
+
+    # Só os dois tickets sem work item foram criados; nenhuma duplicata
+    assert len(fake.work_items) == 4
+    created_ids = {result_ids['TK-3'], result_ids['TK-4']}
+    assert created_ids.isdisjoint({done_id, in_doubt_id})
+    assert fake.requests['POST wit/wiql'] == 1
+    if use_batch_api:
+        assert fake.requests['POST wit/$batch'] == 1
+        assert fake.requests['POST wit/workitems/create'] == 0
+    else:
+        assert fake.requests['POST wit/workitems/create'] == 2
+
+
+def test_second_resume_sends_nothing(fake, client, interrupted_run):
+    tickets, journal_path, _, _ = interrupted_run
+
+    with CreationJournal(journal_path) as journal:
+        first = client.create_work_items_with_results(tickets, use_batch_api=False, journal=journal)
+    fake.requests.clear()
+
+    with CreationJournal(journal_path) as journal:
+        second = client.create_work_items_with_results(tickets, use_batch_api=False, journal=journal)
+
+    assert second == first
+    assert sum(fake.requests.values()) == 0
+
+
+def test_journal_is_parsed_once_per_shard(tmp_path, monkeypatch):
+    from azure_devops_integration import journal as journal_module
+
+    path = str(tmp_path / 'journal.jsonl')
+    with CreationJournal(path) as previous:
+        previous.log_intents(['TK-1', 'TK-2'])
+        previous.log_outcomes([('TK-1', 10)])
+
+    reads = []
+
+    def counting_open(*args, **kwargs):
+        reads.append(args[0])
+        return open(*args, **kwargs)
+
+    with CreationJournal(path) as journal:
+        monkeypatch.setattr(journal_module, 'open', counting_open, raising=False)
+
+        # Um split por bloco de staging; gravações entre blocos entram no estado em memória
+        assert journal.split(['TK-1', 'TK-2']) == ({'TK-1': 10}, ['TK-2'])
+        journal.log_intents(['TK-3'])
+        journal.log_outcomes([('TK-2', 20), ('TK-3', None)])
+        assert journal.split(['TK-2', 'TK-3', 'TK-4']) == ({'TK-2': 20}, ['TK-3'])
+
+    assert reads == [path]
+
+    # O arquivo continua sendo a fonte da verdade para um processo novo
+    with CreationJournal(path) as reopened:
+        assert reopened.split(['TK-1', 'TK-2', 'TK-3']) == ({'TK-1': 10, 'TK-2': 20}, ['TK-3'])
@@ -0,0 +1,41 @@
+"""
+Contrato do after_response nos dois clientes contra o servidor falso
+"""
+
+import asyncio
+
+from azure_devops_integration.async_client import AsyncAzureDevOpsClient
+from azure_devops_integration.lifecycle import TimingBreakdownHook
+
+
+class StatusRecorder:
+    """Callback que depende só do contrato comum: status_code e headers"""
+
+    def __init__(self):
+        self.statuses = []
+
+    def after_response(self, method, url, response, elapsed_seconds):
+        self.statuses.append((response.status_code, 'Content-Type' in response.headers))
+
+
+def test_sync_after_response_exposes_status_code(client):
+    recorder = StatusRecorder()
+    client.register_hooks(recorder)
+
+    assert client.test_connection()
+    assert recorder.statuses and all(entry == (200, True) for entry in recorder.statuses)
+
+
+def test_async_after_response_exposes_status_code(fake):
+    recorder = StatusRecorder()
+    timing = TimingBreakdownHook()
+
+    async def run():
+        async with AsyncAzureDevOpsClient('org', 'projeto', 'pat', server_url=fake.url) as client:
+            client.register_hooks(recorder)
+            client.register_hooks(timing)
+            return await client.test_connection()
+
+    assert asyncio.run(run())
+    assert recorder.statuses and all(entry == (200, True) for entry in recorder.statuses)
+    assert all('total' in phases for phases in timing.get_breakdown().values())
@@ -0,0 +1,59 @@
+"""
+Sincronização com patch mínimo contra o servidor falso
+"""
+
+import pytest
+
+WRITE_ENDPOINTS = ('POST wit/$batch', 'PATCH wit/workitems', 'POST wit/workitems/create')
+
+
+def _writes(fake) -> int:
+    """Requisições que podem alterar work items"""
+    return sum(fake.requests[endpoint] for endpoint in WRITE_ENDPOINTS)
+
+
+def _revisions(fake) -> dict:
+    return {work_item_id: item['rev'] for work_item_id, item in fake.work_items.items()}
+
+
+@pytest.fixture
+def synced(fake, client, make_tickets):
+    """Tickets já integrados: work items criados a partir deles"""
+    tickets = make_tickets(5)
+    results = client.create_work_items_with_results(tickets, use_batch_api=True)
+    assert all(work_item_id for _, work_item_id in results)
+    fake.requests.clear()
+    return tickets
+
+
+@pytest.mark.parametrize('use_batch_api', [False, True])
+def test_unchanged_resync_makes_no_writes(fake, client, synced, use_batch_api):
+    revisions = _revisions(fake)
+
+    updated_ids, failed_tickets, missing_tickets = client.sync_work_items(
+        synced, use_batch_api=use_batch_api, minimal_diff=True)
+
+    assert (updated_ids, failed_tickets, missing_tickets) == ([], [], [])
+    assert _writes(fake) == 0
+    assert _revisions(fake) == revisions
+
+
+@pytest.mark.parametrize('use_batch_api', [False, True])
+def test_resync_sends_only_changed_fields(fake, client, synced, use_batch_api):
+    changed = [dict(synced[0], prioridade='Baixa'), *synced[1:]]
+    revisions = _revisions(fake)
+
+    updated_ids, failed_tickets, missing_tickets = client.sync_work_items(
+        changed, use_batch_api=use_batch_api, minimal_diff=True)
+
+    assert len(updated_ids) == 1 and not failed_tickets and not missing_tickets
+    assert _writes(fake) == 1
+    bumped = {work_item_id for work_item_id, rev in _revisions(fake).items() if rev != revisions[work_item_id]}
+    assert bumped == set(updated_ids)
+
+
+def test_full_resync_without_minimal_diff_writes_every_item(fake, client, synced):
+    updated_ids, _, _ = client.sync_work_items(synced, use_batch_api=False, minimal_diff=False)
+
+    assert len(updated_ids) == len(synced)
+    assert fake.requests['PATCH wit/workitems'] == len(synced)
@@ -0,0 +1,32 @@
+"""
+Métricas por trecho num agregador compartilhado (resumo por shard da DAG)
+"""
+
+from azure_devops_integration.client import AzureDevOpsClient
+from azure_devops_integration.metrics import RequestMetrics
+from azure_devops_integration.rate_limit import RequestScheduler
+from azure_devops_integration.schema_cache import WorkItemTypeSchemaCache
+
+
+def test_since_isolates_a_shard_on_a_shared_aggregator(fake, make_tickets):
+    shared = RequestMetrics(export_to_airflow_stats=False)
+    client = AzureDevOpsClient(
+        'org', 'projeto', 'pat', server_url=fake.url,
+        schema_cache=WorkItemTypeSchemaCache(persist_path=''),
+        scheduler=RequestScheduler(1e6, 1000), metrics=shared)
+
+    # Task anterior no mesmo processo
+    client.create_work_items_with_results(make_tickets(3), use_batch_api=False)
+    before = client.get_request_metrics()
+
+    tickets = [dict(ticket, id=f"SHARD-{ticket['id']}") for ticket in make_tickets(2)]
+    client.create_work_items_with_results(tickets, use_batch_api=False)
+    shard = client.get_request_metrics(since=before)
+
+    assert set(shard) == {'workitems_create'}
+    creates = shard['workitems_create']
+    assert creates['requests'] == 2
+    assert creates['status_codes'] == {'200': 2}
+    assert sum(creates['latency_histogram'].values()) == 2
+    assert 'latency_ms_max' not in creates
+    assert client.get_request_metrics()['workitems_create']['requests'] == 5